@@ -0,0 +1,113 @@
+"""
+Arc length lookup tables for placing joints evenly along a curve.
+
+A curve's parameter doesn't advance at an even speed, and for the edge loop curves
+there is one parameter step per mesh vertex. An ArcLengthTable samples the curve
+once, stores the running length at each sample and maps any length back to a
+parameter by interpolation, so N evenly spaced joints can go on any curve no
+matter how many CVs it has. Tables are cached by the curve's shape, so curves with the
+same CVs share one whatever they are called.
+"""
+import hashlib
+import numpy as np
+
+
+# Samples per span for curves above degree 1, linear curves are exact at their CVs
+SAMPLES_PER_SPAN = 16
+
+
+class ArcLengthTable:
+    def __init__(self, parameters, points, closed=False):
+        self.parameters = np.asarray(parameters, dtype=float)
+        self.points = np.asarray(points, dtype=float).reshape(-1, 3)
+        self.closed = closed
+
+        segment_lengths = np.linalg.norm(np.diff(self.points, axis=0), axis=1)
+        self.lengths = np.concatenate(([0.0], np.cumsum(segment_lengths)))
+
+    def __repr__(self):
+        return f"ArcLengthTable({len(self.parameters)} samples, length {self.length:.4g})"
+
+    @property
+    def length(self):
+        return self.lengths[-1]
+
+    def parameters_at(self, lengths):
+        """Curve parameter at each distance along the curve."""
+        return np.interp(lengths, self.lengths, self.parameters)
+
+    def points_at(self, lengths):
+        """Position at each distance along the curve."""
+        return np.stack([np.interp(lengths, self.lengths, self.points[:, axis]) for axis in range(3)], axis=-1)
+
+    def even_lengths(self, count):
+        """
+        Distances for count evenly spaced samples. Open curves get both ends, closed curves
+        leave out the end since it sits on the start.
+        """
+        if self.closed:
+            return self.length * np.arange(count) / count
+
+        return np.linspace(0.0, self.length, count)
+
+    def even_samples(self, count):
+        """(parameters, positions) of count evenly spaced samples."""
+        lengths = self.even_lengths(count)
+
+        return self.parameters_at(lengths), self.points_at(lengths)
+
+
+def _get_curve_fn(curve):
+    import maya.api.OpenMaya as om2
+
+    selection = om2.MSelectionList()
+    selection.add(curve)
+
+    return om2.MFnNurbsCurve(selection.getDagPath(0).extendToShape())
+
+
+def get_cv_points(curve_fn):
+    import maya.api.OpenMaya as om2
+
+    return np.array([list(point)[:3] for point in curve_fn.cvPositions(om2.MSpace.kWorld)])
+
+
+def sample_curve(curve_fn, samples_per_span=SAMPLES_PER_SPAN):
+    """Samples a curve's world space points through the API. Returns (parameters, points, closed)."""
+    import maya.api.OpenMaya as om2
+
+    start, end = curve_fn.knotDomain
+    count = curve_fn.numSpans * (1 if curve_fn.degree == 1 else samples_per_span)
+    parameters = np.linspace(start, end, count + 1)
+
+    points = np.array([list(curve_fn.getPointAtParam(parameter, om2.MSpace.kWorld))[:3] for parameter in parameters])
+    closed = curve_fn.form != om2.MFnNurbsCurve.kOpen
+
+    return parameters, points, closed
+
+
+class ArcLengthCache:
+    """Keeps one table per curve shape, a curve gets a new one when its CVs move."""
+
+    def __init__(self, samples_per_span=SAMPLES_PER_SPAN):
+        self.samples_per_span = samples_per_span
+        self.tables = {}
+
+    def _shape_hash(self, curve_fn):
+        digest = hashlib.sha1(f"{curve_fn.degree} {curve_fn.form}".encode("utf-8"))
+        digest.update(np.ascontiguousarray(list(curve_fn.knots()), dtype=float).tobytes())
+        digest.update(np.ascontiguousarray(get_cv_points(curve_fn), dtype=float).tobytes())
+
+        return digest.hexdigest()
+
+    def get(self, curve):
+        """Returns the ArcLengthTable for a curve, building it on first use."""
+        curve_fn = _get_curve_fn(curve)
+        shape_hash = self._shape_hash(curve_fn)
+
+        table = self.tables.get(shape_hash)
+        if table is None:
+            table = ArcLengthTable(*sample_curve(curve_fn, self.samples_per_span))
+            self.tables[shape_hash] = table
+
+        return table
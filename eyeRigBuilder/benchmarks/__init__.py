@@ -0,0 +1 @@
+"""Skinning benchmarks, see runBenchmarks.py."""
@@ -0,0 +1,111 @@
+"""
+The eye skinning passes as they were before the solver was vectorised.
+
+These are the original assign_influence_to_eye_aim, skin_eye_verts and
+assign_influence_to_closest_joint loops, one xform query and one skinPercent call per
+vertex, with om.MVector lengths swapped for the same sum in plain Python so they run on
+the benchmark stand-in. runBenchmarks.py writes the golden files from them.
+
+Rings are grouped by exact distance to the pupil, so float noise can split one edge loop
+into several groups and shift the fade. The solver only does the same with
+ring_tolerance=0, its default bins rings within a tolerance.
+"""
+import math
+
+from maya import cmds
+
+
+def vector_length(point, other):
+    """om.MVector(point - other).length(), summed in the same x, y, z order."""
+    x, y, z = (a - b for a, b in zip(point, other))
+
+    return math.sqrt(x * x + y * y + z * z)
+
+
+def assign_influence_to_closest_joint(vertices, joints, skin_cluster, iris_flag, value):
+    """Assigns 100% influence to the closest joint for each vertex in the loop."""
+    for vertex in vertices:
+        closest_joint = None
+        min_distance = float("inf")
+
+        vertex_position = cmds.xform(vertex, q=True, t=True, ws=True)
+
+        # The first joint wins a tie, only a strictly closer one replaces it
+        for jnt in joints:
+            jnt_position = cmds.xform(jnt, q=True, t=True, ws=True)
+
+            distance = vector_length(vertex_position, jnt_position)
+
+            if distance < min_distance:
+                min_distance = distance
+                closest_joint = jnt
+                if iris_flag:
+                    closest_joint = closest_joint.replace("Tip", "")
+
+        cmds.skinPercent(skin_cluster, vertex, transformValue=(closest_joint, value))
+
+
+def skin_eye_verts(side, face_list, joints_list, iris_flag=False):
+    """Skins the donut mesh based on the provided faces, center, and joints."""
+    skin_cluster = f"{side}_eye_sc"
+
+    center = cmds.xform(f"{side}_eyePupil_loc", q=True, t=True, ws=True)
+
+    all_vertices = cmds.polyListComponentConversion(face_list, toVertex=True)
+    all_vertices = cmds.ls(all_vertices, flatten=True)
+
+    min_weight = 0.2
+
+    # Group vertices by their distance to the center, which is their edge loop
+    distance_groups = {}
+    for vertex in all_vertices:
+        vertex_position = cmds.xform(vertex, q=True, t=True, ws=True)
+        distance = vector_length(vertex_position, center)
+
+        distance_groups.setdefault(distance, []).append(vertex)
+
+    sorted_distances = sorted(distance_groups.keys())
+
+    if iris_flag:
+        num_groups = len(sorted_distances)
+        # First quarter: full influence
+        quarter_size = max(num_groups // 4, 1)
+
+        # The fade zone runs from index quarter_size to the final index
+        fade_range = (num_groups - 1) - quarter_size
+
+        for i, distance in enumerate(sorted_distances):
+            if i < quarter_size:
+                value = 1.0
+            else:
+                # Cosine fade from 1.0 down to min_weight over the rest of the groups
+                t = float(i - quarter_size) / fade_range
+                cosine_val = 0.5 * (math.cos(math.pi * t) + 1.0)
+                value = min_weight + (1.0 - min_weight) * cosine_val
+            assign_influence_to_closest_joint(distance_groups[distance], joints_list, skin_cluster, iris_flag, value=value)
+
+    else:
+        for distance, vertices in distance_groups.items():
+            assign_influence_to_closest_joint(vertices, joints_list, skin_cluster, iris_flag, value=1)
+
+
+def assign_influence_to_eye_aim(side, faces):
+    """Assigns all iris vertices to the eye aim joint."""
+    aim_jnt = f"{side}_eyeAim_jnt"
+    skin_cluster = f"{side}_eye_sc"
+
+    all_vertices = cmds.polyListComponentConversion(faces, toVertex=True)
+    all_vertices = cmds.ls(all_vertices, flatten=True)
+
+    for vertex in all_vertices:
+        cmds.skinPercent(skin_cluster, vertex, transformValue=(aim_jnt, 1.0))
+
+
+def skin_eye(side, eye):
+    """The aim, iris and pupil passes in the order the rig ran them, eye as syntheticEye.build_eye returns it."""
+    assign_influence_to_eye_aim(side, eye["iris_faces"])
+    assign_influence_to_eye_aim(side, eye["pupil_faces"])
+    skin_eye_verts(side, eye["iris_faces"], eye["iris_joints"], iris_flag=True)
+
+    pupil_vertices = cmds.ls(cmds.polyListComponentConversion(eye["pupil_faces"], toVertex=True), flatten=True)
+    assign_influence_to_closest_joint(pupil_vertices, eye["pupil_joints"], f"{side}_eye_sc", False, 1.0)
@@ -0,0 +1,325 @@
+"""
+In-memory stand-in for the parts of Maya the eye skinning code touches.
+
+Only the commands and API classes used by iris.py, skinIO.py and graphReport.py are
+provided: vertex and transform xform queries, component conversion and flattening, polyInfo,
+per vertex skinPercent and bulk skin weight reads and writes through MFnSkinCluster,
+and node types and connections. Every call is counted on the active scene so the
+benchmarks can report how many round trips a skinning pass makes.
+
+install() puts the stand-in modules in sys.modules. Run it in a plain Python session,
+never inside Maya.
+"""
+import re
+import sys
+import types
+from collections import Counter
+import numpy as np
+
+
+_COMPONENT_PATTERN = re.compile(r"^(?P<node>[^.]+)\.(?P<type>vtx|e|f)\[(?P<start>\d+)(?::(?P<end>\d+))?\]$")
+
+_active_scene = None
+
+
+def parse_components(components):
+    """Returns the node, component type and sorted unique indices for a list of components."""
+    if isinstance(components, str):
+        components = [components]
+
+    node = component_type = None
+    indices = []
+    for component in components:
+        match = _COMPONENT_PATTERN.match(component)
+        if match is None:
+            raise ValueError(f"Not a component: {component}")
+
+        node, component_type = match.group("node"), match.group("type")
+        start = int(match.group("start"))
+        indices.append(np.arange(start, int(match.group("end") or start) + 1))
+
+    if not indices:
+        return node, component_type, np.empty(0, dtype=int)
+
+    return node, component_type, np.unique(np.concatenate(indices))
+
+
+def compact_components(node, component_type, indices):
+    """Returns indices as compact node.type[a:b] ranges, the way Maya hands them back."""
+    indices = np.asarray(indices, dtype=int)
+    if not len(indices):
+        return []
+
+    breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+    starts = np.concatenate(([indices[0]], indices[breaks]))
+    ends = np.concatenate((indices[breaks - 1], [indices[-1]]))
+
+    return [f"{node}.{component_type}[{start}:{end}]" if end != start else f"{node}.{component_type}[{start}]"
+            for start, end in zip(starts, ends)]
+
+
+class FakeMesh:
+    def __init__(self, name, points, faces):
+        self.name = name
+        self.points = np.asarray(points, dtype=float).reshape(-1, 3)
+        self.faces = np.asarray(faces, dtype=int)
+
+        # Unique edges over every face, each face keeps the ids of its own edges
+        face_edges = np.stack((self.faces, np.roll(self.faces, -1, axis=1)), axis=-1).reshape(-1, 2)
+        self.edges, inverse = np.unique(np.sort(face_edges, axis=1), axis=0, return_inverse=True)
+        self.face_edge_ids = inverse.reshape(len(self.faces), -1)
+
+
+class FakeSkinCluster:
+    def __init__(self, name, mesh, influences):
+        self.name = name
+        self.mesh = mesh
+        self.influences = list(influences)
+
+        # Bound with everything on the first influence, like a fresh rigid bind to the root
+        self.weights = np.zeros((len(mesh.points), len(self.influences)))
+        self.weights[:, 0] = 1.0
+
+
+class FakeScene:
+    """Holds the meshes, transforms and skin clusters the stand-in commands read and write."""
+
+    def __init__(self):
+        self.meshes = {}
+        self.transforms = {}
+        self.skin_clusters = {}
+        self.node_types = {}
+        self.connections = []
+        self.calls = Counter()
+
+    def add_mesh(self, name, points, faces):
+        self.meshes[name] = FakeMesh(name, points, faces)
+        return self.meshes[name]
+
+    def add_transform(self, name, position):
+        self.transforms[name] = np.asarray(position, dtype=float)
+
+    def add_skin_cluster(self, name, mesh, influences):
+        self.skin_clusters[name] = FakeSkinCluster(name, self.meshes[mesh], influences)
+        return self.skin_clusters[name]
+
+    def add_node(self, name, node_type):
+        self.node_types[name] = node_type
+
+    def connect(self, source, destination):
+        """Connects two plugs given as node.attribute."""
+        self.connections.append((source, destination))
+
+    def record(self, name):
+        self.calls[name] += 1
+
+    def call_count(self):
+        return sum(self.calls.values())
+
+    # ------------------------------------------------------------------
+    # maya.cmds
+
+    def xform(self, objects, **flags):
+        if not (flags.get("query") or flags.get("q")):
+            raise NotImplementedError("The stand-in xform only supports translation queries")
+
+        if isinstance(objects, str) and objects in self.transforms:
+            return self.transforms[objects].tolist()
+
+        node, component_type, indices = parse_components(objects)
+        if component_type != "vtx":
+            raise NotImplementedError(f"The stand-in xform can't query {component_type} components")
+
+        return self.meshes[node].points[indices].ravel().tolist()
+
+    def polyListComponentConversion(self, components, **flags):
+        node, component_type, indices = parse_components(components)
+        if component_type != "f":
+            raise NotImplementedError("The stand-in only converts from faces")
+
+        mesh = self.meshes[node]
+        if flags.get("toVertex") or flags.get("tv"):
+            return compact_components(node, "vtx", np.unique(mesh.faces[indices]))
+        if flags.get("toEdge") or flags.get("te"):
+            return compact_components(node, "e", np.unique(mesh.face_edge_ids[indices]))
+
+        raise NotImplementedError("The stand-in converts to vertices or edges only")
+
+    def polyInfo(self, components, **flags):
+        if not (flags.get("edgeToVertex") or flags.get("ev")):
+            raise NotImplementedError("The stand-in polyInfo only supports edgeToVertex")
+
+        node, component_type, indices = parse_components(components)
+        edges = self.meshes[node].edges[indices]
+
+        return [f"EDGE {index:6d}:  {start:6d} {end:6d}  Hard\n" for index, (start, end) in zip(indices, edges)]
+
+    def ls(self, *args, **flags):
+        if args and (flags.get("flatten") or flags.get("fl")):
+            node, component_type, indices = parse_components(args[0])
+            return [f"{node}.{component_type}[{index}]" for index in indices]
+        if args or flags:
+            raise NotImplementedError("The stand-in ls only lists every node or flattens components")
+
+        return list(self.meshes) + list(self.transforms) + list(self.skin_clusters) + list(self.node_types)
+
+    def nodeType(self, node):
+        if node in self.node_types:
+            return self.node_types[node]
+        if node in self.meshes:
+            return "mesh"
+        if node in self.skin_clusters:
+            return "skinCluster"
+
+        return "transform"
+
+    def listConnections(self, node, **flags):
+        if not (flags.get("connections") or flags.get("c")) or not (flags.get("plugs") or flags.get("p")):
+            raise NotImplementedError("The stand-in listConnections only lists plug pairs")
+
+        pairs = []
+        for source, destination in self.connections:
+            if flags.get("source", True) and destination.split(".")[0] == node:
+                pairs.extend([destination, source])
+            if flags.get("destination", True) and source.split(".")[0] == node:
+                pairs.extend([source, destination])
+
+        return pairs
+
+    def skinPercent(self, skin_cluster, components, **flags):
+        """Only -transformValue with one joint, the other influences are scaled so each vertex sums to one."""
+        joint, value = flags.get("transformValue") or flags.get("tv")
+        skin_cluster = self.skin_clusters[skin_cluster]
+        column = skin_cluster.influences.index(joint)
+
+        for index in parse_components(components)[2]:
+            row = skin_cluster.weights[index]
+            others = row.sum() - row[column]
+            row *= (1.0 - value) / others if others > 0 else 0.0
+            row[column] = value
+
+    def warning(self, message):
+        print(f"# Warning: {message}")
+
+
+# ----------------------------------------------------------------------
+# maya.api.OpenMaya / maya.api.OpenMayaAnim
+
+
+class MFn:
+    kMeshVertComponent = 550
+
+
+class MDagPath:
+    def __init__(self, name):
+        self.name = name
+
+    def partialPathName(self):
+        return self.name
+
+
+class MSelectionList:
+    def __init__(self):
+        self.items = []
+
+    def add(self, name):
+        _active_scene.record("MSelectionList.add")
+        self.items.append(name)
+
+    def getDependNode(self, index):
+        return _active_scene.skin_clusters[self.items[index]]
+
+
+class MFnSingleIndexedComponent:
+    def __init__(self):
+        self.elements = []
+
+    def create(self, component_type):
+        return self
+
+    def addElements(self, elements):
+        self.elements.extend(elements)
+
+
+class MFnSkinCluster:
+    def __init__(self, node):
+        self.node = node
+
+    def getPathAtIndex(self, index):
+        _active_scene.record("MFnSkinCluster.getPathAtIndex")
+        return MDagPath(self.node.mesh.name)
+
+    def influenceObjects(self):
+        _active_scene.record("MFnSkinCluster.influenceObjects")
+        return [MDagPath(name) for name in self.node.influences]
+
+    def getWeights(self, shape, component):
+        _active_scene.record("MFnSkinCluster.getWeights")
+        weights = self.node.weights[np.asarray(component.elements, dtype=int)]
+
+        return weights.ravel().tolist(), len(self.node.influences)
+
+    def setWeights(self, shape, component, influence_indices, values, normalize=True):
+        _active_scene.record("MFnSkinCluster.setWeights")
+        rows = np.asarray(component.elements, dtype=int)
+        columns = np.asarray(influence_indices, dtype=int)
+
+        weights = np.asarray(values, dtype=float).reshape(len(rows), len(columns))
+        self.node.weights[np.ix_(rows, columns)] = weights
+
+
+def _counted_command(name):
+    def command(*args, **flags):
+        _active_scene.record(name)
+        return getattr(_active_scene, name)(*args, **flags)
+
+    command.__name__ = name
+    return command
+
+
+def _missing_command(name):
+    raise AttributeError(f"maya.cmds.{name} is not provided by the benchmark stand-in")
+
+
+def use_scene(scene):
+    """Makes scene the one every stand-in command and API call works on."""
+    global _active_scene
+    _active_scene = scene
+
+
+def install():
+    """Registers the stand-in maya, maya.cmds, maya.api.OpenMaya and maya.api.OpenMayaAnim modules."""
+    maya = types.ModuleType("maya")
+    maya.__path__ = []
+
+    cmds = types.ModuleType("maya.cmds")
+    for name in ("xform", "polyListComponentConversion", "polyInfo", "ls", "nodeType", "listConnections", "skinPercent", "warning"):
+        setattr(cmds, name, _counted_command(name))
+    cmds.__getattr__ = _missing_command
+
+    api = types.ModuleType("maya.api")
+    api.__path__ = []
+
+    open_maya = types.ModuleType("maya.api.OpenMaya")
+    open_maya.MFn = MFn
+    open_maya.MDagPath = MDagPath
+    open_maya.MSelectionList = MSelectionList
+    open_maya.MFnSingleIndexedComponent = MFnSingleIndexedComponent
+    open_maya.MIntArray = list
+    open_maya.MDoubleArray = list
+
+    open_maya_anim = types.ModuleType("maya.api.OpenMayaAnim")
+    open_maya_anim.MFnSkinCluster = MFnSkinCluster
+
+    maya.cmds = cmds
+    maya.api = api
+    api.OpenMaya = open_maya
+    api.OpenMayaAnim = open_maya_anim
+
+    sys.modules.update({
+        "maya": maya,
+        "maya.cmds": cmds,
+        "maya.api": api,
+        "maya.api.OpenMaya": open_maya,
+        "maya.api.OpenMayaAnim": open_maya_anim,
+    })
@@ -0,0 +1,276 @@
+"""
+Scaling and regression benchmarks for the eye skinning passes.
+
+Builds synthetic eyes over a grid of radial segment and ring counts, runs the aim,
+iris (skin_eye_verts) and pupil (assign_influence_to_closest_joint) passes, and the
+combined skin_eye solve, against the in-memory Maya stand-in and reports wall time,
+scene calls and peak memory per pass.
+
+The golden files are the weights of the original per vertex loops (baselineSkinning.py),
+written with --update-golden. Every eye is skinned a second time with exact distance
+rings (ring_tolerance=0), as those loops grouped them, and must match the golden file.
+The timed default solve bins rings within a tolerance instead, which only changes the
+iris fade of some vertices: it must give every vertex the same joints as the golden file,
+and the report says how many vertices fade differently.
+
+Run with a plain Python that has NumPy, not inside Maya:
+
+    python eyeRigBuilder/benchmarks/runBenchmarks.py
+    python eyeRigBuilder/benchmarks/runBenchmarks.py --quick --json results.json
+    python eyeRigBuilder/benchmarks/runBenchmarks.py --update-golden
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+import types
+import numpy as np
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The tools import each other as riggingTools, point that name at this folder
+if "riggingTools" not in sys.modules:
+    package = types.ModuleType("riggingTools")
+    package.__path__ = [PACKAGE_DIR]
+    sys.modules["riggingTools"] = package
+
+from riggingTools.benchmarks import fakeMaya
+from riggingTools.benchmarks import syntheticEye
+
+fakeMaya.install()
+
+from riggingTools.benchmarks import baselineSkinning
+from riggingTools.iris import EyeballRig
+from riggingTools.iris import GEOMETRY
+from riggingTools.rigSession import RigSession
+from riggingTools.weightMatrix import SkinWeights
+
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+
+SEGMENTS = (24, 96, 512)
+RINGS = (4, 16, 64)
+QUICK_SEGMENTS = (24, 96)
+QUICK_RINGS = (4, 16)
+
+# Largest weight difference still treated as a match with the golden file
+GOLDEN_TOLERANCE = 1e-6
+
+# Grouping rings by exact distance, like the original loops
+EXACT_RINGS = 0.0
+
+
+def create_rig():
+    """An EyeballRig without building the rig itself, only the skinning methods are used."""
+    rig = EyeballRig.__new__(EyeballRig)
+    rig.symmetry_maps = None
+    rig.skin_inputs = {}
+    rig.mirror_inputs = {}
+    rig.prefix = ""
+    rig.geometry = {name: name for name in GEOMETRY}
+    rig.session = RigSession()
+
+    return rig
+
+
+def measure(scene, function, trace_memory):
+    """Runs function once, returns (its result, seconds, scene calls, peak bytes or None)."""
+    scene.calls.clear()
+    if trace_memory:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return result, seconds, scene.call_count(), peak
+
+
+def run_case(segments, rings, trace_memory=False, ring_tolerance=None):
+    """
+    Skins one synthetic eye pass by pass, then a second copy through skin_eye.
+    Returns the per pass measurements and the final SkinWeights of both.
+    """
+    scene = fakeMaya.FakeScene()
+    fakeMaya.use_scene(scene)
+    eye = syntheticEye.build_eye(scene, "l", segments, rings)
+    rig = create_rig()
+
+    pupil_vertices = scene.polyListComponentConversion(eye["pupil_faces"], toVertex=True)
+
+    passes = [
+        ("aim", lambda: (rig.assign_influence_to_eye_aim("l", eye["iris_faces"]), rig.assign_influence_to_eye_aim("l", eye["pupil_faces"]))),
+        ("iris", lambda: rig.skin_eye_verts("l", eye["iris_faces"], eye["iris_joints"], iris_flag=True, ring_tolerance=ring_tolerance)),
+        ("pupil", lambda: rig.assign_influence_to_closest_joint(pupil_vertices, eye["pupil_joints"], "l_eye_sc", False, 1.0)),
+    ]
+
+    results = {}
+    for name, function in passes:
+        result, seconds, calls, peak = measure(scene, function, trace_memory)
+        results[name] = {"seconds": seconds, "calls": calls, "peak_bytes": peak}
+
+    # The same eye again through skin_eye, which gathers, solves and writes in one go
+    eye_scene = fakeMaya.FakeScene()
+    fakeMaya.use_scene(eye_scene)
+    syntheticEye.build_eye(eye_scene, "l", segments, rings)
+
+    result, seconds, calls, peak = measure(eye_scene, lambda: rig.skin_eye("l", eye["iris_faces"], eye["pupil_faces"], eye["iris_joints"], eye["pupil_joints"],
+                                                                           ring_tolerance=ring_tolerance), trace_memory)
+    results["skin_eye"] = {"seconds": seconds, "calls": calls, "peak_bytes": peak}
+
+    return results, scene_weights(scene), scene_weights(eye_scene)
+
+
+def scene_weights(scene):
+    skin_cluster = scene.skin_clusters["l_eye_sc"]
+
+    return SkinWeights.from_dense(np.arange(len(skin_cluster.weights)), skin_cluster.weights, skin_cluster.influences)
+
+
+def baseline_weights(segments, rings):
+    """Skins the eye with the original per vertex loops, the golden files are these weights."""
+    scene = fakeMaya.FakeScene()
+    fakeMaya.use_scene(scene)
+    eye = syntheticEye.build_eye(scene, "l", segments, rings)
+    baselineSkinning.skin_eye("l", eye)
+
+    return scene_weights(scene)
+
+
+def golden_path(segments, rings):
+    return os.path.join(GOLDEN_DIR, f"eye_{segments:03}seg_{rings:02}ring.npz")
+
+
+def load_golden(segments, rings, weights):
+    """Returns the golden weights, or what stops them being compared with weights."""
+    path = golden_path(segments, rings)
+    if not os.path.exists(path):
+        return None, "no golden file"
+
+    with np.load(path) as entry:
+        golden = SkinWeights.from_arrays(entry)
+
+    if golden.influences != weights.influences:
+        return None, "influences differ"
+    if not np.array_equal(golden.vertex_indices, weights.vertex_indices):
+        return None, "vertices differ"
+
+    return golden, None
+
+
+def compare_with_golden(segments, rings, weights):
+    """Returns None when the weights match the golden file, otherwise what differs."""
+    golden, problem = load_golden(segments, rings, weights)
+    if problem:
+        return problem
+
+    difference = np.abs(golden.to_dense() - weights.to_dense()).max()
+    if difference > GOLDEN_TOLERANCE:
+        return f"weights differ by up to {difference:.2e}"
+
+    return None
+
+
+def compare_ring_binning(segments, rings, weights):
+    """
+    Compares weights solved with binned rings with the golden file.
+    Returns (problem or None, summary). Binning may change how far a vertex fades, so the
+    value its joint gets and what is left on the aim joint, but never which other joint it has.
+    """
+    golden, problem = load_golden(segments, rings, weights)
+    if problem:
+        return problem, problem
+
+    joints = [column for column, influence in enumerate(weights.influences) if influence != "l_eyeAim_jnt"]
+    golden = golden.to_dense()
+    weights = weights.to_dense()
+
+    moved = ((golden[:, joints] > GOLDEN_TOLERANCE) != (weights[:, joints] > GOLDEN_TOLERANCE)).any(axis=1)
+    if moved.any():
+        summary = f"{np.count_nonzero(moved)} verts changed joints"
+        return summary, summary
+
+    difference = np.abs(golden - weights).max(axis=1)
+    changed = np.count_nonzero(difference > GOLDEN_TOLERANCE)
+    if not changed:
+        return None, "same"
+
+    return None, f"{changed} iris verts fade differently, by up to {difference.max():.2e}"
+
+
+def run(segment_counts, ring_counts, repeat=1, update_golden=False):
+    """Runs every case and returns a list of result dicts."""
+    report = []
+    for segments in segment_counts:
+        for rings in ring_counts:
+            if update_golden:
+                os.makedirs(GOLDEN_DIR, exist_ok=True)
+                np.savez_compressed(golden_path(segments, rings), **baseline_weights(segments, rings).to_arrays())
+
+            # Best of repeat for time, then one traced run for memory since tracing slows everything down
+            timings = [run_case(segments, rings)[0] for _ in range(repeat)]
+            memory, weights, eye_weights = run_case(segments, rings, trace_memory=True)
+            exact_weights, exact_eye_weights = run_case(segments, rings, ring_tolerance=EXACT_RINGS)[1:]
+
+            binning_problem, binning = compare_ring_binning(segments, rings, weights)
+            case = {
+                "segments": segments,
+                "rings": rings,
+                "vertices": len(weights.vertex_indices),
+                "golden": (compare_with_golden(segments, rings, exact_weights) or compare_with_golden(segments, rings, exact_eye_weights)
+                           or binning_problem or compare_ring_binning(segments, rings, eye_weights)[0] or "ok"),
+                "ring_binning": binning,
+                "passes": {},
+            }
+            for name in memory:
+                case["passes"][name] = {
+                    "seconds": min(timing[name]["seconds"] for timing in timings),
+                    "calls": memory[name]["calls"],
+                    "peak_kb": memory[name]["peak_bytes"] / 1024.0,
+                }
+
+            print_case(case)
+            report.append(case)
+
+    return report
+
+
+def print_case(case):
+    print(f"{case['segments']:4d} segments {case['rings']:3d} rings {case['vertices']:7d} verts  golden: {case['golden']}")
+    print(f"    ring binning: {case['ring_binning']}")
+    for name, result in case["passes"].items():
+        print(f"    {name:<8} {result['seconds'] * 1000.0:10.2f} ms {result['calls']:6d} calls {result['peak_kb']:12.1f} KB peak")
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="only run the small cases")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, the best is reported")
+    parser.add_argument("--update-golden", action="store_true", help="write the original per vertex loops' weights as the golden files, slow")
+    parser.add_argument("--json", help="also write the results to this file")
+    options = parser.parse_args(args)
+
+    segment_counts, ring_counts = (QUICK_SEGMENTS, QUICK_RINGS) if options.quick else (SEGMENTS, RINGS)
+    report = run(segment_counts, ring_counts, max(options.repeat, 1), options.update_golden)
+
+    if options.json:
+        with open(options.json, "w") as json_file:
+            json.dump(report, json_file, indent=4)
+
+    failures = [case for case in report if case["golden"] != "ok"]
+    if failures:
+        print(f"{len(failures)} case(s) do not match the golden weights.")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
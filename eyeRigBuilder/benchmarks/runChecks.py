@@ -0,0 +1,779 @@
+"""
+Correctness checks for the pure modules, run next to the benchmarks.
+
+Each check builds a small case with a known answer, worked out by hand, and asserts the
+module gives it back. The scene side runs against the same in-memory Maya stand-in as
+the benchmarks. Run with a plain Python that has NumPy, not inside Maya:
+
+    python eyeRigBuilder/benchmarks/runChecks.py
+    python eyeRigBuilder/benchmarks/runChecks.py graph_report curve_sampling
+"""
+import argparse
+import os
+import sys
+import tempfile
+import traceback
+import types
+from collections import Counter
+import numpy as np
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The tools import each other as riggingTools, point that name at this folder
+if "riggingTools" not in sys.modules:
+    package = types.ModuleType("riggingTools")
+    package.__path__ = [PACKAGE_DIR]
+    sys.modules["riggingTools"] = package
+
+from riggingTools.benchmarks import fakeMaya
+
+fakeMaya.install()
+
+from maya import cmds
+from riggingTools import arcLength
+from riggingTools import blinkModel
+from riggingTools import curveSampling
+from riggingTools import edgeLoops
+from riggingTools import exprCompiler
+from riggingTools import graphReport
+from riggingTools import iris
+from riggingTools import lidGuides
+from riggingTools import sceneCache
+from riggingTools import transformMath
+from riggingTools.graphBuilder import GraphBuilder
+
+
+CHECKS = {}
+
+
+def check(function):
+    """Registers a check under its name without the check_ prefix."""
+    CHECKS[function.__name__[len("check_"):]] = function
+    return function
+
+
+def assert_close(actual, expected, tolerance=1e-9):
+    actual, expected = np.asarray(actual, dtype=float), np.asarray(expected, dtype=float)
+    assert actual.shape == expected.shape and np.allclose(actual, expected, rtol=0.0, atol=tolerance), f"{actual} != {expected}"
+
+
+# ----------------------------------------------------------------------
+# graphReport
+
+
+def build_small_graph(scene):
+    """
+    A control driving a joint through a multiplyDivide, a plusMinusAverage with three
+    inputs and a parentConstraint that reads its joint back. Also a message connection,
+    which carries no evaluation, and time1, which is outside the rig.
+    """
+    for name, node_type in (("ctrl", "transform"), ("loc", "transform"), ("md", "multiplyDivide"),
+                            ("pma", "plusMinusAverage"), ("con", "parentConstraint"), ("jnt", "joint")):
+        scene.add_node(name, node_type)
+
+    for source, destination in (("ctrl.translateX", "md.input1X"), ("time1.outTime", "md.input2X"),
+                                ("ctrl.translateY", "pma.input1D[0]"), ("md.outputX", "pma.input1D[1]"),
+                                ("loc.translateX", "pma.input1D[2]"), ("pma.output1D", "con.target[0].targetOffsetTranslateX"),
+                                ("con.constraintTranslate", "jnt.translate"), ("jnt.parentInverseMatrix", "con.constraintParentInverseMatrix"),
+                                ("ctrl.message", "jnt.message")):
+        scene.connect(source, destination)
+
+
+@check
+def check_graph_report():
+    scene = fakeMaya.FakeScene()
+    fakeMaya.use_scene(scene)
+
+    with graphReport.track_nodes(cmds) as tracked:
+        build_small_graph(scene)
+
+    assert tracked["nodes"] == ["con", "ctrl", "jnt", "loc", "md", "pma"], tracked["nodes"]
+    # Nodes made outside the query cache have no build step
+    assert set(tracked["steps"].values()) == {graphReport.UNATTRIBUTED}, tracked["steps"]
+
+    steps = dict(tracked["steps"], md="create_math", pma="create_math")
+    graph = graphReport.read_graph(tracked["nodes"], steps, cmds)
+    report = graphReport.analyze(graph)
+
+    assert report["nodes"] == 6, report["nodes"]
+    # The message connection is left out, time1's still counts though time1 is not in the report
+    assert report["connections"] == 8, report["connections"]
+    assert report["node_types"] == {"transform": 2, "multiplyDivide": 1, "plusMinusAverage": 1, "parentConstraint": 1, "joint": 1}, report["node_types"]
+    assert report["build_steps"] == {"create_math": 2, graphReport.UNATTRIBUTED: 4}, report["build_steps"]
+    assert report["constraints"] == {"total": 1, "types": {"parentConstraint": 1}}, report["constraints"]
+
+    # The constraint and its joint feed each other, collapsed into one link of two nodes
+    assert report["loops"] == [["con", "jnt"]], report["loops"]
+    assert report["longest_chain"] == {"length": 5, "nodes": [["ctrl"], ["md"], ["pma"], ["con", "jnt"]]}, report["longest_chain"]
+
+    assert report["fan_in"][0] == {"node": "pma", "type": "plusMinusAverage", "connections": 3}, report["fan_in"]
+    assert [spot["node"] for spot in report["fan_in"]] == ["pma", "con", "md", "jnt"], report["fan_in"]
+    assert report["fan_out"][0] == {"node": "ctrl", "type": "transform", "connections": 2}, report["fan_out"]
+
+    assert graphReport.check_report(report, {"nodes": 6, "longest_chain": 5}) == []
+    assert graphReport.check_report(report, {"fan_in": 2, "constraints": 0}) == ["fan_in is 3, over the limit of 2", "constraints is 1, over the limit of 0"]
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "report.json")
+        graphReport.save_report(report, path)
+        assert graphReport.load_report(path) == report
+
+
+# ----------------------------------------------------------------------
+# curveSampling
+
+# A cubic Bezier, Maya lists its knots as 0 0 0 1 1 1
+BEZIER_CVS = [(0.0, 0.0, 0.0), (1.0, 2.0, 0.0), (3.0, 2.0, 0.0), (4.0, 0.0, 0.0)]
+BEZIER_KNOTS = [0.0, 0.0, 0.0, 1.0, 1.0, 1.0]
+
+# A periodic cubic over the corners of a diamond, four spans. Maya repeats the first
+# three CVs at the end and lists knots -2 to 6, the domain is 0 to 4
+DIAMOND = [(1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (-1.0, 0.0, 0.0), (0.0, -1.0, 0.0)]
+PERIODIC_CVS = DIAMOND + DIAMOND[:3]
+PERIODIC_KNOTS = list(range(-2, 7))
+
+
+@check
+def check_curve_sampling():
+    # (P0 + 3 P1 + 3 P2 + P3) / 8 halfway, the end CVs at the ends, clamped outside the domain
+    points = curveSampling.sample_curve(BEZIER_CVS, BEZIER_KNOTS, 3, [-1.0, 0.0, 0.5, 1.0, 2.0])
+    assert_close(points, [(0, 0, 0), (0, 0, 0), (2.0, 1.5, 0.0), (4, 0, 0), (4, 0, 0)])
+
+    # 3 (P1 - P0) at the start, 3/4 (P1 - P0) + 3/2 (P2 - P1) + 3/4 (P3 - P2) halfway
+    tangents = curveSampling.sample_tangents(BEZIER_CVS, BEZIER_KNOTS, 3, [0.0, 0.5, 1.0])
+    assert_close(tangents, [(3, 6, 0), (4.5, 0, 0), (3, -6, 0)])
+
+    # Uniform cubic: (P0 + 4 P1 + P2) / 6 on a knot, (P0 + 23 P1 + 23 P2 + P3) / 48 mid span.
+    # The periodic curve ends where it starts, with the same tangent (P2 - P0) / 2
+    points = curveSampling.sample_curve(PERIODIC_CVS, PERIODIC_KNOTS, 3, [0.0, 0.5, 1.0, 4.0])
+    assert_close(points, [(0, 2 / 3, 0), (-22 / 48, 22 / 48, 0), (-2 / 3, 0, 0), (0, 2 / 3, 0)])
+    tangents = curveSampling.sample_tangents(PERIODIC_CVS, PERIODIC_KNOTS, 3, [0.0, 4.0])
+    assert_close(tangents, [(-1, 0, 0), (-1, 0, 0)])
+
+    # A degree 1 curve goes straight through its CVs, at one parameter step per CV
+    line = [(0.0, 0.0, 0.0), (2.0, 0.0, 0.0), (2.0, 2.0, 0.0)]
+    assert_close(curveSampling.sample_curve(line, [0.0, 1.0, 2.0], 1, [0.5, 1.5]), [(1, 0, 0), (2, 1, 0)])
+    assert_close(curveSampling.sample_tangents(line, [0.0, 1.0, 2.0], 1, [0.5, 1.5]), [(2, 0, 0), (0, 2, 0)])
+
+    try:
+        curveSampling.sample_curve(BEZIER_CVS, BEZIER_KNOTS[:-1], 3, [0.0])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("A short knot vector was accepted")
+
+
+@check
+def check_mirror_axis():
+    points = curveSampling.sample_curve(BEZIER_CVS, BEZIER_KNOTS, 3, [0.5])
+    assert curveSampling.MIRROR_AXES[0] == "none"
+
+    # The node passes its mirrorAxis enum value less one, none mirrors nothing
+    for value, axis in enumerate(curveSampling.MIRROR_AXES):
+        mirrored = curveSampling.sample_curve(BEZIER_CVS, BEZIER_KNOTS, 3, [0.5], mirror_axis=value - 1 if value else None)
+        expected = points.copy()
+        if value:
+            expected[:, "xyz".index(axis)] *= -1.0
+        assert_close(mirrored, expected)
+
+    assert_close(curveSampling.sample_curve(BEZIER_CVS, BEZIER_KNOTS, 3, [0.5], mirror_axis=0), [(-2.0, 1.5, 0.0)])
+
+
+# ----------------------------------------------------------------------
+# edgeLoops
+
+
+@check
+def check_edge_loops():
+    # Edges in any order and either direction. Closed loops start at the lowest vertex and
+    # head to its lower numbered neighbour, open ones start at the lower numbered end
+    chain, closed = edgeLoops.order_edge_loop([(2, 3), (0, 1), (3, 0), (2, 1)])
+    assert chain.tolist() == [0, 1, 2, 3] and closed, (chain, closed)
+
+    chain, closed = edgeLoops.order_edge_loop([(10, 7), (3, 12), (7, 3), (12, 5)])
+    assert chain.tolist() == [5, 12, 3, 7, 10] and not closed, (chain, closed)
+
+    chain, closed = edgeLoops.order_edge_loop([(5, 4), (2, 4), (9, 5)])
+    assert chain.tolist() == [2, 4, 5, 9] and not closed, (chain, closed)
+
+    assert edgeLoops.loop_problems([(0, 1), (1, 2), (1, 3)]) == ["vertices 1 join more than two edges", "3 open ends, a loop has two or none"]
+    assert edgeLoops.loop_problems([(0, 1), (2, 3)]) == ["4 open ends, a loop has two or none", "2 separate pieces"]
+    assert edgeLoops.loop_problems([]) == ["no edges"]
+
+    assert edgeLoops.check_edge_loops([[(0, 1), (1, 2)], [(0, 1), (2, 3)]]) == {1: ["4 open ends, a loop has two or none", "2 separate pieces"]}
+    try:
+        edgeLoops.order_edge_loops([[(0, 1), (1, 2)], [(0, 1), (2, 3)]])
+    except edgeLoops.BrokenLoopError as error:
+        assert str(error).startswith("loop 1: "), error
+    else:
+        raise AssertionError("A broken loop was ordered")
+
+
+# ----------------------------------------------------------------------
+# exprCompiler
+
+EYE_SCALE_SOURCE = """
+    avg = (iris.scaleX + iris.scaleY) / 2
+    pupil.translateZ = -0.1 * (avg if avg > 1 else 0)
+    pupil.scaleX = 1 + 0.05 * ((1 if iris.scaleX == 1 else iris.scaleX) - 1)
+    pupil.scaleY = 1 + 0.05 * ((1 if iris.scaleY == 1 else iris.scaleY) - 1)
+"""
+
+EYE_SCALE_DESCRIPTION = """\
+l_eyeScale: 5 nodes
+    l_eyeScale_pma01 (plusMinusAverage average)
+        input1D[0] <- l_iris_ctrl.scaleX
+        input1D[1] <- l_iris_ctrl.scaleY
+    l_eyeScale_mdn02 (multiplyDivide *)
+        input1X <- l_iris_ctrl.scaleX
+        input1Y <- l_iris_ctrl.scaleY
+        input2X <- 0.05
+        input2Y <- 0.05
+    l_eyeScale_cond03 (condition >)
+        colorIfFalseR <- 0.0
+        colorIfTrueR <- l_eyeScale_pma01.output1D
+        firstTerm <- l_eyeScale_pma01.output1D
+        secondTerm <- 1.0
+    l_eyeScale_pma04 (plusMinusAverage sum)
+        input3D[0].input3Dx <- l_eyeScale_mdn02.outputX
+        input3D[0].input3Dy <- l_eyeScale_mdn02.outputY
+        input3D[1].input3Dx <- 0.95
+        input3D[1].input3Dy <- 0.95
+    l_eyeScale_mdn05 (multiplyDivide *)
+        input1X <- l_eyeScale_cond03.outColorR
+        input2X <- -0.1
+    l_pupil_jnt.translateZ <- l_eyeScale_mdn05.outputX
+    l_pupil_jnt.scaleX <- l_eyeScale_pma04.output3Dx
+    l_pupil_jnt.scaleY <- l_eyeScale_pma04.output3Dy"""
+
+
+def baseline_eye_scale_nodes():
+    """
+    The eye scale network as iris.py wired it by hand before the compiler, in plan() form:
+    average, condition and multiply for the push back, then a condition, subtract,
+    multiply and add for each of scaleX and scaleY.
+    """
+    nodes = [
+        {"type": "plusMinusAverage", "name": "l_irisScale_avg", "values": {"operation": 3},
+         "connections": [("l_iris_ctrl.scaleX", "input1D[0]"), ("l_iris_ctrl.scaleY", "input1D[1]")]},
+        {"type": "condition", "name": "l_irisScale_condition", "values": {"operation": 2, "secondTerm": 1.0, "colorIfFalseR": 0.0},
+         "connections": [("l_irisScale_avg.output1D", "firstTerm"), ("l_irisScale_avg.output1D", "colorIfTrueR")]},
+        {"type": "multiplyDivide", "name": "l_irisScale_multiply", "values": {"input2X": -0.1},
+         "connections": [("l_irisScale_condition.outColorR", "input1X")]},
+    ]
+    outputs = [("l_pupil_jnt.translateZ", ("plug", "l_irisScale_multiply.outputX"))]
+
+    for attr in ("X", "Y"):
+        nodes += [
+            {"type": "condition", "name": f"l_pupilScale_condition_{attr.lower()}", "values": {"operation": 0, "secondTerm": 1.0, "colorIfTrueR": 1.0},
+             "connections": [(f"l_iris_ctrl.scale{attr}", "firstTerm"), (f"l_iris_ctrl.scale{attr}", "colorIfFalseR")]},
+            {"type": "plusMinusAverage", "name": f"l_pupilScale_subtract_{attr.lower()}", "values": {"operation": 2, "input1D[1]": 1.0},
+             "connections": [(f"l_pupilScale_condition_{attr.lower()}.outColorR", "input1D[0]")]},
+            {"type": "multiplyDivide", "name": f"l_pupilScale_adjust_{attr.lower()}", "values": {"operation": 1, f"input2{attr}": 0.05},
+             "connections": [(f"l_pupilScale_subtract_{attr.lower()}.output1D", f"input1{attr}")]},
+            {"type": "plusMinusAverage", "name": f"l_pupilScale_add_{attr.lower()}", "values": {"operation": 1, "input1D[1]": 1.0},
+             "connections": [(f"l_pupilScale_adjust_{attr.lower()}.output{attr}", "input1D[0]")]},
+        ]
+        outputs.append((f"l_pupil_jnt.scale{attr}", ("plug", f"l_pupilScale_add_{attr.lower()}.output1D")))
+
+    return nodes, outputs
+
+
+def evaluate_network(nodes, outputs, plugs):
+    """
+    Evaluates planned utility nodes, in order, from the given scene plug values with Maya's
+    attribute defaults. Returns {output plug: value}.
+    """
+    plugs = dict(plugs)
+    for node in nodes:
+        inputs = dict(node["values"])
+        for source, attribute in node["connections"]:
+            inputs[attribute] = plugs[source]
+        operation = inputs.get("operation", 0 if node["type"] == "condition" else 1)
+
+        if node["type"] == "multiplyDivide":
+            for axis in "XYZ":
+                first, second = inputs.get(f"input1{axis}", 0.0), inputs.get(f"input2{axis}", 1.0)
+                if operation == exprCompiler.MULTIPLY:
+                    plugs[f"{node['name']}.output{axis}"] = first * second
+                elif operation == exprCompiler.DIVIDE:
+                    plugs[f"{node['name']}.output{axis}"] = first / second if second else 0.0
+                else:
+                    plugs[f"{node['name']}.output{axis}"] = first ** second if first or second >= 0 else 0.0
+
+        elif node["type"] == "plusMinusAverage":
+            for pattern, output in (("input1D[{}]", "output1D"), ("input3D[{}].input3Dx", "output3Dx"),
+                                    ("input3D[{}].input3Dy", "output3Dy"), ("input3D[{}].input3Dz", "output3Dz")):
+                values = [inputs[pattern.format(index)] for index in range(16) if pattern.format(index) in inputs]
+                if not values:
+                    continue
+                total = values[0] - sum(values[1:]) if operation == exprCompiler.SUBTRACT else sum(values)
+                plugs[f"{node['name']}.{output}"] = total / len(values) if operation == exprCompiler.AVERAGE else total
+
+        else:
+            test = exprCompiler.CONDITION_TESTS[operation](inputs.get("firstTerm", 0.0), inputs.get("secondTerm", 0.0))
+            for channel in "RGB":
+                plugs[f"{node['name']}.outColor{channel}"] = inputs.get(f"colorIfTrue{channel}", 0.0) if test else inputs.get(f"colorIfFalse{channel}", 1.0)
+
+    return {plug: source[1] if source[0] == "const" else plugs[source[1]] for plug, source in outputs}
+
+
+@check
+def check_expr_compiler():
+    network = exprCompiler.Network(EYE_SCALE_SOURCE, bindings={"iris": "l_iris_ctrl", "pupil": "l_pupil_jnt"}, name="l_eyeScale")
+    assert network.describe() == EYE_SCALE_DESCRIPTION, network.describe()
+
+    # Same outputs as the hand wired network, on both sides of the conditions
+    nodes, outputs = network.plan()
+    baseline_nodes, baseline_outputs = baseline_eye_scale_nodes()
+    baseline = evaluate_network(baseline_nodes, baseline_outputs, {"l_iris_ctrl.scaleX": 3.0, "l_iris_ctrl.scaleY": 2.0})
+    assert_close([baseline[f"l_pupil_jnt.{attribute}"] for attribute in ("translateZ", "scaleX", "scaleY")], [-0.25, 1.1, 1.05])
+    for scale_x in (0.5, 1.0, 1.2, 3.0):
+        for scale_y in (0.25, 1.0, 2.0):
+            plugs = {"l_iris_ctrl.scaleX": scale_x, "l_iris_ctrl.scaleY": scale_y}
+            compiled, baseline = evaluate_network(nodes, outputs, plugs), evaluate_network(baseline_nodes, baseline_outputs, plugs)
+
+            assert compiled.keys() == baseline.keys(), (compiled, baseline)
+            for plug in baseline:
+                assert abs(compiled[plug] - baseline[plug]) < 1e-12, (plug, scale_x, scale_y, compiled[plug], baseline[plug])
+
+    # create_controls keeps the hand wired names on the nodes doing the same job
+    node_names = {suffix: f"l_{name}" for suffix, name in iris.EYE_SCALE_NODE_NAMES.items()}
+    nodes, outputs = exprCompiler.Network(EYE_SCALE_SOURCE, bindings={"iris": "l_iris_ctrl", "pupil": "l_pupil_jnt"},
+                                          name="l_eyeScale", node_names=node_names).plan()
+    assert [node["name"] for node in nodes] == ["l_irisScale_avg", "l_pupilScale_adjust", "l_irisScale_condition",
+                                                "l_pupilScale_add", "l_irisScale_multiply"], nodes
+    baseline_types = {}
+    for baseline_node in baseline_nodes:
+        name = baseline_node["name"]
+        baseline_types[name[:-2] if name.endswith(("_x", "_y")) else name] = baseline_node["type"]
+    assert all(node["type"] == baseline_types[node["name"]] for node in nodes), nodes
+    assert dict(outputs) == {"l_pupil_jnt.translateZ": ("plug", "l_irisScale_multiply.outputX"),
+                             "l_pupil_jnt.scaleX": ("plug", "l_pupilScale_add.output3Dx"),
+                             "l_pupil_jnt.scaleY": ("plug", "l_pupilScale_add.output3Dy")}, outputs
+
+
+# ----------------------------------------------------------------------
+# arcLength
+
+
+@check
+def check_arc_length():
+    # Two straight pieces, 3 then 4 long, one parameter step each
+    table = arcLength.ArcLengthTable([0.0, 1.0, 2.0], [(0, 0, 0), (3, 0, 0), (3, 4, 0)])
+    assert table.length == 7.0
+    assert_close(table.parameters_at([0.0, 1.5, 3.0, 5.0, 7.0]), [0.0, 0.5, 1.0, 1.5, 2.0])
+    assert_close(table.points_at([1.5, 5.0]), [(1.5, 0, 0), (3, 2, 0)])
+    assert_close(table.even_lengths(3), [0.0, 3.5, 7.0])
+
+    # A closed square leaves out the end, it sits on the start
+    square = arcLength.ArcLengthTable(range(5), [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (0, 0, 0)], closed=True)
+    parameters, points = square.even_samples(4)
+    assert_close(parameters, [0, 1, 2, 3])
+    assert_close(points, [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)])
+
+    # A cubic with evenly spaced CVs on a line moves at constant speed, sampled per span
+    curve = lidGuides.LidCurve([(0, 0, 0), (1, 0, 0), (2, 0, 0), (3, 0, 0)], BEZIER_KNOTS, 3)
+    table = curve.length_table()
+    assert len(table.parameters) == arcLength.SAMPLES_PER_SPAN + 1
+    assert abs(table.length - 3.0) < 1e-12
+    assert_close(curve.parameters_at_percentages([0.25, 0.5]), [0.25, 0.5])
+
+
+# ----------------------------------------------------------------------
+# blinkModel
+
+
+def build_blink_model():
+    """
+    One CV curves: the blend curve between the two driver curves, at heights 1 and -1,
+    and each lid curve starting on its driver. The lower lid sits one unit along X.
+    """
+    upper, lower, blend = (0.0, 1.0, 0.0), (0.0, -1.0, 0.0), (0.0, 0.0, 0.0)
+    blend_shapes = [
+        blinkModel.CurveBlendShape("drivers_bs", "blend_crv", [blend], {"upperDriver_crv": [upper], "lowerDriver_crv": [lower]}),
+        blinkModel.CurveBlendShape("upperBlink_bs", "upperLid_crv", [upper], {"blend_crv": [blend], "upperDriver_crv": [upper]}),
+        blinkModel.CurveBlendShape("lowerBlink_bs", "lowerLid_crv", [lower], {"blend_crv": [blend], "lowerDriver_crv": [lower]}),
+    ]
+    translation = np.eye(4)
+    translation[3, :3] = (1.0, 0.0, 0.0)
+    chain = blinkModel.BlendShapeChain(blend_shapes, {"lowerLid_crv": translation})
+
+    return blinkModel.BlinkModel(chain, "blend_crv", ["upperDriver_crv", "lowerDriver_crv"], "upperBlink_bs", "lowerBlink_bs", "drivers_bs")
+
+
+@check
+def check_blink_model():
+    assert_close(blinkModel.remap([-2.0, -1.0, 0.0, 0.5, 3.0], -1, 1, 0, 1), [0.0, 0.0, 0.5, 0.75, 1.0])
+    assert_close(blinkModel.remap([-1.0, 0.0, 1.0], -1, 1, 1, 0), [1.0, 0.5, 0.0])
+
+    model = build_blink_model()
+
+    # blinkHeight moves the blend curve between the drivers, the blend is at that height
+    assert_close(model.curve("blend_crv", blink_height=0.5), [(0.0, 0.5, 0.0)])
+
+    # A lid goes from its driver to the blend curve as its blink goes from 0 to 1
+    assert_close(model.curve("upperLid_crv"), [(0.0, 1.0, 0.0)])
+    assert_close(model.curve("upperLid_crv", upper_blink=1.0, blink_height=-0.5), [(0.0, -0.5, 0.0)])
+    assert_close(model.cv_positions("upperLid_crv", 0, upper_blink=0.5), (0.0, 0.5, 0.0))
+
+    # The lower lid is moved by its world matrix, or not for object space
+    assert_close(model.cv_positions("lowerLid_crv", 0, lower_blink=1.0, blink_height=0.5), (1.0, 0.5, 0.0))
+    assert_close(model.cv_positions("lowerLid_crv", 0, lower_blink=1.0, blink_height=0.5, world=False), (0.0, 0.5, 0.0))
+
+    # A table gives one curve per (upperBlink, lowerBlink, blinkHeight) row
+    table = model.table("upperLid_crv", [(0.0, 0.0, 0.0), (1.0, 0.0, 1.0), (0.5, 1.0, -1.0)])
+    assert_close(table, [[(0.0, 1.0, 0.0)], [(0.0, 1.0, 0.0)], [(0.0, 0.0, 0.0)]])
+
+
+# ----------------------------------------------------------------------
+# lidGuides
+
+
+@check
+def check_lid_guides():
+    # A left eye lower lid straight along +X, a cubic moving at constant speed
+    lower = lidGuides.LidCurve([(0, 0, 0), (4 / 3, 0, 0), (8 / 3, 0, 0), (4, 0, 0)], BEZIER_KNOTS, 3)
+    upper = lidGuides.LidCurve([(0, 1, 0), (4 / 3, 1, 0), (8 / 3, 1, 0), (4, 1, 0)], BEZIER_KNOTS, 3)
+    assert lower.direction == 1 and lower.mid_cv == 1
+
+    # Each corner aims X at the point halfway between the pupil and the other corner
+    inner, outer = lidGuides.corner_matrices(lower, (2.0, 0.0, 1.0))
+    assert_close(inner[3], (0, 0, 0, 1))
+    assert_close(inner[0, :3], np.array((3.0, 0.0, 0.5)) / np.linalg.norm((3.0, 0.0, 0.5)))
+    assert_close(outer[3], (4, 0, 0, 1))
+    assert_close(outer[0, :3], np.array((3.0, 0.0, -0.5)) / np.linalg.norm((3.0, 0.0, -0.5)))
+    for matrix in (inner, outer):
+        assert_close(matrix[:3, :3] @ matrix[:3, :3].T, np.eye(3))
+
+    # Tweaks at a quarter and three quarters of the length, along the lid
+    tweaks = lidGuides.tweak_matrices(lower, lower.direction)
+    assert_close(tweaks[:, 3, :3], [(1, 0, 0), (3, 0, 0)])
+    assert_close(tweaks[:, 0, :3], [(1, 0, 0), (1, 0, 0)])
+
+    # The mid guides face each other along Y, the lower one stays on its lid within a
+    # sample of the length table
+    upper_mid, lower_mid = lidGuides.mid_matrices(upper, lower, lower.direction)
+    assert_close(upper_mid[3, :3], (4 / 3, 1, 0))
+    assert_close(upper_mid[1, :3], (0, -1, 0))
+    assert_close(lower_mid[1, :3], (0, -1, 0))
+    assert_close(lower_mid[3, 1:3], (0, 0))
+    assert abs(lower_mid[3, 0] - 4 / 3) <= 4.0 / arcLength.SAMPLES_PER_SPAN / 2, lower_mid[3]
+
+    upper_guides, lower_guides = lidGuides.lid_matrices(upper, lower)
+    assert len(upper_guides) == len(lower_guides) == 3
+    assert_close(lower_guides[1], lower_mid)
+
+
+# ----------------------------------------------------------------------
+# sceneCache
+
+
+class StubCommands:
+    """A few transforms behind the query cache, counting the calls that reach them."""
+
+    def __init__(self):
+        self.parents = {"grp": None, "a": "grp", "b": "grp", "c": None, "other": None}
+        self.positions = {node: [0.0, 0.0, 0.0] for node in self.parents}
+        self.selection = []
+        self.calls = Counter()
+
+    def listRelatives(self, node, children=False):
+        self.calls["listRelatives"] += 1
+        return sorted(child for child, parent in self.parents.items() if parent == node) or None
+
+    def xform(self, node, query=False, translation=False, worldSpace=False):
+        self.calls["xform"] += 1
+        return list(self.positions[node])
+
+    def ls(self, selection=False):
+        self.calls["ls"] += 1
+        return list(self.selection)
+
+    def select(self, *nodes):
+        self.selection = list(nodes)
+
+    def setAttr(self, plug, value):
+        node, attribute = plug.split(".")
+        self.positions[node]["XYZ".index(attribute[-1])] = value
+
+    def parent(self, child, parent):
+        self.parents[child] = parent
+        return [child]
+
+    def duplicate(self, node):
+        name = f"{node}1"
+        self.parents[name] = self.parents[node]
+        self.positions[name] = list(self.positions[node])
+        return [name]
+
+    def rename(self, node, name):
+        self.parents[name] = self.parents.pop(node)
+        self.positions[name] = self.positions.pop(node)
+        return name
+
+    def makeIdentity(self, *nodes, apply=False):
+        pass
+
+    def delete(self, node):
+        del self.parents[node], self.positions[node]
+
+
+class StubModifier:
+    def __init__(self):
+        self.calls = Counter()
+
+    def doIt(self):
+        self.calls["doIt"] += 1
+
+    def undoIt(self):
+        self.calls["undoIt"] += 1
+
+
+@check
+def check_scene_cache():
+    stub = StubCommands()
+    cache = sceneCache.QueryCache(commands=stub)
+
+    # Outside a build every query goes through
+    cache.listRelatives("grp", children=True)
+    cache.listRelatives("grp", children=True)
+    assert stub.calls["listRelatives"] == 2, stub.calls
+
+    with cache.build(report=False):
+        assert cache.listRelatives("grp", children=True) == ["a", "b"]
+        assert cache.listRelatives("grp", children=True) == ["a", "b"]
+        cache.listRelatives("other", children=True)
+        cache.xform("other", query=True, translation=True, worldSpace=True)
+        assert stub.calls == {"listRelatives": 4, "xform": 1}, stub.calls
+
+        # Any mutation drops evaluated entries, structural ones only go when their nodes are named
+        cache.setAttr("a.translateX", 2.0)
+        assert cache.xform("other", query=True, translation=True, worldSpace=True) == [0.0, 0.0, 0.0]
+        cache.listRelatives("other", children=True)
+        assert stub.calls == {"listRelatives": 4, "xform": 2}, stub.calls
+
+        # Parenting, duplicating and renaming a child drop the listing that named it
+        cache.parent("c", "grp")
+        assert cache.listRelatives("grp", children=True) == ["a", "b", "c"]
+        assert cache.duplicate("b") == ["b1"]
+        assert cache.listRelatives("grp", children=True) == ["a", "b", "b1", "c"]
+        cache.rename("b1", "d")
+        assert cache.listRelatives("grp", children=True) == ["a", "b", "c", "d"]
+        assert stub.calls["listRelatives"] == 7, stub.calls
+
+        # Selecting drops the selection queries
+        assert cache.ls(selection=True) == []
+        cache.select("a")
+        assert cache.ls(selection=True) == ["a"]
+        assert stub.calls["ls"] == 2, stub.calls
+
+        # A command given no nodes works on the selection, so it drops what names the selected nodes
+        cache.listRelatives("a", children=True)
+        cache.makeIdentity(apply=True)
+        cache.listRelatives("a", children=True)
+        cache.listRelatives("other", children=True)
+        assert stub.calls["listRelatives"] == 9 and stub.calls["ls"] == 2, stub.calls
+
+        # delete can reach anything and clears the whole cache
+        cache.delete("d")
+        cache.listRelatives("other", children=True)
+        assert stub.calls["listRelatives"] == 10, stub.calls
+
+    # Leaving the build clears it as well
+    with cache.build(report=False):
+        cache.listRelatives("other", children=True)
+    assert stub.calls["listRelatives"] == 11, stub.calls
+
+    # A GraphBuilder commit runs redo() through the graphBuilderCommit command. Its modifier edits
+    # bypass cmds, so redo drops the entries naming its nodes on the shared cache itself
+    scene = fakeMaya.FakeScene()
+    fakeMaya.use_scene(scene)
+    for name in ("jnt", "other"):
+        scene.add_node(name, "joint")
+
+    builder = GraphBuilder.__new__(GraphBuilder)
+    builder.modifier = StubModifier()
+    builder.nodes = ["|rig|jnt_offset"]
+    builder.scene_nodes = {"jnt": None}
+    builder.committed = False
+
+    shared = sceneCache.cmds
+    with shared.build(report=False):
+        for _ in range(2):
+            shared.nodeType("jnt")
+            shared.nodeType("jnt_offset")
+            shared.nodeType("other")
+        assert scene.calls["nodeType"] == 3, scene.calls
+
+        builder.redo()
+        builder.redo()
+        assert builder.modifier.calls == {"doIt": 1}, builder.modifier.calls
+        shared.nodeType("jnt")
+        shared.nodeType("jnt_offset")
+        shared.nodeType("other")
+        assert scene.calls["nodeType"] == 5, scene.calls
+
+        # Undo can take anything out, it clears the whole cache
+        builder.undo()
+        shared.nodeType("other")
+        assert builder.modifier.calls == {"doIt": 1, "undoIt": 1}, builder.modifier.calls
+        assert scene.calls["nodeType"] == 6, scene.calls
+
+
+# ----------------------------------------------------------------------
+# transformMath
+
+
+def aim_axes(matrix):
+    """The X, Y and Z rows and the translation of one aimed matrix."""
+    return matrix[0, :3], matrix[1, :3], matrix[2, :3], matrix[3, :3]
+
+
+@check
+def check_transform_math():
+    # Z aimed at +X with the scene up: Y stays up and X = Y x Z points down -Z
+    x, y, z, position = aim_axes(transformMath.aim_matrices((0, 0, 0), (1, 0, 0), world_up_type="scene"))
+    assert_close((x, y, z, position), [(0, 0, -1), (0, 1, 0), (1, 0, 0), (0, 0, 0)])
+
+    # The same aim with +Z as the up vector turns Y onto +Z and X onto +Y
+    x, y, z, _ = aim_axes(transformMath.aim_matrices((0, 0, 0), (1, 0, 0), world_up_type="vector", world_up_vector=(0, 0, 1)))
+    assert_close((x, y, z), [(0, 1, 0), (0, 0, 1), (1, 0, 0)])
+
+    # "object" points Y at the up object, two units below
+    up_object = np.eye(4)
+    up_object[3, :3] = (1, -2, 0)
+    x, y, z, position = aim_axes(transformMath.aim_matrices((1, 0, 0), (1, 0, 4), world_up_type="object", world_up_matrix=up_object))
+    assert_close((x, y, z, position), [(-1, 0, 0), (0, -1, 0), (0, 0, 1), (1, 0, 0)])
+
+    # "objectrotation" turns the up vector by the object's rotation, 90 degrees about Z takes +Y to -X
+    up_object = transformMath.compose(transformMath.rotation_from_euler((0, 0, 90)), (5, 5, 5))
+    x, y, z, _ = aim_axes(transformMath.aim_matrices((0, 0, 0), (0, 0, 1), world_up_type="objectrotation", world_up_matrix=up_object))
+    assert_close((x, y, z), [(0, 1, 0), (-1, 0, 0), (0, 0, 1)])
+
+    # X aimed down -Z, as the eyelid guides aim, leaves Z = X x Y on +X
+    x, y, z, _ = aim_axes(transformMath.aim_matrices((0, 0, 0), (0, 0, -2), aim_vector=(1, 0, 0), world_up_type="scene"))
+    assert_close((x, y, z), [(0, 0, -1), (0, 1, 0), (1, 0, 0)])
+
+    try:
+        transformMath.aim_matrices((0, 0, 0), (1, 0, 0), world_up_type="objectUp")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("an unknown world up type was accepted")
+
+    # Aiming Z at (1, 0, 1) is 45 degrees about Y, skipped axes keep the current angle instead
+    current = transformMath.rotation_from_euler((20, 10, 0))
+    for skip, angles in (("", (0, 45, 0)), ("x", (20, 45, 0)), ("y", (0, 10, 0)), ("xy", (20, 10, 0))):
+        matrix = transformMath.aim_matrices((0, 0, 0), (1, 0, 1), world_up_type="scene", skip=skip, current_rotations=current)
+        assert_close(transformMath.euler_from_rotation(matrix[:3, :3]), angles)
+
+    try:
+        transformMath.aim_matrices((0, 0, 0), (1, 0, 1), skip="x")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("skip was accepted without the current rotations")
+
+    # XYZ rotate order, row vectors: 90 degrees about Z takes X to +Y and Y to -X
+    assert_close(transformMath.rotation_from_euler((0, 0, 90)), [(0, 1, 0), (-1, 0, 0), (0, 0, 1)])
+
+    angles = np.array([(30, -20, 75), (-120, 60, 10), (0, 0, 0)], dtype=float)
+    assert_close(transformMath.euler_from_rotation(transformMath.rotation_from_euler(angles)), angles)
+
+    rotation = transformMath.rotation_from_euler((30, -20, 75))
+    rotations, translations, scales = transformMath.decompose(transformMath.compose(rotation, (1, 2, 3), np.array((2.0, 3.0, 4.0))))
+    assert_close(rotations, rotation)
+    assert_close(translations, (1, 2, 3))
+    assert_close(scales, (2, 3, 4))
+
+    # Behavior mode mirror across X: the position reflects, X keeps its direction and Y and Z flip,
+    # so there is no negative scale and mirroring twice gives the matrix back
+    matrix = transformMath.compose(np.eye(3), (2, 1, 3))
+    mirrored = transformMath.mirror_matrices(matrix)
+    assert_close(mirrored, [(1, 0, 0, 0), (0, -1, 0, 0), (0, 0, -1, 0), (-2, 1, 3, 1)])
+    matrix = transformMath.compose(rotation, (2, 1, 3))
+    assert abs(np.linalg.det(transformMath.mirror_matrices(matrix)[:3, :3]) - 1.0) < 1e-12
+    assert_close(transformMath.mirror_matrices(transformMath.mirror_matrices(matrix)), matrix)
+
+    # Mirroring across Y reflects the Y position instead
+    assert_close(transformMath.mirror_matrices(transformMath.compose(np.eye(3), (2, 1, 3)), axis=1)[3], (2, -1, 3, 1))
+
+
+# ----------------------------------------------------------------------
+# eyelid joint drive modes (eyeFaceRig.DRIVE_MODES)
+
+
+def joint_matrix(translate=(0.0, 0.0, 0.0), rotate=(0.0, 0.0, 0.0), scale=(1.0, 1.0, 1.0), joint_orient=(0.0, 0.0, 0.0)):
+    """A joint's local matrix from its channels, [S][R][JO][T] like Maya's, with a zero jointOrient for a transform."""
+    rotations = transformMath.rotation_from_euler(rotate) @ transformMath.rotation_from_euler(joint_orient)
+
+    return transformMath.compose(rotations, translate, np.asarray(scale, dtype=float))
+
+
+@check
+def check_drive_modes():
+    # The control's offset and the joint's offset joint share a world matrix, the joint is
+    # zeroed on it, so at rest and when moved the joint should sit on its control
+    left_offset = transformMath.compose(transformMath.rotation_from_euler((10.0, -35.0, 60.0)), (2.0, 1.0, 0.5))
+    right_offset = transformMath.mirror_matrices(left_offset)
+    translate, rotate, scale = (0.1, -0.2, 0.3), (5.0, 15.0, -20.0), (1.2, 1.0, 0.8)
+    control_matrix = joint_matrix(translate, rotate, scale)
+
+    for offset in (left_offset, right_offset):
+        control_world = control_matrix @ offset
+
+        # "channels" copies the control's channels onto the joint
+        channels_world = joint_matrix(translate, rotate, scale) @ offset
+        # "matrix" plugs the control's matrix into offsetParentMatrix, below the joint's zeroed channels
+        matrix_world = joint_matrix() @ control_matrix @ offset
+
+        assert_close(channels_world, control_world)
+        assert_close(matrix_world, control_world)
+
+    # A jointOrient left on the joint lands on the other side of the control's transform in the two
+    # modes, which is why the matrix mode zeroes it
+    joint_orient = (0.0, 0.0, 30.0)
+    channels_world = joint_matrix(translate, rotate, scale, joint_orient) @ left_offset
+    matrix_world = joint_matrix(joint_orient=joint_orient) @ control_matrix @ left_offset
+    assert not np.allclose(channels_world, matrix_world)
+
+
+# ----------------------------------------------------------------------
+
+
+def run(names):
+    """Runs the named checks, all of them if names is empty. Returns the names that failed."""
+    unknown = set(names) - set(CHECKS)
+    if unknown:
+        raise ValueError(f"Unknown checks: {', '.join(sorted(unknown))}. Choose from {', '.join(CHECKS)}")
+
+    failures = []
+    for name in names or CHECKS:
+        try:
+            CHECKS[name]()
+        except Exception:
+            failures.append(name)
+            print(f"{name:<24} FAILED")
+            traceback.print_exc()
+        else:
+            print(f"{name:<24} ok")
+
+    return failures
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("checks", nargs="*", help="only run these checks")
+    options = parser.parse_args(args)
+
+    failures = run(options.checks)
+    if failures:
+        print(f"{len(failures)} check(s) failed.")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Synthetic eye meshes for the skinning benchmarks.
+
+The eye is a quad grid wrapped over the front of a unit sphere: loops of vertices
+around the pupil, pupil faces in the middle and iris faces around them. Joints and
+locators are laid out with the same names the eye rig builds, so the real skinning
+code runs on it unchanged.
+"""
+import numpy as np
+
+
+# Polar angles (radians from the front of the eye) of the innermost and outermost loops
+INNER_ANGLE = 0.05
+OUTER_ANGLE = 1.0
+
+
+def eye_vertex_points(segments, loops, offset=(0.0, 0.0, 0.0)):
+    """Points for loops x segments vertices, loop by loop from the pupil out."""
+    polar = np.linspace(INNER_ANGLE, OUTER_ANGLE, loops)[:, None]
+    azimuth = (2.0 * np.pi * np.arange(segments) / segments)[None, :]
+
+    points = np.stack((
+        np.sin(polar) * np.cos(azimuth),
+        np.sin(polar) * np.sin(azimuth),
+        np.cos(polar) * np.ones_like(azimuth),
+    ), axis=-1)
+
+    return points.reshape(-1, 3) + np.asarray(offset, dtype=float)
+
+
+def eye_faces(segments, loops):
+    """Quads between neighbouring loops, face id = loop * segments + segment."""
+    loop, segment = np.meshgrid(np.arange(loops - 1), np.arange(segments), indexing="ij")
+    next_segment = (segment + 1) % segments
+
+    faces = np.stack((
+        loop * segments + segment,
+        loop * segments + next_segment,
+        (loop + 1) * segments + next_segment,
+        (loop + 1) * segments + segment,
+    ), axis=-1)
+
+    return faces.reshape(-1, 4)
+
+
+def ring_points(polar, count, offset):
+    azimuth = 2.0 * np.pi * np.arange(count) / count
+    points = np.stack((np.sin(polar) * np.cos(azimuth), np.sin(polar) * np.sin(azimuth), np.full(count, np.cos(polar))), axis=-1)
+
+    return points + np.asarray(offset, dtype=float)
+
+
+def build_eye(scene, side="l", segments=24, rings=4, pupil_rings=2, joint_count=24, offset=(3.0, 0.0, 0.0)):
+    """
+    Adds one eye to a FakeScene: the {side}_eye_geo mesh, eye aim, iris and pupil joints,
+    the {side}_eyePupil_loc locator and the {side}_eye_sc skin cluster.
+    rings is the number of iris face rings, pupil_rings the number of pupil face rings.
+    Returns the face lists and joint lists the skinning passes take.
+    """
+    mesh = f"{side}_eye_geo"
+    loops = pupil_rings + rings + 1
+
+    scene.add_mesh(mesh, eye_vertex_points(segments, loops, offset), eye_faces(segments, loops))
+
+    polar = np.linspace(INNER_ANGLE, OUTER_ANGLE, loops)
+    iris_tips = [f"{side}_irisTip{i:02}_jnt" for i in range(joint_count)]
+    pupil_joints = [f"{side}_pupilScale{i:02}_jnt" for i in range(joint_count)]
+
+    scene.add_transform(f"{side}_eyeAim_jnt", offset)
+    scene.add_transform(f"{side}_eyePupil_loc", np.add(offset, (0.0, 0.0, 1.0)))
+    for name, point in zip(iris_tips, ring_points(polar[-1], joint_count, offset)):
+        scene.add_transform(name, point)
+        scene.add_transform(name.replace("Tip", ""), offset)
+    for name, point in zip(pupil_joints, ring_points(polar[pupil_rings // 2], joint_count, offset)):
+        scene.add_transform(name, point)
+
+    influences = [f"{side}_eyeAim_jnt"] + [name.replace("Tip", "") for name in iris_tips] + pupil_joints
+    scene.add_skin_cluster(f"{side}_eye_sc", mesh, influences)
+
+    pupil_face_count = pupil_rings * segments
+    iris_face_count = rings * segments
+
+    return {
+        "mesh": mesh,
+        "iris_faces": [f"{mesh}.f[{pupil_face_count}:{pupil_face_count + iris_face_count - 1}]"],
+        "pupil_faces": [f"{mesh}.f[0:{pupil_face_count - 1}]"],
+        "iris_joints": iris_tips,
+        "pupil_joints": pupil_joints,
+    }
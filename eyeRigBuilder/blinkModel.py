@@ -0,0 +1,147 @@
+"""
+Offline model of the blink blendShape chain on the eyelid curves.
+
+Blend shapes are linear, so a curve under a blendShape is its base CVs plus the weighted
+deltas of its targets, and a target that is itself deformed, like the blend curve feeding
+both blink shapes, is the same sum one level down. A BlendShapeChain captures the bases
+and targets once and evaluates any set of weights as array math. BlinkModel adds the
+settings shape's blinkHeight, upperBlink and lowerBlink in front of it, wired as
+Eye.create_blendshape_connections wires the scene, so a lid position at any blink state,
+or a whole table of them, comes out without setting an attribute or evaluating the graph.
+
+Weights can be scalars or arrays, arrays give one curve per state. Only from_scene
+needs Maya.
+"""
+import numpy as np
+
+
+BLINK_ATTRIBUTES = ("upperBlink", "lowerBlink", "blinkHeight")
+
+
+def _get_commands(commands):
+    if commands is None:
+        from riggingTools.sceneCache import cmds as commands
+
+    return commands
+
+
+def _read_cvs(shape, commands):
+    return np.asarray(commands.getAttr(f"{shape}.cv[*]"), dtype=float).reshape(-1, 3)
+
+
+def remap(values, input_min, input_max, output_min, output_max):
+    """remapValue with its default linear ramp, inputs outside the range clamp to its ends."""
+    amount = np.clip((np.asarray(values, dtype=float) - input_min) / (input_max - input_min), 0.0, 1.0)
+
+    return output_min + amount * (output_max - output_min)
+
+
+class CurveBlendShape:
+    def __init__(self, name, curve, base, targets):
+        self.name = name
+        self.curve = curve
+        self.base = np.asarray(base, dtype=float).reshape(-1, 3)
+        # Target name, which is also its weight alias, to its CVs
+        self.targets = {target: np.asarray(cvs, dtype=float).reshape(-1, 3) for target, cvs in targets.items()}
+
+    def __repr__(self):
+        return f"CurveBlendShape({self.name} on {self.curve}, {len(self.targets)} targets)"
+
+
+class BlendShapeChain:
+    def __init__(self, blend_shapes, matrices=None):
+        self.blend_shapes = {blend_shape.curve: blend_shape for blend_shape in blend_shapes}
+        # World matrix of each curve, Maya row vector layout, identity if not given
+        self.matrices = {curve: np.asarray(matrix, dtype=float).reshape(4, 4) for curve, matrix in (matrices or {}).items()}
+
+    @classmethod
+    def from_scene(cls, blend_shapes, commands=None):
+        """Captures the base, targets and world matrix of each blendShape's curve."""
+        commands = _get_commands(commands)
+
+        captured = []
+        matrices = {}
+        for name in blend_shapes:
+            shape = commands.blendShape(name, query=True, geometry=True)[0]
+            curve = commands.listRelatives(shape, parent=True)[0]
+
+            # The shape the deformers start from, the curve's own CVs if it has no history
+            original = commands.listConnections(f"{name}.originalGeometry[0]", source=True, destination=False, shapes=True) or [shape]
+            targets = {target: _read_cvs(target, commands) for target in commands.blendShape(name, query=True, target=True) or []}
+
+            captured.append(CurveBlendShape(name, curve, _read_cvs(original[0], commands), targets))
+            matrices[curve] = commands.xform(curve, query=True, matrix=True, worldSpace=True)
+
+        return cls(captured, matrices)
+
+    def evaluate(self, weights, curve):
+        """
+        CVs of a curve, in object space, for weights given as {blendShape: {target: weight}}.
+        Targets left out weigh 0. Shape (cvs, 3), or (states, cvs, 3) for array weights.
+        """
+        blend_shape = self.blend_shapes[curve]
+        shape_weights = weights.get(blend_shape.name, {})
+
+        cvs = blend_shape.base
+        for target, target_cvs in blend_shape.targets.items():
+            weight = np.asarray(shape_weights.get(target, 0.0), dtype=float)
+
+            # A deformed target is evaluated with the same weights
+            if target in self.blend_shapes:
+                target_cvs = self.evaluate(weights, target)
+
+            cvs = cvs + weight[..., None, None] * (target_cvs - blend_shape.base)
+
+        return cvs
+
+    def world(self, cvs, curve):
+        """Object space CVs of a curve moved by its world matrix."""
+        matrix = self.matrices.get(curve)
+        if matrix is None:
+            return cvs
+
+        return cvs @ matrix[:3, :3] + matrix[3, :3]
+
+
+class BlinkModel:
+    def __init__(self, chain, blend_curve, driver_curves, upper_blink_bs, lower_blink_bs, drivers_bs):
+        self.chain = chain
+        self.blend_curve = blend_curve
+        # Upper then lower, the targets of drivers_bs and of each blink shape
+        self.driver_curves = list(driver_curves)
+        self.upper_blink_bs = upper_blink_bs
+        self.lower_blink_bs = lower_blink_bs
+        self.drivers_bs = drivers_bs
+
+    @classmethod
+    def from_scene(cls, blend_curve, driver_curves, upper_blink_bs, lower_blink_bs, drivers_bs, commands=None):
+        chain = BlendShapeChain.from_scene([drivers_bs, upper_blink_bs, lower_blink_bs], commands)
+
+        return cls(chain, blend_curve, driver_curves, upper_blink_bs, lower_blink_bs, drivers_bs)
+
+    def weights(self, upper_blink=0.0, lower_blink=0.0, blink_height=0.0):
+        """The blendShape weights the settings shape's attributes drive."""
+        upper_blink, lower_blink, blink_height = np.broadcast_arrays(*(np.asarray(value, dtype=float) for value in (upper_blink, lower_blink, blink_height)))
+        upper_driver, lower_driver = self.driver_curves
+
+        return {
+            self.drivers_bs: {upper_driver: remap(blink_height, -1, 1, 0, 1), lower_driver: remap(blink_height, -1, 1, 1, 0)},
+            self.upper_blink_bs: {self.blend_curve: upper_blink, upper_driver: 1.0 - upper_blink},
+            self.lower_blink_bs: {self.blend_curve: lower_blink, lower_driver: 1.0 - lower_blink},
+        }
+
+    def curve(self, curve, upper_blink=0.0, lower_blink=0.0, blink_height=0.0, world=True):
+        """CVs of a curve in the chain at a blink state, or at each of arrays of them."""
+        cvs = self.chain.evaluate(self.weights(upper_blink, lower_blink, blink_height), curve)
+
+        return self.chain.world(cvs, curve) if world else cvs
+
+    def cv_positions(self, curve, index, upper_blink=0.0, lower_blink=0.0, blink_height=0.0, world=True):
+        """One CV of a curve, as pointPosition would give it after setting the attributes."""
+        return self.curve(curve, upper_blink, lower_blink, blink_height, world)[..., index, :]
+
+    def table(self, curve, states, world=True):
+        """CVs of a curve for rows of (upperBlink, lowerBlink, blinkHeight), shape (states, cvs, 3)."""
+        states = np.asarray(states, dtype=float).reshape(-1, len(BLINK_ATTRIBUTES))
+
+        return self.curve(curve, *states.T, world=world)
@@ -0,0 +1,113 @@
+"""
+curveSampler, a Python API 2.0 node that samples one curve at many parameters.
+
+It takes a curve (inputCurve, usually a shape's worldSpace[0]), an array of parameters and
+a mirrorAxis, and outputs one position per parameter, at the same logical index. A single
+node drives every offset along an eyelid or iris loop, where the rig used to evaluate
+one pointOnCurveInfo per CV and, on the mirrored side, one multiplyDivide per CV more.
+The math is curveSampling.sample_curve.
+
+Load it with load_plugin() before building, the module is its own plug-in file.
+"""
+import os
+import maya.api.OpenMaya as om2
+from riggingTools import curveSampling
+
+
+TYPE_NAME = "curveSampler"
+# From the 0x00000 - 0x7ffff block Autodesk leaves for local nodes
+TYPE_ID = om2.MTypeId(0x0007F1E0)
+
+PLUGIN_PATH = os.path.splitext(os.path.abspath(__file__))[0] + ".py"
+
+
+def maya_useNewAPI():
+    """Tells Maya the plug-in uses API 2.0."""
+
+
+class CurveSamplerNode(om2.MPxNode):
+    input_curve = None
+    parameter = None
+    mirror_axis = None
+    position = None
+
+    @staticmethod
+    def creator():
+        return CurveSamplerNode()
+
+    @staticmethod
+    def initialize():
+        typed_fn = om2.MFnTypedAttribute()
+        CurveSamplerNode.input_curve = typed_fn.create("inputCurve", "ic", om2.MFnData.kNurbsCurve)
+
+        numeric_fn = om2.MFnNumericAttribute()
+        CurveSamplerNode.parameter = numeric_fn.create("parameter", "pr", om2.MFnNumericData.kDouble, 0.0)
+        numeric_fn.array = True
+        numeric_fn.keyable = True
+
+        enum_fn = om2.MFnEnumAttribute()
+        CurveSamplerNode.mirror_axis = enum_fn.create("mirrorAxis", "ma", 0)
+        for value, axis in enumerate(curveSampling.MIRROR_AXES):
+            enum_fn.addField(axis, value)
+        enum_fn.keyable = True
+
+        numeric_fn = om2.MFnNumericAttribute()
+        CurveSamplerNode.position = numeric_fn.createPoint("position", "p")
+        numeric_fn.array = True
+        numeric_fn.usesArrayDataBuilder = True
+        numeric_fn.writable = False
+        numeric_fn.storable = False
+
+        for attribute in (CurveSamplerNode.input_curve, CurveSamplerNode.parameter, CurveSamplerNode.mirror_axis, CurveSamplerNode.position):
+            CurveSamplerNode.addAttribute(attribute)
+
+        for attribute in (CurveSamplerNode.input_curve, CurveSamplerNode.parameter, CurveSamplerNode.mirror_axis):
+            CurveSamplerNode.attributeAffects(attribute, CurveSamplerNode.position)
+
+    def compute(self, plug, data):
+        # Any position element or child asks for the whole array, it is one sampling pass
+        if plug.isChild:
+            plug = plug.parent()
+        if plug.isElement:
+            plug = plug.array()
+        if plug.attribute() != CurveSamplerNode.position:
+            return None
+
+        curve_fn = om2.MFnNurbsCurve(data.inputValue(CurveSamplerNode.input_curve).asNurbsCurve())
+
+        indices = []
+        parameters = []
+        parameter_handle = data.inputArrayValue(CurveSamplerNode.parameter)
+        while not parameter_handle.isDone():
+            indices.append(parameter_handle.elementLogicalIndex())
+            parameters.append(parameter_handle.inputValue().asDouble())
+            parameter_handle.next()
+
+        axis = data.inputValue(CurveSamplerNode.mirror_axis).asShort()
+        positions = curveSampling.sample_curve([list(point)[:3] for point in curve_fn.cvPositions()], list(curve_fn.knots()),
+                                               curve_fn.degree, parameters, mirror_axis=axis - 1 if axis else None)
+
+        position_handle = data.outputArrayValue(CurveSamplerNode.position)
+        builder = position_handle.builder()
+        for index, point in zip(indices, positions.tolist()):
+            builder.addElement(index).set3Double(*point)
+        position_handle.set(builder)
+        position_handle.setAllClean()
+
+        data.setClean(plug)
+
+
+def initializePlugin(plugin):
+    om2.MFnPlugin(plugin, "eyeRigBuilder", "1.0").registerNode(TYPE_NAME, TYPE_ID, CurveSamplerNode.creator, CurveSamplerNode.initialize)
+
+
+def uninitializePlugin(plugin):
+    om2.MFnPlugin(plugin).deregisterNode(TYPE_ID)
+
+
+def load_plugin():
+    """Loads this module as a plug-in unless the node type is already registered."""
+    from riggingTools.sceneCache import cmds
+
+    if not cmds.pluginInfo(PLUGIN_PATH, query=True, loaded=True):
+        cmds.loadPlugin(PLUGIN_PATH, quiet=True)
@@ -0,0 +1,77 @@
+"""
+Pure NURBS curve sampling for the curve sampler node.
+
+sample_curve evaluates a curve at any number of parameters in one vectorized de Boor
+pass, from the CVs, knots and degree Maya gives for it, and can mirror the positions
+across an axis. The curve sampler node (see curveSamplerNode) runs it on every
+evaluation in place of one pointOnCurveInfo, and one multiplyDivide on the mirrored
+side, per sampled point. Nothing here imports Maya.
+"""
+import numpy as np
+
+
+# mirrorAxis values on the node, none or the axis whose coordinate is negated
+MIRROR_AXES = ("none", "x", "y", "z")
+
+
+def full_knots(knots):
+    """
+    Maya lists spans + 2 * degree - 1 knots, leaving out the first and last of the usual
+    cvs + degree + 1. Those two never affect the curve, so the ends are repeated.
+    """
+    knots = np.asarray(knots, dtype=float)
+
+    return np.concatenate((knots[:1], knots, knots[-1:]))
+
+
+def sample_curve(cvs, knots, degree, parameters, mirror_axis=None):
+    """
+    Positions at each parameter, as pointOnCurveInfo gives them without percentage.
+    Parameters outside the knot domain are clamped to its ends. mirror_axis (0=X, 1=Y,
+    2=Z) negates that coordinate of every position.
+    """
+    cvs = np.asarray(cvs, dtype=float).reshape(-1, 3)
+    knots = full_knots(knots)
+
+    if len(knots) != len(cvs) + degree + 1:
+        raise ValueError(f"A degree {degree} curve with {len(cvs)} CVs needs {len(cvs) + degree - 1} knots, got {len(knots) - 2}")
+
+    positions = _de_boor(cvs, knots, degree, parameters)
+    if mirror_axis is not None:
+        positions[:, mirror_axis] *= -1.0
+
+    return positions
+
+
+def _de_boor(cvs, knots, degree, parameters):
+    """Points at each parameter from the full cvs + degree + 1 knot vector."""
+    parameters = np.atleast_1d(np.asarray(parameters, dtype=float))
+    parameters = np.clip(parameters, knots[degree], knots[len(cvs)])
+
+    # Span of each parameter, the last span also takes the domain's end
+    spans = np.clip(np.searchsorted(knots, parameters, side="right") - 1, degree, len(cvs) - 1)
+
+    points = cvs[spans[:, None] - degree + np.arange(degree + 1)]
+    for level in range(1, degree + 1):
+        for j in range(degree, level - 1, -1):
+            start = knots[spans - degree + j]
+            span_length = knots[spans + j + 1 - level] - start
+            alpha = np.divide(parameters - start, span_length, out=np.zeros_like(parameters), where=span_length > 0)
+            points[:, j] = (1.0 - alpha)[:, None] * points[:, j - 1] + alpha[:, None] * points[:, j]
+
+    return points[:, degree]
+
+
+def sample_tangents(cvs, knots, degree, parameters):
+    """
+    First derivatives at each parameter, pointing the way the parameter increases. The
+    derivative of a B-spline is a B-spline one degree lower on the difference CVs, over
+    the same knots without the first and last.
+    """
+    cvs = np.asarray(cvs, dtype=float).reshape(-1, 3)
+    knots = full_knots(knots)
+
+    spans = knots[1 + degree:len(cvs) + degree] - knots[1:len(cvs)]
+    differences = np.divide(degree * np.diff(cvs, axis=0), spans[:, None], out=np.zeros((len(cvs) - 1, 3)), where=spans[:, None] > 0)
+
+    return _de_boor(differences, knots[1:-1], degree - 1, parameters)
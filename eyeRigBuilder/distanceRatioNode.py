@@ -0,0 +1,113 @@
+"""
+distanceRatio, a Python API 2.0 node that measures many point pairs against their rest distances.
+
+It takes two arrays of world matrices (firstMatrix, secondMatrix) and an array of rest
+distances, and outputs one ratio per pair, current distance over rest distance, at the
+same logical index. A single node drives the scaleY of every pupil scale joint, where the
+rig used to evaluate one distanceBetween per joint and one multiplyDivide per three.
+The math is transformMath.distance_ratios.
+
+Load it with load_plugin() before building, the module is its own plug-in file.
+"""
+import os
+import maya.api.OpenMaya as om2
+from riggingTools import transformMath
+
+
+TYPE_NAME = "distanceRatio"
+# From the 0x00000 - 0x7ffff block Autodesk leaves for local nodes, next to curveSampler
+TYPE_ID = om2.MTypeId(0x0007F1E1)
+
+PLUGIN_PATH = os.path.splitext(os.path.abspath(__file__))[0] + ".py"
+
+
+def maya_useNewAPI():
+    """Tells Maya the plug-in uses API 2.0."""
+
+
+def _read_array(data, attribute, read):
+    """{logical index: value} of an input array attribute."""
+    values = {}
+    handle = data.inputArrayValue(attribute)
+    while not handle.isDone():
+        values[handle.elementLogicalIndex()] = read(handle.inputValue())
+        handle.next()
+
+    return values
+
+
+class DistanceRatioNode(om2.MPxNode):
+    first_matrix = None
+    second_matrix = None
+    rest_distance = None
+    ratio = None
+
+    @staticmethod
+    def creator():
+        return DistanceRatioNode()
+
+    @staticmethod
+    def initialize():
+        matrix_fn = om2.MFnMatrixAttribute()
+        DistanceRatioNode.first_matrix = matrix_fn.create("firstMatrix", "fm")
+        matrix_fn.array = True
+        DistanceRatioNode.second_matrix = matrix_fn.create("secondMatrix", "sm")
+        matrix_fn.array = True
+
+        numeric_fn = om2.MFnNumericAttribute()
+        DistanceRatioNode.rest_distance = numeric_fn.create("restDistance", "rd", om2.MFnNumericData.kDouble, 1.0)
+        numeric_fn.array = True
+
+        numeric_fn = om2.MFnNumericAttribute()
+        DistanceRatioNode.ratio = numeric_fn.create("ratio", "r", om2.MFnNumericData.kDouble, 1.0)
+        numeric_fn.array = True
+        numeric_fn.usesArrayDataBuilder = True
+        numeric_fn.writable = False
+        numeric_fn.storable = False
+
+        for attribute in (DistanceRatioNode.first_matrix, DistanceRatioNode.second_matrix, DistanceRatioNode.rest_distance, DistanceRatioNode.ratio):
+            DistanceRatioNode.addAttribute(attribute)
+
+        for attribute in (DistanceRatioNode.first_matrix, DistanceRatioNode.second_matrix, DistanceRatioNode.rest_distance):
+            DistanceRatioNode.attributeAffects(attribute, DistanceRatioNode.ratio)
+
+    def compute(self, plug, data):
+        # Any ratio element asks for the whole array, it is one pass
+        if plug.isElement:
+            plug = plug.array()
+        if plug.attribute() != DistanceRatioNode.ratio:
+            return None
+
+        first = _read_array(data, DistanceRatioNode.first_matrix, lambda handle: list(handle.asMatrix())[12:15])
+        second = _read_array(data, DistanceRatioNode.second_matrix, lambda handle: list(handle.asMatrix())[12:15])
+        rest = _read_array(data, DistanceRatioNode.rest_distance, lambda handle: handle.asDouble())
+
+        # Pairs need both points, a missing rest distance counts as 1
+        indices = sorted(set(first) & set(second))
+        ratios = transformMath.distance_ratios([first[index] for index in indices], [second[index] for index in indices],
+                                               [rest.get(index, 1.0) for index in indices])
+
+        ratio_handle = data.outputArrayValue(DistanceRatioNode.ratio)
+        builder = ratio_handle.builder()
+        for index, value in zip(indices, ratios.tolist()):
+            builder.addElement(index).setDouble(value)
+        ratio_handle.set(builder)
+        ratio_handle.setAllClean()
+
+        data.setClean(plug)
+
+
+def initializePlugin(plugin):
+    om2.MFnPlugin(plugin, "eyeRigBuilder", "1.0").registerNode(TYPE_NAME, TYPE_ID, DistanceRatioNode.creator, DistanceRatioNode.initialize)
+
+
+def uninitializePlugin(plugin):
+    om2.MFnPlugin(plugin).deregisterNode(TYPE_ID)
+
+
+def load_plugin():
+    """Loads this module as a plug-in unless the node type is already registered."""
+    from riggingTools.sceneCache import cmds
+
+    if not cmds.pluginInfo(PLUGIN_PATH, query=True, loaded=True):
+        cmds.loadPlugin(PLUGIN_PATH, quiet=True)
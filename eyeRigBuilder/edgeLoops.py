@@ -0,0 +1,206 @@
+"""
+Edge loop ordering and curve building without touching the selection.
+
+polyToCurve only works on the selected edges, one curve per call. Here the edge to
+vertex pairs of every loop are read in one polyInfo query per mesh, each loop is
+ordered into a single open or closed vertex chain, and the curves are built straight
+from the vertex positions with cmds.curve. Every loop is checked before the first
+curve is made, so a branching or broken edge selection stops the build up front.
+
+The ordering works on plain (n, 2) vertex pair arrays and needs no Maya.
+"""
+import numpy as np
+
+
+class BrokenLoopError(ValueError):
+    pass
+
+
+def loop_problems(edge_vertices):
+    """Returns why the edges can't be ordered into a single chain, or an empty list if they can."""
+    edge_vertices = np.asarray(edge_vertices, dtype=int).reshape(-1, 2)
+    if not len(edge_vertices):
+        return ["no edges"]
+
+    problems = []
+    vertices, degrees = np.unique(edge_vertices, return_counts=True)
+
+    branches = vertices[degrees > 2]
+    if len(branches):
+        listed = ", ".join(str(vertex) for vertex in branches[:8]) + (f" and {len(branches) - 8} more" if len(branches) > 8 else "")
+        problems.append(f"vertices {listed} join more than two edges")
+
+    ends = vertices[degrees == 1]
+    if len(ends) not in (0, 2):
+        problems.append(f"{len(ends)} open ends, a loop has two or none")
+
+    pieces = len(_components(edge_vertices))
+    if pieces > 1:
+        problems.append(f"{pieces} separate pieces")
+
+    return problems
+
+
+def _components(edge_vertices):
+    """Groups the vertices into connected pieces, union-find over the edges."""
+    parents = {}
+
+    def find(vertex):
+        parents.setdefault(vertex, vertex)
+        while parents[vertex] != vertex:
+            parents[vertex] = parents[parents[vertex]]
+            vertex = parents[vertex]
+        return vertex
+
+    for start, end in edge_vertices.tolist():
+        parents[find(start)] = find(end)
+
+    pieces = {}
+    for vertex in list(parents):
+        pieces.setdefault(find(vertex), []).append(vertex)
+
+    return list(pieces.values())
+
+
+def order_edge_loop(edge_vertices):
+    """
+    Orders an edge set into a chain. Returns (vertex indices in order, closed).
+    Open chains start at the end with the lower vertex index, closed ones at the lowest
+    vertex heading to its lower numbered neighbour, so the same edges always give the
+    same curve.
+    """
+    edge_vertices = np.asarray(edge_vertices, dtype=int).reshape(-1, 2)
+
+    problems = loop_problems(edge_vertices)
+    if problems:
+        raise BrokenLoopError(", ".join(problems))
+
+    neighbours = {}
+    for start, end in edge_vertices.tolist():
+        neighbours.setdefault(start, []).append(end)
+        neighbours.setdefault(end, []).append(start)
+
+    ends = sorted(vertex for vertex, linked in neighbours.items() if len(linked) == 1)
+    closed = not ends
+
+    previous = None
+    current = min(neighbours) if closed else ends[0]
+    chain = [current]
+    for _ in range(len(edge_vertices) - (1 if closed else 0)):
+        options = [vertex for vertex in neighbours[current] if vertex != previous]
+        following = min(options) if previous is None else options[0]
+        previous, current = current, following
+        chain.append(current)
+
+    return np.array(chain, dtype=int), closed
+
+
+def order_edge_loops(edge_vertex_sets):
+    """
+    Orders several edge sets at once, returns a list of (vertex indices, closed).
+    Raises BrokenLoopError naming every loop that can't be ordered.
+    """
+    problems = check_edge_loops(edge_vertex_sets)
+    if problems:
+        raise BrokenLoopError("; ".join(f"loop {index}: {', '.join(issues)}" for index, issues in problems.items()))
+
+    return [order_edge_loop(edge_vertices) for edge_vertices in edge_vertex_sets]
+
+
+def check_edge_loops(edge_vertex_sets):
+    """Returns {loop index: problems} for every edge set that isn't a single chain."""
+    problems = {}
+    for index, edge_vertices in enumerate(edge_vertex_sets):
+        issues = loop_problems(edge_vertices)
+        if issues:
+            problems[index] = issues
+
+    return problems
+
+
+def read_edge_loops(edge_lists):
+    """
+    Reads every loop's edge to vertex pairs, one polyInfo query per mesh for all the loops
+    on it. Returns (mesh, (n, 2) vertex pairs) for each edge list.
+    """
+    from riggingTools import skinIO
+
+    loop_edges = [skinIO.edge_indices(edges) for edges in edge_lists]
+
+    mesh_edges = {}
+    for mesh, indices in loop_edges:
+        mesh_edges.setdefault(mesh, []).append(indices)
+
+    mesh_pairs = {}
+    for mesh, index_lists in mesh_edges.items():
+        indices = np.unique(np.concatenate(index_lists))
+        mesh_pairs[mesh] = (indices, skinIO.get_edge_vertices(mesh, indices))
+
+    loops = []
+    for mesh, indices in loop_edges:
+        all_indices, pairs = mesh_pairs[mesh]
+        loops.append((mesh, pairs[np.searchsorted(all_indices, indices)]))
+
+    return loops
+
+
+def get_loop_points(edge_lists):
+    """
+    Orders every edge list and reads its vertex positions, one xform query per mesh.
+    Returns (points in order, closed) for each edge list. Broken loops raise
+    BrokenLoopError before anything else is read.
+    """
+    from riggingTools import skinIO
+
+    loops = read_edge_loops(edge_lists)
+    ordered = order_edge_loops([pairs for _, pairs in loops])
+
+    mesh_vertices = {}
+    for (mesh, _), (chain, _) in zip(loops, ordered):
+        mesh_vertices.setdefault(mesh, []).append(chain)
+
+    mesh_points = {}
+    for mesh, chains in mesh_vertices.items():
+        indices = np.unique(np.concatenate(chains))
+        mesh_points[mesh] = (indices, skinIO.get_points(mesh, indices))
+
+    results = []
+    for (mesh, _), (chain, closed) in zip(loops, ordered):
+        indices, points = mesh_points[mesh]
+        results.append((points[np.searchsorted(indices, chain)], closed))
+
+    return results
+
+
+def create_curve(name, points, closed=False):
+    """A linear curve through the points with one CV per point and parameter i at CV i."""
+    from riggingTools.sceneCache import cmds
+
+    points = np.asarray(points, dtype=float).tolist()
+    if closed:
+        # A periodic linear curve repeats its first point at the end
+        points = points + points[:1]
+
+    return cmds.curve(name=name, degree=1, periodic=closed, point=points, knot=list(range(len(points))))
+
+
+def create_curves_from_edges(edge_lists, names, closed=None):
+    """
+    Builds one linear curve per edge list without selecting anything, returns the curve names.
+    By default each loop decides whether its curve is closed. closed=True requires closed
+    loops, closed=False makes open curves that end where they start.
+    """
+    loops = get_loop_points(edge_lists)
+
+    if closed:
+        open_names = [name for name, (_, is_closed) in zip(names, loops) if not is_closed]
+        if open_names:
+            raise BrokenLoopError(f"{', '.join(open_names)}: the edges don't close into a loop")
+
+    curves = []
+    for name, (points, is_closed) in zip(names, loops):
+        if closed is False and is_closed:
+            points, is_closed = np.concatenate((points, points[:1])), False
+        curves.append(create_curve(name, points, is_closed))
+
+    return curves
@@ -0,0 +1,431 @@
+"""
+Compiles small math expressions into utility node networks.
+
+Instead of wiring plusMinusAverage, multiplyDivide and condition chains by hand, write
+what the network should compute:
+
+    avg = (iris.sx + iris.sy) / 2
+    pupil.tz = -0.1 * (avg if avg > 1 else 0)
+    pupil.sx = 1 + 0.05 * (iris.sx - 1)
+
+Names are bound to scene nodes (or used as node names as they are), attributes keep
+Maya's names. Plain names on the left are local values and create no nodes.
+
+The expressions are folded before any node is planned: constants are evaluated, sums
+and scales are collected into one affine form per value (so 1 + 0.05 * (x - 1) is a
+single scale and offset), and conditions that always give the same value are dropped.
+Equal subexpressions are only computed once, across every expression in the network.
+Operations of the same kind at the same depth share a node, one per X/Y/Z or R/G/B
+channel, so the scaleX and scaleY chains end up in the same nodes.
+
+Compiling is plain Python, describe() shows the planned network and build() creates it
+in one GraphBuilder transaction.
+"""
+import ast
+import operator
+
+
+# Maya's condition node operations
+CONDITION_OPERATIONS = {ast.Eq: 0, ast.NotEq: 1, ast.Gt: 2, ast.GtE: 3, ast.Lt: 4, ast.LtE: 5}
+CONDITION_TESTS = (operator.eq, operator.ne, operator.gt, operator.ge, operator.lt, operator.le)
+CONDITION_SYMBOLS = ("==", "!=", ">", ">=", "<", "<=")
+
+MULTIPLY, DIVIDE, POWER = 1, 2, 3
+SUM, SUBTRACT, AVERAGE = 1, 2, 3
+
+MULTIPLY_SYMBOLS = {MULTIPLY: "*", DIVIDE: "/", POWER: "**"}
+AVERAGE_NAMES = {SUM: "sum", SUBTRACT: "subtract", AVERAGE: "average"}
+
+# Channel attribute names per node type: (inputs, output) for each channel
+CHANNELS = {
+    "multiplyDivide": [(("input1X", "input2X"), "outputX"), (("input1Y", "input2Y"), "outputY"), (("input1Z", "input2Z"), "outputZ")],
+    "condition": [(("colorIfTrueR", "colorIfFalseR"), "outColorR"), (("colorIfTrueG", "colorIfFalseG"), "outColorG"),
+                  (("colorIfTrueB", "colorIfFalseB"), "outColorB")],
+}
+
+NODE_SUFFIXES = {"multiplyDivide": "mdn", "plusMinusAverage": "pma", "condition": "cond"}
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+def _const(value):
+    return ("const", float(value))
+
+
+def _is_const(value):
+    return value[0] == "const"
+
+
+def _sort_key(value):
+    return repr(value)
+
+
+class Network:
+    """
+    A set of expressions compiled into one node network.
+    bindings maps the names used in the expressions to scene nodes, name prefixes the
+    created nodes. node_names renames planned nodes by their suffix ("pma01" for the first
+    node), so a compiled network can keep the names of the nodes it replaces.
+    """
+
+    def __init__(self, source=None, bindings=None, name="expr", node_names=None):
+        self.bindings = dict(bindings or {})
+        self.name = name
+        self.node_names = dict(node_names or {})
+        self.values = {}
+        self.outputs = []
+        self.operations = {}
+        self.depths = {}
+
+        if source:
+            self.add(source)
+
+    # Parsing and folding
+
+    def add(self, source):
+        """Adds one or more "node.attr = expression" lines."""
+        try:
+            tree = ast.parse(_dedent(source))
+        except SyntaxError as error:
+            raise ExpressionError(f"Can't parse expression: {error}") from error
+
+        for statement in tree.body:
+            if not isinstance(statement, ast.Assign):
+                raise ExpressionError(f"Line {statement.lineno}: only assignments are supported")
+
+            value = self.fold(statement.value)
+            for target in statement.targets:
+                if isinstance(target, ast.Name):
+                    self.values[target.id] = value
+                else:
+                    self.outputs.append((self.plug_name(target), value))
+
+    def plug_name(self, node):
+        if not isinstance(node, ast.Attribute) or not isinstance(node.value, ast.Name):
+            raise ExpressionError(f"Line {node.lineno}: expected node.attribute, got {ast.dump(node)}")
+
+        return f"{self.bindings.get(node.value.id, node.value.id)}.{node.attr}"
+
+    def fold(self, node):
+        """Turns an expression into a folded value tuple."""
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            return _const(node.value)
+
+        if isinstance(node, ast.Name):
+            if node.id not in self.values:
+                raise ExpressionError(f"Line {node.lineno}: {node.id} is used before it is assigned")
+            return self.values[node.id]
+
+        if isinstance(node, ast.Attribute):
+            return ("plug", self.plug_name(node))
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            value = self.fold(node.operand)
+            return scale(value, -1.0) if isinstance(node.op, ast.USub) else value
+
+        if isinstance(node, ast.BinOp):
+            left, right = self.fold(node.left), self.fold(node.right)
+            if isinstance(node.op, ast.Add):
+                return add(left, right)
+            if isinstance(node.op, ast.Sub):
+                return add(left, scale(right, -1.0))
+            if isinstance(node.op, ast.Mult):
+                return multiply(left, right)
+            if isinstance(node.op, ast.Div):
+                return divide(left, right)
+            if isinstance(node.op, ast.Pow):
+                return power(left, right)
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in ("max", "min") and node.args:
+            values = [self.fold(arg) for arg in node.args]
+            test = ast.Gt if node.func.id == "max" else ast.Lt
+            result = values[0]
+            for value in values[1:]:
+                result = condition(CONDITION_OPERATIONS[test], result, value, result, value)
+            return result
+
+        if isinstance(node, ast.IfExp):
+            test = node.test
+            if not isinstance(test, ast.Compare) or len(test.ops) != 1 or type(test.ops[0]) not in CONDITION_OPERATIONS:
+                raise ExpressionError(f"Line {node.lineno}: conditions must be a single comparison")
+            return condition(CONDITION_OPERATIONS[type(test.ops[0])], self.fold(test.left), self.fold(test.comparators[0]),
+                             self.fold(node.body), self.fold(node.orelse))
+
+        raise ExpressionError(f"Line {node.lineno}: unsupported expression {ast.unparse(node)}")
+
+    # Planning
+
+    def lower(self, value, memo):
+        """Turns a folded value into a constant, a scene plug or an operation, one operation per distinct value."""
+        if value in memo:
+            return memo[value]
+
+        kind = value[0]
+        if kind in ("const", "plug"):
+            result = value
+        elif kind == "affine":
+            result = self.lower_affine(value[1], value[2], memo)
+        elif kind == "multiply":
+            result = self.operation("multiplyDivide", value[1], (self.lower(value[2], memo), self.lower(value[3], memo)))
+        else:
+            _, test, first, second, if_true, if_false = value
+            result = self.operation("condition", test, (self.lower(if_true, memo), self.lower(if_false, memo)),
+                                    (self.lower(first, memo), self.lower(second, memo)))
+
+        memo[value] = result
+        return result
+
+    def lower_affine(self, terms, offset, memo):
+        """
+        The fewest operations for sum(coefficient * term) + offset: one average or sum when the
+        coefficients allow it, a subtract for a - b - ..., otherwise scale the terms then sum.
+        """
+        inputs = [self.lower(term, memo) for term, _ in terms]
+        coefficients = [coefficient for _, coefficient in terms]
+
+        offsets = (_const(offset),) if offset != 0.0 else ()
+
+        if len(set(coefficients)) == 1:
+            coefficient = coefficients[0]
+
+            if len(inputs) > 1 and offset == 0.0 and abs(coefficient * len(inputs) - 1.0) < 1e-12:
+                return self.operation("plusMinusAverage", AVERAGE, tuple(inputs))
+
+            if coefficient == 1.0:
+                return self.operation("plusMinusAverage", SUM, tuple(inputs) + offsets)
+
+            if len(inputs) == 1:
+                total = inputs[0]
+            elif offset != 0.0:
+                # c * (a + b + offset / c) takes one node less than c * (a + b) + offset
+                total = self.operation("plusMinusAverage", SUM, tuple(inputs) + (_const(offset / coefficient),))
+                offset = 0.0
+            else:
+                total = self.operation("plusMinusAverage", SUM, tuple(inputs))
+
+            scaled = self.operation("multiplyDivide", MULTIPLY, (total, _const(coefficient)))
+            return scaled if offset == 0.0 else self.operation("plusMinusAverage", SUM, (scaled, _const(offset)))
+
+        if sorted(coefficients) == [-1.0] * (len(inputs) - 1) + [1.0]:
+            first = coefficients.index(1.0)
+            rest = tuple(inputs[:first] + inputs[first + 1:])
+            return self.operation("plusMinusAverage", SUBTRACT, (inputs[first],) + rest + tuple(scale(value, -1.0) for value in offsets))
+
+        scaled = [source if coefficient == 1.0 else self.operation("multiplyDivide", MULTIPLY, (source, _const(coefficient)))
+                  for source, coefficient in zip(inputs, coefficients)]
+        return self.operation("plusMinusAverage", SUM, tuple(scaled) + offsets)
+
+    def operation(self, node_type, node_operation, inputs, terms=()):
+        """Interns one channel's worth of work, equal operations are shared."""
+        key = (node_type, node_operation, inputs, terms)
+        if key not in self.operations:
+            op = ("op", len(self.operations))
+            self.depths[op] = 1 + max([self.depths[source] for source in inputs + terms if source[0] == "op"], default=0)
+            self.operations[key] = op
+
+        return self.operations[key]
+
+    def plan(self):
+        """
+        Plans the network. Returns (nodes, outputs): every node is a dict with its type, name,
+        attribute values and incoming connections, every output maps a target plug to a source.
+        """
+        self.operations = {}
+        self.depths = {}
+        memo = {}
+        sources = [(plug, self.lower(value, memo)) for plug, value in self.outputs]
+
+        # Operations that can share a node: same node type, operation and depth, and for
+        # conditions the same test as it is shared by every channel
+        groups = {}
+        for (node_type, node_operation, inputs, terms), op in self.operations.items():
+            pack_key = (self.depths[op], node_type, node_operation, terms, len(inputs) if node_operation == AVERAGE else None)
+            groups.setdefault(pack_key, []).append((op, inputs))
+
+        nodes = []
+        channels = {}
+        for (depth, node_type, node_operation, terms, _), members in sorted(groups.items(), key=lambda item: (item[0][0], item[1][0][0][1])):
+            for start in range(0, len(members), 3):
+                chunk = members[start:start + 3]
+                suffix = f"{NODE_SUFFIXES[node_type]}{len(nodes) + 1:02}"
+                node = {"type": node_type, "name": self.node_names.get(suffix, f"{self.name}_{suffix}"),
+                        "operation": node_operation, "values": {"operation": node_operation}, "connections": []}
+
+                if node_type == "condition":
+                    for attribute, source in zip(("firstTerm", "secondTerm"), terms):
+                        self.feed(node, attribute, source, channels)
+
+                for channel, (op, inputs) in enumerate(chunk):
+                    if node_type == "plusMinusAverage":
+                        if len(chunk) == 1:
+                            input_attributes = [f"input1D[{index}]" for index in range(len(inputs))]
+                            output = "output1D"
+                        else:
+                            input_attributes = [f"input3D[{index}].input3D{'xyz'[channel]}" for index in range(len(inputs))]
+                            output = f"output3D{'xyz'[channel]}"
+                    else:
+                        input_attributes, output = CHANNELS[node_type][channel]
+
+                    for attribute, source in zip(input_attributes, inputs):
+                        self.feed(node, attribute, source, channels)
+                    channels[op] = ("plug", f"{node['name']}.{output}")
+
+                nodes.append(node)
+
+        outputs = [(plug, channels.get(source, source)) for plug, source in sources]
+
+        return nodes, outputs
+
+    @staticmethod
+    def feed(node, attribute, source, channels):
+        if _is_const(source):
+            node["values"][attribute] = source[1]
+        elif source[0] == "plug":
+            node["connections"].append((source[1], attribute))
+        else:
+            node["connections"].append((channels[source][1], attribute))
+
+    def describe(self):
+        """A readable listing of the planned nodes and outputs."""
+        nodes, outputs = self.plan()
+        lines = [f"{self.name}: {len(nodes)} nodes"]
+
+        for node in nodes:
+            if node["type"] == "multiplyDivide":
+                operation = MULTIPLY_SYMBOLS[node["operation"]]
+            elif node["type"] == "plusMinusAverage":
+                operation = AVERAGE_NAMES[node["operation"]]
+            else:
+                operation = CONDITION_SYMBOLS[node["operation"]]
+            lines.append(f"    {node['name']} ({node['type']} {operation})")
+
+            inputs = [(attribute, source) for source, attribute in node["connections"]]
+            inputs += [(attribute, value) for attribute, value in node["values"].items() if attribute != "operation"]
+            for attribute, source in sorted(inputs):
+                lines.append(f"        {attribute} <- {source}")
+
+        for plug, source in outputs:
+            lines.append(f"    {plug} <- {source[1]}")
+
+        return "\n".join(lines)
+
+    def build(self, builder=None):
+        """
+        Creates the network and connects the outputs, in one transaction unless a GraphBuilder
+        is passed in to queue onto. Returns the created node names.
+        """
+        from riggingTools.graphBuilder import GraphBuilder
+
+        nodes, outputs = self.plan()
+        graph = builder or GraphBuilder()
+
+        created = {}
+        for node in nodes:
+            created[node["name"]] = graph.create_node(node["type"], node["name"])
+            for attribute, value in node["values"].items():
+                graph.set_attr(created[node["name"]], attribute, value)
+
+        for node in nodes:
+            for source, attribute in node["connections"]:
+                source_node, source_attribute = source.split(".", 1)
+                graph.connect(created.get(source_node, source_node), source_attribute, created[node["name"]], attribute)
+
+        for plug, source in outputs:
+            target_node, target_attribute = plug.split(".", 1)
+            if _is_const(source):
+                graph.set_attr(target_node, target_attribute, source[1])
+            else:
+                source_node, source_attribute = source[1].split(".", 1)
+                graph.connect(created.get(source_node, source_node), source_attribute, target_node, target_attribute)
+
+        if builder is None:
+            graph.commit()
+
+        return [str(node) for node in created.values()]
+
+
+def _dedent(source):
+    lines = [line.strip() for line in source.strip().splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+def affine_form(value):
+    """Returns a value as ({term: coefficient}, offset)."""
+    if _is_const(value):
+        return {}, value[1]
+    if value[0] == "affine":
+        return dict(value[1]), value[2]
+    return {value: 1.0}, 0.0
+
+
+def make_affine(terms, offset):
+    terms = {term: coefficient for term, coefficient in terms.items() if coefficient != 0.0}
+    if not terms:
+        return _const(offset)
+    if len(terms) == 1 and offset == 0.0 and list(terms.values()) == [1.0]:
+        return next(iter(terms))
+
+    return ("affine", tuple(sorted(terms.items(), key=lambda item: _sort_key(item[0]))), float(offset))
+
+
+def add(left, right):
+    terms, offset = affine_form(left)
+    right_terms, right_offset = affine_form(right)
+    for term, coefficient in right_terms.items():
+        terms[term] = terms.get(term, 0.0) + coefficient
+
+    return make_affine(terms, offset + right_offset)
+
+
+def scale(value, factor):
+    terms, offset = affine_form(value)
+
+    return make_affine({term: coefficient * factor for term, coefficient in terms.items()}, offset * factor)
+
+
+def multiply(left, right):
+    if _is_const(left):
+        return scale(right, left[1])
+    if _is_const(right):
+        return scale(left, right[1])
+
+    return ("multiply", MULTIPLY) + tuple(sorted((left, right), key=_sort_key))
+
+
+def divide(left, right):
+    if _is_const(right):
+        if right[1] == 0.0:
+            raise ExpressionError("Division by zero")
+        return scale(left, 1.0 / right[1])
+
+    return ("multiply", DIVIDE, left, right)
+
+
+def power(left, right):
+    if _is_const(left) and _is_const(right):
+        return _const(left[1] ** right[1])
+    if _is_const(right) and right[1] == 1.0:
+        return left
+
+    return ("multiply", POWER, left, right)
+
+
+def condition(test, first, second, if_true, if_false):
+    if _is_const(first) and _is_const(second):
+        return if_true if CONDITION_TESTS[test](first[1], second[1]) else if_false
+    if if_true == if_false:
+        return if_true
+    # "c if x == c else x" and "x if x != c else c" are always x
+    if test == 0 and if_true == second and if_false == first:
+        return first
+    if test == 1 and if_true == first and if_false == second:
+        return first
+
+    return ("condition", test, first, second, if_true, if_false)
+
+
+def build_network(source, bindings=None, name="expr", builder=None, node_names=None):
+    """Compiles and builds the expressions in source, returns the created node names."""
+    return Network(source, bindings, name, node_names).build(builder)
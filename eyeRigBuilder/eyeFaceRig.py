@@ -1,17 +1,32 @@
-import maya.cmds as cmds
-import pymel.core as pm
 import math
-import re
+import numpy as np
 from facialAutoRigger.dictionaries import colors
 from facialAutoRigger import utils
 from facialAutoRigger.parts import joints
 from facialAutoRigger.parts import guides
 from facialAutoRigger.parts import controls
 from facialAutoRigger.features import eyeAttributes
+from riggingTools import blinkModel
+from riggingTools import curveSamplerNode
+from riggingTools import edgeLoops
+from riggingTools import graphReport
+from riggingTools import lidGuides
+from riggingTools import mirrorSpec
+from riggingTools.sceneCache import cmds
+
+
+# How eyelid controls drive their curve joints. "channels" connects translate, rotate and
+# scale one axis at a time, "matrix" connects each control's local matrix to its joint's
+# offsetParentMatrix, one connection per pair
+DRIVE_MODES = ("channels", "matrix")
 
 
 class Eye():
-    def __init__(self, l_upper_edges, l_lower_edges, r_upper_edges, r_lower_edges, joint_parent=None, rig_parent=None):
+    def __init__(self, l_upper_edges, l_lower_edges, r_upper_edges, r_lower_edges, joint_parent=None, rig_parent=None, drive_mode="channels"):
+        if drive_mode not in DRIVE_MODES:
+            raise ValueError(f"Unknown drive mode: {drive_mode}. Choose from {', '.join(DRIVE_MODES)}")
+
+        self.drive_mode = drive_mode
         self.l_upper_edges = l_upper_edges
         self.l_lower_edges = l_lower_edges
         self.r_upper_edges = r_upper_edges
@@ -24,7 +39,10 @@ class Eye():
         self.r_pupil_vert = "r_eye_geo.vtx[73]"
         self.l_eye_rig = cmds.group(empty=True, name=f"L_eyeRig_grp")
         l_settings_shape = self.create_settings_shape("L", self.l_eye_rig)
-        self.create_rig(l_settings_shape)
+
+        # Repeated queries during the build are served from the scene query cache
+        with cmds.build():
+            self.create_rig(l_settings_shape)
 
 
     def create_rig(self, l_settings_shape):
@@ -38,7 +56,8 @@ class Eye():
         l_eye_offset, l_eye_ctrl, l_eyelid_offset, l_eyelid_ctrl, l_controls, l_offsets = self.create_left_side_controls("L", self.l_eye_rig, self.l_high_curves, l_settings_shape)
         
         # Duplicate and scale left controls to create right controls.
-        self.r_eye_rig, r_settings_shape, r_eye_ctrl, r_eye_offset, r_eyelid_offset, r_eyelid_ctrl, r_offsets, r_controls = self.create_right_side_controls(self.l_eye_rig)
+        self.r_eye_rig, r_settings_shape, r_eye_ctrl, r_eye_offset, r_eyelid_offset, r_eyelid_ctrl, r_offsets, r_controls = self.create_right_side_controls(
+            self.l_eye_rig, l_settings_shape, l_eye_ctrl, l_eye_offset, l_eyelid_offset, l_eyelid_ctrl, l_offsets, l_controls)
         
         # Create left and right joints to skin to curve
         l_eye_joints, l_upper_joints, l_lower_joints, r_eye_joints, r_upper_joints, r_lower_joints = self.create_joints(l_controls, r_controls, l_eyelid_ctrl, r_eyelid_ctrl)
@@ -68,7 +87,7 @@ class Eye():
         if self.rig_parent:
             cmds.parent(eye_rig_grp, self.rig_parent)
 
-        self.create_fleshy_eyes(l_settings_shape, r_settings_shape,l_offsets, r_offsets, l_blend_curve)
+        self.create_fleshy_eyes(l_settings_shape, r_settings_shape,l_offsets, r_offsets, l_blend_curve, l_driver_curves, l_upper_blink_bs, l_lower_blink_bs, l_drivers_bs)
 
 
     def create_settings_shape(self, side, rig_group):
@@ -91,11 +110,19 @@ class Eye():
         self.r_upper_edges = r_upper_edges
         self.r_lower_edges = r_lower_edges
 
-        self.l_eye_rig = cmds.group(empty=True, name=f"L_eyeRig_grp")
+        with graphReport.track_nodes() as self.built:
+            self.l_eye_rig = cmds.group(empty=True, name=f"L_eyeRig_grp")
+
+            # Build left and right curves using CurveManager
+            with cmds.build():
+                self.l_curves = CurveManager("L", self.l_upper_edges, self.l_lower_edges).build()
+                self.r_curves = CurveManager("R", self.r_upper_edges, self.r_lower_edges).build()
+
+    def graph_report(self):
+        """Static analysis of the nodes the rig is made of, see graphReport.analyze."""
+        nodes = [node for node in self.built["nodes"] if cmds.objExists(node)]
 
-        # Build left and right curves using CurveManager
-        self.l_curves = CurveManager("L", self.l_upper_edges, self.l_lower_edges).build()
-        self.r_curves = CurveManager("R", self.r_upper_edges, self.r_lower_edges).build()
+        return graphReport.analyze(graphReport.read_graph(nodes, self.built["steps"]))
 
 
 #-------------------------------------------------------------------------------------------------------------------------------------    
@@ -117,14 +144,9 @@ class CurveManager:
         return cmds.group(empty=True, name=f"{self.side}_eyeCurve_grp")
 
     def create_high_curves(self):
-        cmds.select(clear=True)
-        for name, edges in zip(["Upper", "Lower"], [self.upper_edges, self.lower_edges]):
-            cmds.select(edges)
-            curve_name = f"{self.side}_eyelid{name}High_crv"
-            curve_from_edge = cmds.polyToCurve(form=2, degree=1, conformToSmoothMeshPreview=1, ch=0)[0]
-            curve_from_edge = cmds.rename(curve_from_edge, curve_name)
-            self.high_res_curves.append(curve_from_edge)
-        cmds.select(clear=True)
+        # Both lids in one call from the ordered edge loops, without selecting the edges
+        curve_names = [f"{self.side}_eyelid{name}High_crv" for name in ["Upper", "Lower"]]
+        self.high_res_curves.extend(edgeLoops.create_curves_from_edges([self.upper_edges, self.lower_edges], curve_names))
 
     def check_and_adjust_curve_direction(self):
         direction_matched = utils.compare_curve_directions(self.high_curves[0], self.high_curves[-1])
@@ -200,7 +222,7 @@ class EyeControlManager:
         self.side = side
         self.rig_group = rig_group
         self.high_curves = high_curves
-        self.settings_shape = settings_shape
+        self.settings_shape = l_settings_shape
         self.scale_factor = self.calculate_scale_factor(high_curves)
         self.controls_inst = ControlsBase()
         self.l_eyelid_ctrls = []
@@ -215,8 +237,8 @@ class EyeControlManager:
         scale = self.scale_factor / 4
 
         # Create master controls
-        eye_offset, eye_ctrl  = self.controls_instance.create_control("circle", 13, "L_eyeMaster", scale, position_obj=center_group, orient_flag=True, settings_shape=self.settings_shape)
-        eyelid_offset, eyelid_ctrl = self.controls_instance.create_control("circle", 13, "L_eyeMaster", scale*0.5, position_obj=center_group, orient_flag=True, settings_shape=self.settings_shape)
+        eye_offset, eye_ctrl  = self.controls_inst.create_control("circle", 13, "L_eyeMaster", scale, position_obj=center_group, orient_flag=True, settings_shape=self.settings_shape)
+        eyelid_offset, eyelid_ctrl = self.controls_inst.create_control("circle", 13, "L_eyeMaster", scale*0.5, position_obj=center_group, orient_flag=True, settings_shape=self.settings_shape)
 
         # Move cvs
         for ctrl in [eye_ctrl, eyelid_ctrl]:
@@ -226,10 +248,12 @@ class EyeControlManager:
 
         # Create hierarchy
         cmds.parent(eyelid_offset, eye_ctrl)
-        cmds.parent(eye_offset, rig_group)
+        cmds.parent(eye_offset, self.rig_group)
         cmds.delete(center_group)
 
-    def find_aim_of_the_pupil(self, left_eyeball_geo)
+        return eye_offset, eye_ctrl, eyelid_offset, eyelid_ctrl
+
+    def find_aim_of_the_pupil(self, left_eyeball_geo):
         # Find aim of pupil
         center_group = cmds.group(empty=True, name="L_eyeCenter_grp")
         aimer_loc = cmds.spaceLocator(name="L_eyePupil_loc")[0]
@@ -246,37 +270,43 @@ class EyeControlManager:
         self.l_upperlid_offset = []
 
         scale = self.scale_factor / 6
-        inner_loc, outer_loc = place_inner_and_outer_locs(self.l_pupil_vert, self.l_curves.high_curves[-1])
+        # Guide transforms are solved from the lid curves, the controls are the only nodes made
+        inner_matrix, outer_matrix = place_corner_guides(self.l_pupil_vert, self.l_curves.high_curves[-1])
+
+        inner_offet, inner_control = self.controls_inst.create_control("circle", 14, "L_eyeInner", scale, orient_flag=True, settings_shape=self.settings_shape)
+        outer_offet, outer_control = self.controls_inst.create_control("circle", 14, "L_eyeOuter", scale, orient_flag=True, settings_shape=self.settings_shape)
+        set_guide_matrix(inner_offet, inner_matrix)
+        set_guide_matrix(outer_offet, outer_matrix)
 
-        inner_offet, inner_control = self.controls_inst.create_control("circle", 14, "L_eyeInner", scale, position_obj=inner_loc, orient_flag=True, settings_shape=self.settings_shape)
-        outer_offet, outer_control = self.controls_inst.create_control("circle", 14, "L_eyeOuter", scale, position_obj=outer_loc, orient_flag=True, settings_shape=self.settings_shape)
+        upper_lid_matrices, lower_lid_matrices = place_lid_guides(self.l_curves.high_curves)
 
-        upper_lid_locs, lower_lid_locs = place_lid_locs(self.l_curves.high_curves)
+        # Controls and offsets in the Inner, Upper[Tweak00, Mid, Tweak01], Outer, Lower[Tweak00, Mid, Tweak01] order the joints follow
+        l_controls = [inner_control]
+        l_offsets = [inner_offet]
 
-        for loc in upper_lid_locs:
-            offset, control = self.controls_inst.create_control("circle", 14, "L_eyeInner", scale, position_obj=loc, orient_flag=True, settings_shape=self.settings_shape)
+        for matrix in upper_lid_matrices:
+            offset, control = self.controls_inst.create_control("circle", 14, "L_eyeInner", scale, orient_flag=True, settings_shape=self.settings_shape)
+            set_guide_matrix(offset, matrix)
+            l_controls.append(control)
+            l_offsets.append(offset)
 
-        for loc in lower_lid_locs:
-            offset, control = self.controls_inst.create_control("circle", 14, "L_eyeInner", scale, position_obj=loc, orient_flag=True, settings_shape=self.settings_shape)
-            self.left_offsets.append(offsets)
-            self.left_offsets.append(offsets)
+        l_controls.append(outer_control)
+        l_offsets.append(outer_offet)
+
+        for matrix in lower_lid_matrices:
+            offset, control = self.controls_inst.create_control("circle", 14, "L_eyeInner", scale, orient_flag=True, settings_shape=self.settings_shape)
+            set_guide_matrix(offset, matrix)
+            l_controls.append(control)
+            l_offsets.append(offset)
 
         master_scale = self.scale_factor / 4
 
         inner_master_offset, inner_master_control = self.controls_inst.create_control("square", 20, "L_eyelidInner", master_scale, position_obj=inner_offet, orient_flag=True, settings_shape=self.settings_shape)
         outer_master_offset, outer_master_control = self.controls_inst.create_control("square", 20, "L_eyelidOuter", master_scale, position_obj=outer_offet, orient_flag=True, settings_shape=self.settings_shape)
-        upper_master_offset, inner_master_control = self.controls_inst.create_control("square", 20, "L_eyelidUpper", master_scale, position_obj=upper_lid_locs[1], orient_flag=True, settings_shape=self.settings_shape)
-        lower_master_offset, inner_master_control = self.controls_inst.create_control("square", 20, "L_eyelidLower", master_scale, position_obj=lower_lid_locs[1], orient_flag=True, settings_shape=self.settings_shape)
-
-        # Clean up scene
-        for loc in upper_lid_locs:
-            cmds.delete(loc)
-
-        for loc in lower_lid_locs:
-            cmds.delete(loc)
-
-        cmds.delete(inner_loc)
-        cmds.delete(outer_loc)
+        upper_master_offset, inner_master_control = self.controls_inst.create_control("square", 20, "L_eyelidUpper", master_scale, orient_flag=True, settings_shape=self.settings_shape)
+        lower_master_offset, inner_master_control = self.controls_inst.create_control("square", 20, "L_eyelidLower", master_scale, orient_flag=True, settings_shape=self.settings_shape)
+        set_guide_matrix(upper_master_offset, upper_lid_matrices[1])
+        set_guide_matrix(lower_master_offset, lower_lid_matrices[1])
 
         # Move control shapes out from their pivots, to position in front of the eye topology
         for ctrl in l_controls:
@@ -284,49 +314,19 @@ class EyeControlManager:
             for cv in cvs:
                 cmds.move(0, 0, 0.3, cv, relative=True, objectSpace=True, worldSpaceDistance=True)
 
-        return eye_offset, eye_ctrl, eyelid_offset, eyelid_ctrl, l_controls, l_offsets
-
+        return l_controls, l_offsets
 
-    def create_right_side_controls(self, l_rig_group):
-        r_eye_rig_group = cmds.duplicate(l_rig_group, name="R_eyeRig_grp", renameChildren=True)[0]
 
-        # Scale the duplicated group to mirror it
-        cmds.scale(-1, 1, 1, r_eye_rig_group, relative=True)
+    def create_right_side_controls(self, l_rig_group, l_settings_shape, l_eye_ctrl, l_eye_offset, l_eyelid_offset, l_eyelid_ctrl, l_offsets, l_controls):
+        # Built from the left side's recorded spec in two bulk commits, see mirrorSpec
+        spec = mirrorSpec.mirror_spec(mirrorSpec.read_spec(l_rig_group), "L_", "R_")
+        names = mirrorSpec.build_spec(spec)
 
-        children = cmds.listRelatives(r_eye_rig_group, allDescendents=True) or []
+        def right(node):
+            return names[spec["name_map"][node.split("|")[-1]]]
 
-        r_controls = []
-        r_offsets = []
-        settings_shape_found = False
-
-        # Rename each child with the new prefix
-        for child in children:
-            child_name = child.split("|")[-1]
-            right_name = child_name.replace("L_", "R_")
-            pattern = re.compile(r'(?<!0)1')
-            new_name = pattern.sub('', right_name)
-            cmds.rename(child, new_name)
-            if cmds.objectType(new_name) == 'transform':
-                if "eyeMaster_grp" in new_name:
-                    r_eye_offset = new_name
-                if "eyeMaster_ctrl" in new_name:
-                    r_eye_ctrl = new_name
-                if "eyelidMaster_grp" in new_name:
-                    r_eyelid_offset = new_name
-                if "eyelidMaster_ctrl" in new_name:
-                    r_eyelid_ctrl = new_name
-                if "ctrl" in new_name and any(keyword in new_name for keyword in ["Inner", "Upper", "Outer", "Lower"]):
-                    r_controls.append(new_name)
-                if "grp" in new_name and any(keyword in new_name for keyword in ["Inner", "Upper", "Outer", "Lower"]):
-                    r_offsets.append(new_name)
-            shapes = cmds.listRelatives(new_name, shapes=True, fullPath=True) or []
-            if not settings_shape_found:
-                if "locShape" in new_name:
-                    r_settings_shape = new_name
-                    settings_shape_found = True
-
-
-        return r_eye_rig_group, r_settings_shape, r_eye_ctrl, r_eye_offset, r_eyelid_offset, r_eyelid_ctrl, r_offsets, r_controls
+        return (right(l_rig_group), right(l_settings_shape), right(l_eye_ctrl), right(l_eye_offset), right(l_eyelid_offset),
+                right(l_eyelid_ctrl), [right(offset) for offset in l_offsets], [right(control) for control in l_controls])
 
 
     def create_joints(self, l_controls, r_controls, l_eyelid_ctrl, r_eyelid_ctrl):
@@ -404,22 +404,22 @@ class EyeControlManager:
         #     driven_name = utils.process_name(jnt)
         #     cmds.parentConstraint(ctrl, jnt, mo=True, name=f"{driver_name}_parent_{driven_name}")
 
-        if side == "L":
+        # The right controls and joints are both mirrored in behavior mode (see create_right_side_controls),
+        # so both sides connect their joints the same way
+        if self.drive_mode == "channels":
             for jnt, ctrl in zip(eye_joints, controls):
                 for attr in ["translate", "rotate", "scale"]:
                     for axis in ["X", "Y", "Z"]:
                         cmds.connectAttr(f"{ctrl}.{attr}{axis}", f"{jnt}.{attr}{axis}")
 
-        if side == "R":
+        if self.drive_mode == "matrix":
+            # The control's local matrix becomes the joint's whole local transform once the joint's own channels are
+            # identity. Its offset joint is a duplicate in the same place (see create_joints), so parenting only left
+            # float noise in translate, rotate and jointOrient, clear it so it isn't added on top of the control
             for jnt, ctrl in zip(eye_joints, controls):
-                neg_value_mdn = cmds.createNode("multiplyDivide", name=ctrl.replace("ctrl", "NegValue_mdn"))
-                for attr in ["rotate", "scale"]:
-                    for axis in ["X", "Y", "Z"]:
-                        cmds.connectAttr(f"{ctrl}.{attr}{axis}", f"{jnt}.{attr}{axis}")
-                for axis in ["X", "Y", "Z"]:
-                    cmds.setAttr(f"{neg_value_mdn}.input2{axis}", -1)
-                    cmds.connectAttr(f"{ctrl}.translate{axis}", f"{neg_value_mdn}.input1{axis}")
-                    cmds.connectAttr(f"{neg_value_mdn}.output{axis}", f"{jnt}.translate{axis}")
+                for attr in ["translate", "rotate", "jointOrient"]:
+                    cmds.setAttr(f"{jnt}.{attr}", 0, 0, 0)
+                cmds.connectAttr(f"{ctrl}.matrix", f"{jnt}.offsetParentMatrix")
 
 
         # # Create constraints between the controls and tweaks
@@ -434,7 +434,7 @@ class EyeControlManager:
     def create_blendshape_connections(self, side, settings_shape, upper_blink_bs, lower_blink_bs, blend_curve, driver_curves, drivers_bs):
         # Connect blink attributes to blendshapes with reverse nodes
         for index, attr in enumerate(["lowerBlink", "upperBlink"]):
-            reverse_node = pm.createNode("reverse", name=f"{side}_eye{attr.capitalize()}_rev")
+            reverse_node = cmds.createNode("reverse", name=f"{side}_eye{attr.capitalize()}_rev")
             cmds.connectAttr(f"{settings_shape}.{attr}", f"{reverse_node}.inputX")
             if index == 0:
                 cmds.connectAttr(f"{settings_shape}.{attr}", f"{lower_blink_bs}.{blend_curve[0]}")
@@ -445,7 +445,7 @@ class EyeControlManager:
 
         # Connect blink height attribute to blendshape with remap nodes
         for index, (driver, height) in enumerate(zip(driver_curves, ["upper", "lower"])):
-            remape_node = pm.createNode("remapValue", name=f"{side}_eye{height.capitalize()}_rmp")
+            remape_node = cmds.createNode("remapValue", name=f"{side}_eye{height.capitalize()}_rmp")
             cmds.connectAttr(f"{settings_shape}.blinkHeight", f"{remape_node}.inputValue")
             cmds.setAttr(f"{remape_node}.inputMin", -1)
             cmds.connectAttr(f"{remape_node}.outValue", f"{drivers_bs}.{driver[0]}")
@@ -561,47 +561,43 @@ class EyeControlManager:
             r_eyelidlower_offsets = []
             r_eyelidlower_controls = []
             
-            r_eyelid_ctrl_grp = cmds.duplicate(l_eyelid_ctrl_grp, name="R_eyelidControl_grp", renameChildren=True)[0]
-
-            cmds.scale(-1, 1, 1, r_eyelid_ctrl_grp, relative=True)
-            r_eyelid_children = cmds.listRelatives(r_eyelid_ctrl_grp, allDescendents=True) or []
-
-            new_children_list = []
-            for item in r_eyelid_children:
-                if "aim" in item:
-                    cmds.delete(item)
-                elif "scale" in item:
-                    cmds.delete(item)
-                else:
-                    new_children_list.append(item)
-
-
-            for item in new_children_list:
-                if cmds.objExists(item):
-                    item_name = item.split("|")[-1]
-                    r_item_name = item_name.replace("L_", "R_")
-                    pattern = re.compile(r'(?<!0)1$')
-                    r_item_name = pattern.sub('', r_item_name)
-                    cmds.rename(item, r_item_name)
-                    # Identify the type of the child (offset or control) and add it to the respective list
-                    if cmds.objectType(r_item_name) == 'transform':
-                        if "Upper" in r_item_name and "grp" in r_item_name:
-                            r_eyelidupper_offsets.append(r_item_name)
-                        if "Upper" in r_item_name and "ctrl" in r_item_name:
-                            r_eyelidupper_controls.append(r_item_name)
-                        if "Lower" in r_item_name and "grp" in r_item_name:
-                            r_eyelidlower_offsets.append(r_item_name)
-                        if "Lower" in r_item_name and "ctrl" in r_item_name:
-                            r_eyelidlower_controls.append(r_item_name)
+            # Mirrored from the left group's spec like the right controls, see create_right_side_controls.
+            # The left aim constraints and the left samplers' connections stay behind, the loop below
+            # makes the right ones. The group itself keeps the left one's unrotated world matrix, so the
+            # offsets' translates are world positions on both sides
+            spec = mirrorSpec.mirror_spec(mirrorSpec.read_spec(l_eyelid_ctrl_grp, exclude=lambda name: "aim" in name or "scale" in name,
+                                                               outside_connections=False), "L_", "R_")
+            spec["matrices"][0] = np.eye(4)
+            names = mirrorSpec.build_spec(spec, parent=self.r_eye_rig)
+            r_eyelid_ctrl_grp = names[spec["name_map"][l_eyelid_ctrl_grp]]
+
+            for node in sorted(spec["nodes"], key=lambda node: node["name"]):
+                if node["type"] != "transform":
+                    continue
+                r_item_name = names[node["name"]]
+                if "Upper" in r_item_name and "grp" in r_item_name:
+                    r_eyelidupper_offsets.append(r_item_name)
+                if "Upper" in r_item_name and "ctrl" in r_item_name:
+                    r_eyelidupper_controls.append(r_item_name)
+                if "Lower" in r_item_name and "grp" in r_item_name:
+                    r_eyelidlower_offsets.append(r_item_name)
+                if "Lower" in r_item_name and "ctrl" in r_item_name:
+                    r_eyelidlower_controls.append(r_item_name)
 
             cmds.parent(l_eyelid_ctrl_grp, self.l_eye_rig)
-            cmds.parent(r_eyelid_ctrl_grp, self.r_eye_rig)
 
 
+        curveSamplerNode.load_plugin()
+
         for crv in high_curves:
             cvs = cmds.ls(f"{crv}.cv[*]", flatten=True)
             offsets = []
             eyelash_controls = []
+
+            # One sampler slides every offset along the curve, the offsets' groups sit at the origin on both sides
+            crv_shape = cmds.listRelatives(crv, children=True, shapes=True)[0]
+            sampler = cmds.createNode(curveSamplerNode.TYPE_NAME, name=crv.replace("High_crv", "_sampler"))
+            cmds.connectAttr(f"{crv_shape}.worldSpace[0]", f"{sampler}.inputCurve")
             for i in range(len(cvs)):
                 cmds.select(clear=True)
                 index_str = str(i).zfill(2)
@@ -625,36 +621,18 @@ class EyeControlManager:
                     ctrl_offset, ctrl = ctrl_instance.create()
                     offsets.append(ctrl_offset)
                     eyelash_controls.append(ctrl)
-                    point_on_crv = cmds.createNode("pointOnCurveInfo", name=crv.replace("High_crv", f"{index_str}_pci"))
-                    crv_shape = cmds.listRelatives(crv, children=True, shapes=True)[0]
-                    cmds.connectAttr(f"{crv_shape}.worldSpace[0]", f"{point_on_crv}.inputCurve")
-                    cmds.setAttr(f"{point_on_crv}.parameter", i)
-                    cmds.connectAttr(f"{point_on_crv}.position", f"{ctrl_offset}.t")
 
                 if side == "R":
                     if "Upper" in crv:
                         ctrl_offset = r_eyelidupper_offsets[i]
                         ctrl = r_eyelidupper_controls[i]
-                        point_on_crv = cmds.createNode("pointOnCurveInfo", name=crv.replace("High_crv", f"{index_str}_pci"))
-                        crv_shape = cmds.listRelatives(crv, children=True, shapes=True)[0]
-                        mdn = cmds.createNode("multiplyDivide", name=crv.replace("High_crv", f"{index_str}_mdn"))
-                        cmds.setAttr(f"{mdn}.input2X", -1)
-                        cmds.connectAttr(f"{crv_shape}.worldSpace[0]", f"{point_on_crv}.inputCurve")
-                        cmds.setAttr(f"{point_on_crv}.parameter", i)
-                        cmds.connectAttr(f"{point_on_crv}.position", f"{mdn}.input1")
-                        cmds.connectAttr(f"{mdn}.output", f"{ctrl_offset}.t")
 
                     if "Lower" in crv:
                         ctrl_offset = r_eyelidlower_offsets[i]
                         ctrl = r_eyelidlower_controls[i]
-                        point_on_crv = cmds.createNode("pointOnCurveInfo", name=crv.replace("High_crv", f"{index_str}_pci"))
-                        crv_shape = cmds.listRelatives(crv, children=True, shapes=True)[0]
-                        mdn = cmds.createNode("multiplyDivide", name=crv.replace("High_crv", f"{index_str}_mdn"))
-                        cmds.setAttr(f"{mdn}.input2X", -1)
-                        cmds.connectAttr(f"{crv_shape}.worldSpace[0]", f"{point_on_crv}.inputCurve")
-                        cmds.setAttr(f"{point_on_crv}.parameter", i)
-                        cmds.connectAttr(f"{point_on_crv}.position", f"{mdn}.input1")
-                        cmds.connectAttr(f"{mdn}.output", f"{ctrl_offset}.t")
+
+                cmds.setAttr(f"{sampler}.parameter[{i}]", i)
+                cmds.connectAttr(f"{sampler}.position[{i}]", f"{ctrl_offset}.t")
 
                 if i != 0:
                     driver = utils.process_name(ctrl_offset)
@@ -734,27 +712,11 @@ class EyeControlManager:
 
         return main_aim_offset
 
-    def create_fleshy_eyes(self, l_settings_shape, r_settings_shape, l_offsets, r_offsets, blend_crv):
-        cv_positions = []
-
-        cmds.setAttr(f"{l_settings_shape}.upperBlink", 1)
-        cmds.setAttr(f"{l_settings_shape}.lowerBlink", 1)
-        cmds.setAttr(f"{l_settings_shape}.blinkHeight", -1)
-
-        cv_pos_down = cmds.pointPosition(f"{blend_crv[0]}.cv[7]")
-        cv_positions.append(cv_pos_down)
-
-        cmds.setAttr(f"{l_settings_shape}.blinkHeight", 0)
-        cv_pos_half = cmds.pointPosition(f"{blend_crv[0]}.cv[7]")
-        cv_positions.append(cv_pos_half)
-
-        cmds.setAttr(f"{l_settings_shape}.blinkHeight", 1)
-        cv_pos_up = cmds.pointPosition(f"{blend_crv[0]}.cv[7]")
-        cv_positions.append(cv_pos_up)
-
-        cmds.setAttr(f"{l_settings_shape}.upperBlink", 0)
-        cmds.setAttr(f"{l_settings_shape}.lowerBlink", 0)
-        cmds.setAttr(f"{l_settings_shape}.blinkHeight", 0)
+    def create_fleshy_eyes(self, l_settings_shape, r_settings_shape, l_offsets, r_offsets, blend_crv, driver_curves, upper_blink_bs, lower_blink_bs, drivers_bs):
+        # Closed lids with the blink line down, half way and up, from the blink model
+        # rather than setting the settings shape and evaluating the curves
+        blink_model = blinkModel.BlinkModel.from_scene(blend_crv[0], [driver[0] for driver in driver_curves], upper_blink_bs, lower_blink_bs, drivers_bs)
+        cv_positions = blink_model.cv_positions(blend_crv[0], 7, upper_blink=1, lower_blink=1, blink_height=[-1, 0, 1]).tolist()
 
         l_pupil_drv_offset, l_pupil_drv = controls.create_driver_grp_and_offset(self.l_pupil_ctrl, "l_eyeFleshyEye")
         driver_name = utils.process_name(self.l_pupil_ctrl)
@@ -770,146 +732,22 @@ class EyeControlManager:
 
 
 #-------------------------------------------------------------------------------------------------------------------------------------    
-# Stand alone function to find the mid CV index and the direction of the curve
-
-def find_mid_cv_and_curve_direction(self, curve)
-    cvs = cmds.ls(f"{curve}.cv[*]", flatten=True)
-    end_index = len(cvs) - 1
-    mid_cv = (len(cvs)-1) / 2
-
-    curve_direction = utils.find_curve_direction(curve)
-
-    return mid_cv, curve_direction
-
-
-#-------------------------------------------------------------------------------------------------------------------------------------    
-# Function to position the locators along the upper and lower lids. 
-# One mid loc in the centre and two tweak locs
-
-def place_lid_locs(high_curves):
-    mid_cv, curve_direction = self.find_mid_cv_and_curve_direction(high_curves[-1])
-
-    upper_lid_locs, lower_lid_locs = self.place_tweak_locs(high_curves, curve_direction)
-    self.place_mid_locs(self.high_res_curves, curve_direction, upper_lid_locs, lower_lid_locs, mid_cv)
-
-    return upper_lid_locs, lower_lid_locs
-
-
-#-------------------------------------------------------------------------------------------------------------------------------------    
-# Function to position the locators at each corner of the eyelids
-
-def place_inner_and_outer_locs(pupil_vertex, curve_lower_lid):
-    curve_direction = utils.find_curve_direction(curve_lower_lid)
+# Stand alone functions returning the world matrices of the eyelid guides, see lidGuides
 
+def place_corner_guides(pupil_vertex, curve_lower_lid):
     pupil_pos = cmds.xform(pupil_vertex, query=True, translation=True, worldSpace=True)
-    vert_loc = cmds.spaceLocator(name="pupilAimer_loc")[0]
-    cmds.xform(vert_loc, translation=pupil_pos, worldSpace=True)
-
-    aimed_at_tangent_locators = []
-    placer_locs = []
-    aimed_at_loc_locators = []
-    helper_components = []
-
-    if curve_direction < 0:
-        curve_direction = -1
-        inner_point = cmds.pointPosition(f"{curve_lower_lid}.cv[{self.end_index}]", world=True)
-        outer_point = cmds.pointPosition(f"{curve_lower_lid}.cv[0]", world=True)
-        cv_pivot_inner = 14
-        cv_pivot_outer = 0
-        
-    elif curve_direction > 0:
-        curve_direction = 1
-        inner_point = cmds.pointPosition(f"{curve_lower_lid}.cv[0]", world=True)
-        outer_point = cmds.pointPosition(f"{curve_lower_lid}.cv[{self.end_index}]", world=True)
-        cv_pivot_inner = 0
-        cv_pivot_outer = 14
-
-    for name, point, pivot in zip(["Inner", "Outer"], [inner_point, outer_point], [cv_pivot_inner, cv_pivot_outer]):
-        loc_anchor = cmds.spaceLocator(name=f"L_{name}Anchor_loc")[0]
-        cmds.xform(loc_anchor, translation=point, worldSpace=True)
-        flat_curve = utils.create_flat_curve_with_same_number_of_cvs(curve_lower_lid)
-        flat_curve = cmds.rename(flat_curve, f"L_{name}Flat_crv")
-        pivot_position = cmds.pointPosition(f"{flat_curve}.cv[{pivot}]", world=True)
-        cmds.xform(flat_curve, rotatePivot=pivot_position, worldSpace=True)
-        cmds.delete(cmds.pointConstraint(loc_anchor, flat_curve, mo=False))
-        tangent_loc = cmds.spaceLocator(name=f"L_eyelid{name}Tangent_loc")[0]
-        cmds.xform(tangent_loc, translation=point, worldSpace=True)
-        cmds.delete(cmds.tangentConstraint(flat_curve, tangent_loc, weight=1, aimVector=(curve_direction, 0, 0), upVector=(0, 1, 0), worldUpType="scene"))
-        aimed_at_tangent_locators.append(tangent_loc)
-        helper_components.extend([loc_anchor, flat_curve])
-
-    cmds.delete(cmds.aimConstraint(vert_loc, aimed_at_tangent_locators[-1], aimed_at_tangent_locators[0], mo=False, weight=1, aimVector=[1, 0, 0], upVector=[0, 1, 0], worldUpType="scene"))
-    cmds.delete(cmds.aimConstraint(vert_loc, aimed_at_tangent_locators[0], aimed_at_tangent_locators[-1], mo=False, weight=1, aimVector=[-1, 0, 0], upVector=[0, 1, 0], worldUpType="scene"))
-    
-    cmds.delete(vert_loc)
-
-    inner_loc = aimed_at_tangent_locators[0]
-    outer_loc = aimed_at_tangent_locators[-1]
 
-    for component in helper_components:
-        cmds.delete(component)
+    return lidGuides.corner_matrices(lidGuides.LidCurve.from_scene(curve_lower_lid), pupil_pos)
 
-    return inner_loc, outer_loc
-
-#-------------------------------------------------------------------------------------------------------------------------------------    
-# Creates and positions the tweak locs and returns them
-
-def place_tweak_locs(curves, curve_direction):
-    upper_lid_locs = []
-    lower_lid_locs = []
-
-    names = ["Tweak00", "Tweak01"]
-    
-    if curve_direction < 0:
-        curve_direction = -1
-        paremters = [0.75, 0.25]
-        
-    elif curve_direction > 0:
-        curve_direction = 1
-        paremters = [0.25, 0.75]
-
-    for index, (crv, lid) in enumerate(zip(curves, ["Upper", "Lower"])):
-        for name, parameter in zip(names, paremters):
-            loc = cmds.spaceLocator(name=f"L_{lid}{name}")
-            point = cmds.pointOnCurve(crv, pr=parameter, p=True, turnOnPercentage=True)
-            cmds.xform(loc, translation=point, worldSpace=True)
-            cmds.delete(cmds.tangentConstraint(crv, loc, weight=1, aimVector=(curve_direction, 0, 0), upVector=(0, 1, 0), worldUpType="scene"))
-            if index == 0:
-                upper_lid_locs.append(loc)
-            if index == 1:
-                lower_lid_locs.append(loc)
 
-    return upper_lid_locs, lower_lid_locs
+def place_lid_guides(high_curves):
+    upper_curve, lower_curve = (lidGuides.LidCurve.from_scene(crv) for crv in high_curves)
 
-#-------------------------------------------------------------------------------------------------------------------------------------    
-# Creates and positions the mid locs and returns them
+    return lidGuides.lid_matrices(upper_curve, lower_curve)
 
-def place_mid_locs(curves, curve_direction, upper_locs, lower_locs, mid_cv):
-    mid_locs = []
-    
-    if curve_direction < 0:
-        aim_vector = -1
-        
-    elif curve_direction > 0:
-        aim_vector = 1
-    
-    for index, (crv, name) in enumerate(zip(curves, ["Upper", "Lower"])):
-        mid_loc = cmds.spaceLocator(name=f"L_{name}Mid")
-        mid_point = cmds.pointPosition(f"{crv}.cv[{mid_cv}]", world=True)
-        cmds.xform(mid_loc, translation=mid_point, worldSpace=True)
-        cmds.delete(cmds.tangentConstraint(crv, mid_loc, weight=1, aimVector=(aim_vector, 0, 0), upVector=(0, 1, 0), worldUpType="scene"))
-        mid_locs.append(mid_loc)
-        if index == 0:
-            upper_locs.insert(1, mid_loc)
-        if index == 1:
-            lower_locs.insert(1, mid_loc)
-
-    cmds.delete(cmds.aimConstraint(mid_locs[0], mid_locs[1], offset=[0, 0, 0], weight=1, aimVector=[0, -(curve_direction), 0], upVector=[0, 0, 1], worldUpType="none", skip=["y"]))
-    cmds.delete(cmds.aimConstraint(mid_locs[1], mid_locs[0], offset=[0, 0, 0], weight=1, aimVector=[0, curve_direction, 0], upVector=[0, 0, 1], worldUpType="none", skip=["y"]))
-
-    cmds.delete(cmds.pointConstraint(mid_locs[0], mid_locs[1], skip=["x", "y"]))
-    cmds.delete(cmds.geometryConstraint(curves[-1], mid_locs[1]))
 
+def set_guide_matrix(node, matrix):
+    cmds.xform(node, matrix=np.asarray(matrix, dtype=float).ravel().tolist(), worldSpace=True)
 
 
 
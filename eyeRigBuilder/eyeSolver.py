@@ -0,0 +1,149 @@
+"""
+Pure eye weight solving, run in parallel over any number of eyes.
+
+Once the vertex and joint positions of an eye have been read from the scene, the ring,
+falloff and closest joint solves are plain geometry. An EyeSkinJob holds everything one
+eye needs, solve_eye turns it into SkinWeights and solve_eyes spreads several jobs over
+a process pool. Nothing here imports Maya, so the worker processes never touch the
+scene and the final writes stay with the caller on the main thread.
+"""
+import multiprocessing
+import os
+import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+from riggingTools import falloff
+from riggingTools import skinSolver
+from riggingTools.weightMatrix import SkinWeights
+
+
+# Below this many vertices in total, starting the worker processes costs more than the solve
+PARALLEL_MIN_VERTICES = 20000
+
+
+def ring_values(points, center, edges=None, ring_tolerance=None, falloff_profile="cosine", full_fraction=0.25, min_weight=0.2):
+    """
+    Iris weight for every point, from its ring and the falloff profile.
+    Rings are binned by distance to the center, or counted in edge hops from the inner ring
+    when edges (pairs of point rows) are given.
+    """
+    distances = np.linalg.norm(points - center, axis=1)
+    rings = skinSolver.bin_rings(distances, ring_tolerance)
+
+    if edges is not None:
+        rings = skinSolver.topology_rings(len(points), edges, np.flatnonzero(rings == 0))
+
+    return falloff.ring_weights(rings, falloff_profile, full_fraction, min_weight)
+
+
+def closest_joint_values(points, joint_points, values, nearest_count=1, blend_mode="inverse"):
+    """
+    Returns the closest joint of every point and the value it gets.
+    With nearest_count above 1 both are (n, nearest_count) and the value is shared by blend_mode.
+    """
+    if nearest_count > 1:
+        closest, blend = skinSolver.k_nearest_joints(points, joint_points, nearest_count, blend_mode)
+        return closest, np.reshape(values, (-1, 1)) * blend
+
+    return skinSolver.closest_joint_indices(points, joint_points), values
+
+
+class EyeSkinJob:
+    """
+    Everything needed to solve one eye, as plain arrays.
+    iris_rows and pupil_rows pick each pass's vertices out of indices and points,
+    iris_edges are pairs of iris rows (or None to bin rings by distance) and the
+    columns are the influence column of every joint.
+    """
+
+    def __init__(self, skin_cluster, indices, influences, points, center, aim_column,
+                 iris_rows, iris_joint_points, iris_columns, pupil_rows, pupil_joint_points, pupil_columns,
+                 iris_edges=None, ring_tolerance=None, falloff_profile="cosine", full_fraction=0.25, min_weight=0.2,
+                 nearest_count=1, blend_mode="inverse"):
+        self.skin_cluster = skin_cluster
+        self.indices = indices
+        self.influences = influences
+        self.points = points
+        self.center = center
+        self.aim_column = aim_column
+        self.iris_rows = iris_rows
+        self.iris_joint_points = iris_joint_points
+        self.iris_columns = iris_columns
+        self.pupil_rows = pupil_rows
+        self.pupil_joint_points = pupil_joint_points
+        self.pupil_columns = pupil_columns
+        self.iris_edges = iris_edges
+        self.ring_tolerance = ring_tolerance
+        self.falloff_profile = falloff_profile
+        self.full_fraction = full_fraction
+        self.min_weight = min_weight
+        self.nearest_count = nearest_count
+        self.blend_mode = blend_mode
+
+
+def solve_eye(job):
+    """
+    Solves one eye the same way the sequential passes do: every vertex on the aim joint,
+    then the iris falloff, then the pupil joints at full weight. Returns SkinWeights.
+    """
+    weights = np.zeros((len(job.indices), len(job.influences)))
+    weights[:, job.aim_column] = 1.0
+
+    iris_points = job.points[job.iris_rows]
+    values = ring_values(iris_points, job.center, job.iris_edges, job.ring_tolerance,
+                         job.falloff_profile, job.full_fraction, job.min_weight)
+    closest, values = closest_joint_values(iris_points, job.iris_joint_points, values, job.nearest_count, job.blend_mode)
+    weights[job.iris_rows] = skinSolver.set_transform_values(weights[job.iris_rows], job.iris_columns[closest], values)
+
+    pupil_points = job.points[job.pupil_rows]
+    closest, values = closest_joint_values(pupil_points, job.pupil_joint_points, 1.0, job.nearest_count, job.blend_mode)
+    weights[job.pupil_rows] = skinSolver.set_transform_values(weights[job.pupil_rows], job.pupil_columns[closest], values)
+
+    return SkinWeights.from_dense(job.indices, weights, job.influences)
+
+
+def mayapy_executable():
+    """
+    Inside the Maya GUI sys.executable is Maya itself, so worker processes have to be
+    started with the mayapy that ships next to it. Returns None outside the GUI.
+    """
+    name = os.path.basename(sys.executable).lower()
+    if not name.startswith("maya") or name.startswith("mayapy"):
+        return None
+
+    binary = "mayapy.exe" if sys.platform == "win32" else "mayapy"
+    bin_dir = os.path.dirname(sys.executable)
+    # On macOS Maya runs from Maya.app/Contents/MacOS with mayapy in Contents/bin
+    for candidate in (os.path.join(bin_dir, binary), os.path.join(bin_dir, os.pardir, "bin", binary)):
+        if os.path.exists(candidate):
+            return os.path.normpath(candidate)
+
+    raise OSError(f"Could not find mayapy next to {sys.executable}")
+
+
+def solve_eyes(jobs, parallel=True, max_workers=None, min_vertices=PARALLEL_MIN_VERTICES):
+    """
+    Solves a list of EyeSkinJobs and returns their SkinWeights in the same order.
+    Jobs run in a process pool, one eye per core, when there is more than one and they
+    add up to at least min_vertices. Falls back to solving in sequence if the pool can't
+    be started or a job can't be sent to it (for example a lambda falloff profile).
+    """
+    vertex_count = sum(len(job.indices) for job in jobs)
+    if not parallel or len(jobs) < 2 or vertex_count < min_vertices:
+        return [solve_eye(job) for job in jobs]
+
+    try:
+        context = multiprocessing.get_context("spawn")
+        executable = mayapy_executable()
+        if executable:
+            context.set_executable(executable)
+
+        workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            return list(executor.map(solve_eye, jobs))
+
+    except (OSError, BrokenProcessPool, pickle.PicklingError, AttributeError) as error:
+        print(f"Parallel eye solve unavailable ({error}), solving in sequence.")
+        return [solve_eye(job) for job in jobs]
@@ -8,6 +8,8 @@ import math
 
 import maya.OpenMayaUI as omui
 from riggingTools.iris import EyeballRig
+from riggingTools.iris import LODS
+from riggingTools.weightCache import SkinWeightCache
 
 
 # Utility function to get Maya window
@@ -36,6 +38,7 @@ class EyeballRigUI(QtWidgets.QDialog):
         self.selected_pupil_edges = None
         self.selected_iris_faces = None
         self.selected_pupil_faces = None
+        self.skin_cache = SkinWeightCache()
         self.shape_paths = {
             "clover": "/Users/ericahetherington/Library/Preferences/Autodesk/maya/2023/prefs/scripts/eyeRigBuilder/resources/clover.png",
             "oval": "/Users/ericahetherington/Library/Preferences/Autodesk/maya/2023/prefs/scripts/eyeRigBuilder/resources/oval.png",
@@ -60,6 +63,14 @@ class EyeballRigUI(QtWidgets.QDialog):
         self.pupil_load_button = QtWidgets.QPushButton("Load")
         self.pupil_clear_button = QtWidgets.QPushButton("Clear")
         self.r_eye_checkbox = QtWidgets.QCheckBox("Right Eye")
+        self.low_node_pupil_checkbox = QtWidgets.QCheckBox("Low Node Pupil Scale")
+        self.joint_count_label = QtWidgets.QLabel("Joints per Loop:")
+        self.joint_count_spin_box = QtWidgets.QSpinBox()
+        self.joint_count_spin_box.setRange(0, 128)
+        self.joint_count_spin_box.setSpecialValueText("One per Vertex")
+        self.lod_label = QtWidgets.QLabel("Level of Detail:")
+        self.lod_combo_box = QtWidgets.QComboBox()
+        self.lod_combo_box.addItems(list(LODS))
         self.create_rig_button = QtWidgets.QPushButton("Create Rig")
         self.create_rig_button.setStyleSheet(self._major_action_button_style())
         self.create_rig_button.setMinimumSize(50, 22)
@@ -74,6 +85,8 @@ class EyeballRigUI(QtWidgets.QDialog):
         self.pupil_faces_line_edit = QtWidgets.QLineEdit()
         self.pupil_faces_load_button = QtWidgets.QPushButton("Load")
         self.pupil_faces_clear_button = QtWidgets.QPushButton("Clear")
+        self.mirror_skin_checkbox = QtWidgets.QCheckBox("Mirror Skin L to R")
+        self.mirror_skin_checkbox.setChecked(True)
         self.skin_eye_button = QtWidgets.QPushButton("Skin Eye")
         self.skin_eye_button.setStyleSheet(self._major_action_button_style())
         self.skin_eye_button.setMinimumSize(50, 22)
@@ -122,6 +135,9 @@ class EyeballRigUI(QtWidgets.QDialog):
         eye_form_layout.addRow(self.iris_edges_label, iris_layout)
         eye_form_layout.addRow(self.pupil_edges_label, pupil_layout)
         eye_form_layout.addRow(self.r_eye_checkbox)
+        eye_form_layout.addRow(self.low_node_pupil_checkbox)
+        eye_form_layout.addRow(self.joint_count_label, self.joint_count_spin_box)
+        eye_form_layout.addRow(self.lod_label, self.lod_combo_box)
         eye_form_layout.addRow(self.create_rig_button)
         self.build_eye_rig_group_box.setLayout(eye_form_layout)
 
@@ -143,6 +159,7 @@ class EyeballRigUI(QtWidgets.QDialog):
         face_form_layout = QtWidgets.QFormLayout()
         face_form_layout.addRow(self.iris_faces_label, iris_faces_layout)
         face_form_layout.addRow(self.pupil_faces_label, pupil_faces_layout)
+        face_form_layout.addRow(self.mirror_skin_checkbox)
         face_form_layout.addRow(self.skin_eye_button)
         self.build_face_rig_group_box.setLayout(face_form_layout)
 
@@ -310,6 +327,7 @@ class EyeballRigUI(QtWidgets.QDialog):
         self.pupil_clear_button.clicked.connect(self.clear_pupil_edges)
 
         self.create_rig_button.clicked.connect(lambda: self.create_rig(self.selected_iris_edges, self.selected_pupil_edges))
+        self.lod_combo_box.currentTextChanged.connect(self.lod_changed)
 
         # Face Rig connections
         self.iris_faces_load_button.clicked.connect(self.load_iris_faces)
@@ -396,7 +414,17 @@ class EyeballRigUI(QtWidgets.QDialog):
             return
         else:
             r_eye_flag = self.r_eye_checkbox.isChecked()
-            self.rig = EyeballRig(iris_edges, pupil_edges, r_eye_flag)
+            pupil_scale_mode = "shared" if self.low_node_pupil_checkbox.isChecked() else "network"
+            joint_count = self.joint_count_spin_box.value() or None
+            lod = self.lod_combo_box.currentText()
+            self.rig = EyeballRig(iris_edges, pupil_edges, r_eye_flag, pupil_scale_mode, joint_count, lod)
+
+    def lod_changed(self, lod):
+        # A built rig switches in place, its controls are kept
+        rig = getattr(self, "rig", None)
+        if rig is not None and lod != rig.lod:
+            rig.set_lod(lod)
+            print(f"Eye rig switched to {lod} detail.")
 
 
     def skin_eye_clicked(self, iris_faces, pupil_faces):
@@ -411,28 +439,33 @@ class EyeballRigUI(QtWidgets.QDialog):
 
             else:
 
-                pupil_joints = [f"l_pupilScale{str(i).zfill(2)}_jnt" for i in range(24)]  # Pupil joints
-                iris_joints = [f"l_irisTip{str(i).zfill(2)}_jnt" for i in range(24)]
+                # The rig knows how many joints it built per loop
+                eye_joints = self.rig.eye_joints
+                eyes = [dict(side="l", iris_faces=iris_faces, pupil_faces=pupil_faces, iris_joints=eye_joints["l"]["iris"], pupil_joints=eye_joints["l"]["pupil"])]
+
+                r_eye_flag = self.r_eye_checkbox.isChecked()
+                mirror_flag = r_eye_flag and self.mirror_skin_checkbox.isChecked()
 
-                self.rig.assign_influence_to_eye_aim('l', iris_faces)
-                self.rig.assign_influence_to_eye_aim('l', pupil_faces)
-                self.rig.skin_eye_verts("l", iris_faces, iris_joints, iris_flag=True)
-                self.rig.skin_eye_verts("l", pupil_faces, pupil_joints, iris_flag=False)
+                if r_eye_flag and not mirror_flag:
+                    # Both eyes are solved together, in parallel where it pays off
+                    eyes.append(dict(
+                        side="r",
+                        iris_faces=[face.replace("l_eye_geo", "r_eye_geo") for face in iris_faces],
+                        pupil_faces=[face.replace("l_eye_geo", "r_eye_geo") for face in pupil_faces],
+                        iris_joints=eye_joints["r"]["iris"],
+                        pupil_joints=eye_joints["r"]["pupil"],
+                    ))
+
+                self.rig.skin_eyes(eyes, cache=self.skin_cache)
 
                 print(f"Left eye skin recalulated.")
 
-                r_eye_flag = self.r_eye_checkbox.isChecked()
-                if r_eye_flag:
-                    r_pupil_faces = [face.replace("l_eye_geo", "r_eye_geo") for face in pupil_faces]
-                    r_iris_faces  = [face.replace("l_eye_geo", "r_eye_geo") for face in iris_faces]
-                    r_pupil_joints = [f"r_pupilScale{str(i).zfill(2)}_jnt" for i in range(24)]
-                    r_iris_joints = [f"r_irisTip{str(i).zfill(2)}_jnt" for i in range(24)]
+                if mirror_flag:
+                    self.rig.mirror_eye_skin(iris_faces + pupil_faces)
 
-                    self.rig.assign_influence_to_eye_aim("r", r_iris_faces)
-                    self.rig.assign_influence_to_eye_aim("r", r_pupil_faces)
-                    self.rig.skin_eye_verts("r", r_iris_faces, r_iris_joints, iris_flag=True)
-                    self.rig.skin_eye_verts("r", r_pupil_faces, r_pupil_joints, iris_flag=False)
+                    print(f"Right eye skin mirrored.")
 
+                elif r_eye_flag:
                     print(f"Right eye skin recalulated.")
 
         except AttributeError as e:
@@ -0,0 +1,118 @@
+"""
+Falloff profiles for iris skinning.
+
+A profile maps a normalized fade position t (0 at the start of the fade, 1 at the
+outer edge) to a value from 1 down to 0. Weights are then remapped so the outer
+edge lands on min_weight rather than zero. Everything is evaluated over whole arrays,
+so a full eye is weighted in one call.
+
+Profiles can be given by name, as a function of t, or as a list of curve values
+which is sampled into a lookup table.
+"""
+import numpy as np
+
+
+# Number of samples used when a custom curve is turned into a lookup table
+LUT_SIZE = 256
+
+
+def linear(t):
+    return 1.0 - t
+
+
+def cosine(t):
+    return 0.5 * (np.cos(np.pi * t) + 1.0)
+
+
+def smoothstep(t):
+    return 1.0 - t * t * (3.0 - 2.0 * t)
+
+
+PROFILES = {
+    "linear": linear,
+    "cosine": cosine,
+    "smoothstep": smoothstep,
+}
+
+
+def register_profile(name, profile):
+    """Adds a named profile. Profiles take an array of t values and return an array of fade values."""
+    PROFILES[name] = profile
+
+
+def profile_name(profile):
+    """The name a function of t is registered under in PROFILES, None if it is not registered."""
+    for name, registered in PROFILES.items():
+        if registered is profile:
+            return name
+
+    return None
+
+
+def create_lookup_table(curve, size=LUT_SIZE):
+    """
+    Samples a custom curve into a lookup table of evenly spaced values from t=0 to t=1.
+    The curve can be a function of t or a list of values (for example keys read off an animCurve).
+    """
+    if callable(curve):
+        return np.asarray(curve(np.linspace(0.0, 1.0, size)), dtype=float)
+
+    values = np.asarray(curve, dtype=float)
+    return np.interp(np.linspace(0.0, 1.0, size), np.linspace(0.0, 1.0, len(values)), values)
+
+
+def resolve_profile(profile):
+    """Returns a vectorized function of t for a profile name, a function or a list of curve values."""
+    if isinstance(profile, str):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown falloff profile: {profile}. Choose from {', '.join(PROFILES)}")
+        return PROFILES[profile]
+
+    lookup_table = create_lookup_table(profile)
+    samples = np.linspace(0.0, 1.0, len(lookup_table))
+
+    return lambda t: np.interp(t, samples, lookup_table)
+
+
+def evaluate(t, profile="cosine", min_weight=0.2):
+    """Weights for an array of fade positions, remapped so t=1 gives min_weight."""
+    t = np.clip(np.asarray(t, dtype=float), 0.0, 1.0)
+
+    return min_weight + (1.0 - min_weight) * resolve_profile(profile)(t)
+
+
+def ring_weights(rings, profile="cosine", full_fraction=0.25, min_weight=0.2):
+    """
+    Weights for an array of ring indices (0 is the innermost ring).
+    The first full_fraction of rings get full weight, at least one ring, then the profile
+    fades from the next ring down to min_weight on the outermost ring.
+    """
+    rings = np.asarray(rings, dtype=int)
+    if not rings.size:
+        return np.empty(0)
+
+    ring_count = rings.max() + 1
+    full_rings = max(int(ring_count * full_fraction), 1)
+    # The fade zone runs from the first faded ring to the final ring
+    fade_range = max((ring_count - 1) - full_rings, 1)
+
+    weights = evaluate((rings - full_rings) / fade_range, profile, min_weight)
+    weights[rings < full_rings] = 1.0
+
+    return weights
+
+
+def distance_weights(distances, profile="cosine", full_fraction=0.25, min_weight=0.2):
+    """
+    Weights for an array of distances from the eye center, without any ring binning.
+    The inner full_fraction of the radius gets full weight and the profile fades across the rest.
+    """
+    distances = np.asarray(distances, dtype=float)
+    if not distances.size:
+        return np.empty(0)
+
+    inner, outer = distances.min(), distances.max()
+    full_distance = inner + (outer - inner) * full_fraction
+    fade_range = max(outer - full_distance, 1e-8)
+
+    return evaluate((distances - full_distance) / fade_range, profile, min_weight)
@@ -0,0 +1,160 @@
+"""
+Batched node graph construction.
+
+GraphBuilder queues node creation, parenting, renames, attribute values and
+connections on a single MDagModifier and commits them all in one doIt, instead of
+one cmds call (and one round trip through the command engine) per operation.
+Existing scene nodes are looked up once by name and reused for every connection.
+
+Modifier edits done straight from a script don't go on Maya's undo queue, so commit()
+runs them through the graphBuilderCommit command (see graphBuilderCommand) and one undo
+takes a committed graph back out. undo() on the builder does the same from code.
+"""
+import re
+import maya.api.OpenMaya as om2
+import maya.cmds as maya_cmds
+from riggingTools.sceneCache import cmds
+
+
+_PLUG_PATTERN = re.compile(r"^(?P<name>\w+)(?:\[(?P<index>\d+)\])?$")
+
+# Builders handed to the graphBuilderCommit command, it takes the last one
+PENDING = []
+
+
+class GraphNode:
+    """A node queued on a GraphBuilder. str() gives its name in the scene once committed."""
+
+    def __init__(self, obj, name, dag):
+        self.obj = obj
+        self.requested_name = name
+        self.dag = dag
+
+    def __str__(self):
+        if self.dag:
+            return om2.MFnDagNode(self.obj).partialPathName()
+        return om2.MFnDependencyNode(self.obj).name()
+
+    def __repr__(self):
+        return f"GraphNode({self.requested_name!r})"
+
+
+class GraphBuilder:
+    def __init__(self):
+        self.modifier = om2.MDagModifier()
+        self.nodes = []
+        self.scene_nodes = {}
+        self.committed = False
+
+    def _get_object(self, node):
+        """MObject for a queued GraphNode or an existing scene node name, each name is resolved once."""
+        if isinstance(node, GraphNode):
+            return node.obj
+
+        if node not in self.scene_nodes:
+            selection = om2.MSelectionList()
+            selection.add(node)
+            self.scene_nodes[node] = selection.getDependNode(0)
+
+        return self.scene_nodes[node]
+
+    def _get_plug(self, node, attribute):
+        """Plug for node.attribute, attribute can be nested and indexed, e.g. worldSpace[0] or input3D[1].input3Dx."""
+        node_fn = om2.MFnDependencyNode(self._get_object(node))
+
+        plug = None
+        for part in attribute.split("."):
+            match = _PLUG_PATTERN.match(part)
+            if match is None:
+                raise ValueError(f"Can't parse attribute {attribute}")
+
+            if plug is None:
+                plug = node_fn.findPlug(match.group("name"), False)
+            else:
+                plug = plug.child(node_fn.attribute(match.group("name")))
+
+            if match.group("index") is not None:
+                plug = plug.elementByLogicalIndex(int(match.group("index")))
+
+        return plug
+
+    def create_node(self, node_type, name, parent=None):
+        """Queues a new node. DAG nodes can be given a parent, a GraphNode or a scene node name."""
+        is_dag = om2.MNodeClass(node_type).hasAttribute("worldMatrix")
+
+        if is_dag:
+            parent_obj = self._get_object(parent) if parent is not None else om2.MObject.kNullObj
+            obj = self.modifier.createNode(node_type, parent_obj)
+        else:
+            if parent is not None:
+                raise ValueError(f"{node_type} is not a DAG node and can't be parented")
+            obj = om2.MDGModifier.createNode(self.modifier, node_type)
+
+        self.modifier.renameNode(obj, name)
+
+        node = GraphNode(obj, name, is_dag)
+        self.nodes.append(node)
+
+        return node
+
+    def parent(self, node, parent):
+        """Queues a reparent of a DAG node under another."""
+        self.modifier.reparentNode(self._get_object(node), self._get_object(parent))
+
+    def set_attr(self, node, attribute, value):
+        """Queues a numeric or bool attribute value."""
+        plug = self._get_plug(node, attribute)
+
+        if isinstance(value, bool):
+            self.modifier.newPlugValueBool(plug, value)
+        elif isinstance(value, int):
+            self.modifier.newPlugValueInt(plug, value)
+        else:
+            self.modifier.newPlugValueDouble(plug, float(value))
+
+    def set_data(self, node, attribute, data):
+        """Queues a data object as an attribute's value, e.g. MFnNurbsCurveData for a curve's cached shape."""
+        self.modifier.newPlugValue(self._get_plug(node, attribute), data)
+
+    def add_attribute(self, node, attribute):
+        """Queues a new dynamic attribute, an MObject made by one of the MFn*Attribute create calls."""
+        self.modifier.addAttribute(self._get_object(node), attribute)
+
+    def connect(self, source, source_attribute, destination, destination_attribute):
+        """Queues a connection from source.source_attribute to destination.destination_attribute."""
+        self.modifier.connect(self._get_plug(source, source_attribute), self._get_plug(destination, destination_attribute))
+
+    def commit(self):
+        """
+        Runs every queued edit in one undoable transaction. Returns the names the nodes
+        ended up with.
+        """
+        from riggingTools import graphBuilderCommand
+
+        graphBuilderCommand.load_plugin()
+
+        # Straight to Maya, the query cache would take the command for a selection edit
+        PENDING.append(self)
+        maya_cmds.graphBuilderCommit()
+
+        names = [str(node) for node in self.nodes]
+        cmds.record_created(names)
+
+        return names
+
+    def redo(self):
+        """Runs the queued edits unless they already ran. The graphBuilderCommit command calls this, use commit()."""
+        if not self.committed:
+            self.modifier.doIt()
+            self.committed = True
+
+            # Modifier edits bypass cmds, so tell the query cache what changed, by node name without the path
+            names = [str(node) for node in self.nodes] + list(self.scene_nodes)
+            cmds.invalidate([name.split("|")[-1] for name in names])
+
+    def undo(self):
+        """Takes a committed graph back out of the scene."""
+        if self.committed:
+            self.modifier.undoIt()
+            self.committed = False
+            cmds.invalidate()
@@ -0,0 +1,64 @@
+"""
+graphBuilderCommit, a Python API 2.0 command that puts a GraphBuilder commit on the undo queue.
+
+Edits run straight from a script through an MDagModifier never reach Maya's undo
+queue, so undo after a build skipped every node a GraphBuilder made. GraphBuilder.commit
+leaves itself in graphBuilder.PENDING and calls this command instead, which runs the
+builder and keeps it, so undo and redo take the whole graph out and put it back like
+any other command.
+
+GraphBuilder.commit loads it with load_plugin(), the module is its own plug-in file.
+"""
+import os
+import maya.api.OpenMaya as om2
+
+
+COMMAND_NAME = "graphBuilderCommit"
+
+PLUGIN_PATH = os.path.splitext(os.path.abspath(__file__))[0] + ".py"
+
+
+def maya_useNewAPI():
+    """Tells Maya the plug-in uses API 2.0."""
+
+
+class GraphBuilderCommit(om2.MPxCommand):
+    def __init__(self):
+        super().__init__()
+        self.builder = None
+
+    @staticmethod
+    def creator():
+        return GraphBuilderCommit()
+
+    def isUndoable(self):
+        return True
+
+    def doIt(self, args):
+        # Maya loads this file as its own module, the queue lives in the imported graphBuilder
+        from riggingTools import graphBuilder
+
+        self.builder = graphBuilder.PENDING.pop()
+        self.redoIt()
+
+    def redoIt(self):
+        self.builder.redo()
+
+    def undoIt(self):
+        self.builder.undo()
+
+
+def initializePlugin(plugin):
+    om2.MFnPlugin(plugin, "eyeRigBuilder", "1.0").registerCommand(COMMAND_NAME, GraphBuilderCommit.creator)
+
+
+def uninitializePlugin(plugin):
+    om2.MFnPlugin(plugin).deregisterCommand(COMMAND_NAME)
+
+
+def load_plugin():
+    """Loads this module as a plug-in unless the command is already registered."""
+    from riggingTools.sceneCache import cmds
+
+    if not cmds.pluginInfo(PLUGIN_PATH, query=True, loaded=True):
+        cmds.loadPlugin(PLUGIN_PATH, quiet=True)
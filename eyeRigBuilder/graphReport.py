@@ -0,0 +1,275 @@
+"""
+Static analysis of the node graph a rig build creates.
+
+read_graph() reads the types and connections of a set of nodes through cmds, so it runs
+against Maya or the benchmarks' in-memory stand-in alike, and analyze() works on the
+plain SceneGraph it returns. The report gives what the rig will cost at evaluation time
+before an animator finds out:
+
+- node counts by type and by the build step that created them
+- the longest dependency chain through the rig's own nodes
+- the nodes with the most incoming and outgoing connections
+- constraint counts
+
+Constraints and the transforms they drive feed each other at node level, so loops are
+collapsed and counted as one link of the chain with all their nodes. Reports are plain
+dicts. save_report() writes them as JSON with sorted keys so a rig change shows up as a
+readable diff in review, and check_report() compares one against limits.
+"""
+import contextlib
+import json
+from collections import Counter
+
+
+# Connections that carry no evaluation are left out of chains and fan counts
+IGNORED_ATTRIBUTES = {"message"}
+
+UNATTRIBUTED = "unattributed"
+
+HOT_SPOT_COUNT = 10
+
+
+def _get_commands(commands):
+    if commands is None:
+        from riggingTools.sceneCache import cmds as commands
+
+    return commands
+
+
+def _split_plug(plug):
+    """(node, attribute) of a plug name, the node without its DAG path."""
+    node, _, attribute = plug.partition(".")
+
+    return node.split("|")[-1], attribute
+
+
+class SceneGraph:
+    def __init__(self, node_types, connections, steps=None):
+        self.node_types = dict(node_types)
+        # (source node, source attribute, destination node, destination attribute)
+        self.connections = sorted(set(connections))
+        self.steps = dict(steps or {})
+
+    def __repr__(self):
+        return f"SceneGraph({len(self.node_types)} nodes, {len(self.connections)} connections)"
+
+
+def read_graph(nodes, steps=None, commands=None):
+    """Reads the type of every node and every connection into or out of one, returns a SceneGraph."""
+    commands = _get_commands(commands)
+
+    node_types = {}
+    connections = set()
+    for node in nodes:
+        node_types[node.split("|")[-1]] = commands.nodeType(node)
+
+        for incoming in (True, False):
+            pairs = commands.listConnections(node, source=incoming, destination=not incoming, connections=True, plugs=True) or []
+            for own, other in zip(pairs[::2], pairs[1::2]):
+                source, destination = (other, own) if incoming else (own, other)
+                connections.add(_split_plug(source) + _split_plug(destination))
+
+    return SceneGraph(node_types, connections, steps)
+
+
+@contextlib.contextmanager
+def track_nodes(commands=None):
+    """
+    Collects the nodes created inside the block. Yields a dict that holds, once the block
+    exits, the new "nodes" and the "steps" that created them, as recorded by the scene
+    query cache. Nodes made outside cmds, like a deformer's helper nodes, are unattributed.
+    """
+    commands = _get_commands(commands)
+
+    tracked = {"nodes": [], "steps": {}}
+    before = set(commands.ls())
+
+    yield tracked
+
+    created = getattr(commands, "created", {})
+    tracked["nodes"] = sorted(set(commands.ls()) - before)
+    tracked["steps"] = {node: created.get(node.split("|")[-1], UNATTRIBUTED) for node in tracked["nodes"]}
+
+
+def strongly_connected(nodes, edges):
+    """Groups nodes that can reach each other, iterative Tarjan. Returns a list of sorted groups."""
+    targets = {node: [] for node in nodes}
+    for source, destination in edges:
+        targets[source].append(destination)
+
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    groups = []
+
+    for root in sorted(nodes):
+        if root in index:
+            continue
+
+        work = [(root, iter(sorted(targets[root])))]
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+
+        while work:
+            node, following = work[-1]
+            advanced = False
+            for target in following:
+                if target not in index:
+                    index[target] = low[target] = len(index)
+                    stack.append(target)
+                    on_stack.add(target)
+                    work.append((target, iter(sorted(targets[target]))))
+                    advanced = True
+                    break
+                if target in on_stack:
+                    low[node] = min(low[node], index[target])
+
+            if advanced:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+
+            if low[node] == index[node]:
+                group = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    group.append(member)
+                    if member == node:
+                        break
+                groups.append(sorted(group))
+
+    return groups
+
+
+def longest_chain(nodes, edges):
+    """
+    The longest dependency chain, as (chain of node groups, node-level loops). Loops are
+    collapsed into one group, a chain's length is the number of nodes in its groups.
+    """
+    groups = strongly_connected(nodes, edges)
+    group_of = {node: number for number, group in enumerate(groups) for node in group}
+
+    following = {number: set() for number in range(len(groups))}
+    incoming = Counter()
+    for source, destination in edges:
+        start, end = group_of[source], group_of[destination]
+        if start != end and end not in following[start]:
+            following[start].add(end)
+            incoming[end] += 1
+
+    # Longest path over the collapsed graph in topological order
+    length = {number: len(group) for number, group in enumerate(groups)}
+    previous = {}
+    ready = sorted(number for number in following if not incoming[number])
+    while ready:
+        number = ready.pop()
+        for end in sorted(following[number]):
+            if length[number] + len(groups[end]) > length[end]:
+                length[end] = length[number] + len(groups[end])
+                previous[end] = number
+            incoming[end] -= 1
+            if not incoming[end]:
+                ready.append(end)
+
+    if not groups:
+        return [], []
+
+    number = max(length, key=lambda key: (length[key], -key))
+    chain = [groups[number]]
+    while number in previous:
+        number = previous[number]
+        chain.append(groups[number])
+
+    return chain[::-1], [group for group in groups if len(group) > 1]
+
+
+def _hot_spots(counts, node_types, count):
+    return [{"node": node, "type": node_types.get(node, "external"), "connections": connections}
+            for node, connections in sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:count]]
+
+
+def analyze(graph, hot_spots=HOT_SPOT_COUNT):
+    """Returns the report for a SceneGraph as a dict, ready for save_report."""
+    nodes = graph.node_types
+    connections = [connection for connection in graph.connections
+                   if connection[1] not in IGNORED_ATTRIBUTES and connection[3] not in IGNORED_ATTRIBUTES]
+
+    fan_in = Counter(destination for _, _, destination, _ in connections if destination in nodes)
+    fan_out = Counter(source for source, _, _, _ in connections if source in nodes)
+
+    edges = {(source, destination) for source, _, destination, _ in connections
+             if source in nodes and destination in nodes and source != destination}
+    chain, loops = longest_chain(nodes, sorted(edges))
+
+    constraints = Counter(node_type for node_type in nodes.values() if node_type.endswith("Constraint"))
+
+    return {
+        "nodes": len(nodes),
+        "connections": len(connections),
+        "node_types": dict(Counter(nodes.values())),
+        "build_steps": dict(Counter(graph.steps.get(node, UNATTRIBUTED) for node in nodes)),
+        "constraints": {"total": sum(constraints.values()), "types": dict(constraints)},
+        "longest_chain": {"length": sum(len(group) for group in chain), "nodes": chain},
+        "loops": loops,
+        "fan_in": _hot_spots(fan_in, nodes, hot_spots),
+        "fan_out": _hot_spots(fan_out, nodes, hot_spots),
+    }
+
+
+def format_report(report):
+    """The report as text, biggest counts first."""
+    lines = [f"Rig graph: {report['nodes']} nodes, {report['connections']} connections, "
+             f"{report['constraints']['total']} constraints, longest chain {report['longest_chain']['length']}"]
+
+    for title, counts in (("node types", report["node_types"]), ("build steps", report["build_steps"])):
+        lines.append(f"  {title}:")
+        for name, count in sorted(counts.items(), key=lambda item: (-item[1], item[0])):
+            lines.append(f"    {name:<45} {count:6d}")
+
+    lines.append("  longest chain:")
+    lines.append("    " + " -> ".join("(" + ", ".join(group) + ")" if len(group) > 1 else group[0]
+                                      for group in report["longest_chain"]["nodes"]))
+
+    for title in ("fan_in", "fan_out"):
+        lines.append(f"  {title.replace('_', ' ')}:")
+        for spot in report[title]:
+            lines.append(f"    {spot['node']:<45} {spot['connections']:6d}  {spot['type']}")
+
+    return "\n".join(lines)
+
+
+def save_report(report, path):
+    with open(path, "w") as handle:
+        json.dump(report, handle, indent=2, sort_keys=True)
+
+
+def load_report(path):
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def check_report(report, limits):
+    """
+    Compares a report against limits such as {"nodes": 400, "longest_chain": 12,
+    "constraints": 60, "fan_in": 8, "fan_out": 20}. Returns what went over, empty if nothing.
+    """
+    values = {
+        "nodes": report["nodes"],
+        "connections": report["connections"],
+        "constraints": report["constraints"]["total"],
+        "longest_chain": report["longest_chain"]["length"],
+        "fan_in": max((spot["connections"] for spot in report["fan_in"]), default=0),
+        "fan_out": max((spot["connections"] for spot in report["fan_out"]), default=0),
+    }
+
+    unknown = set(limits) - set(values)
+    if unknown:
+        raise ValueError(f"Unknown limits: {', '.join(sorted(unknown))}. Choose from {', '.join(values)}")
+
+    return [f"{name} is {values[name]}, over the limit of {limit}" for name, limit in limits.items() if values[name] > limit]
@@ -1,45 +1,163 @@
-import maya.cmds as cmds
-import maya.OpenMaya as om
-import math
+import time
+from collections import Counter
+import numpy as np
+from riggingTools import edgeLoops
+from riggingTools import eyeSolver
+from riggingTools import exprCompiler
+from riggingTools import falloff
+from riggingTools import graphReport
+from riggingTools import rigSession
+from riggingTools import skinIO
+from riggingTools import symmetry
+from riggingTools import transformMath
+from riggingTools.graphBuilder import GraphBuilder
+from riggingTools.sceneCache import build_step
+from riggingTools.sceneCache import cmds
+from riggingTools.weightMatrix import SkinWeights
+
+# The meshes a character provides, by their default names
+GEOMETRY = ("l_eye_geo", "r_eye_geo", "l_pupil_geo", "r_pupil_geo")
+
+# "network" is the original per joint locator network, "shared" the low node count version
+PUPIL_SCALE_MODES = ("network", "shared")
+
+# Names for the compiled eye scale network's nodes, by their planned suffix (see exprCompiler.Network)
+EYE_SCALE_NODE_NAMES = {
+    "pma01": "irisScale_avg",
+    "mdn02": "pupilScale_adjust",
+    "cond03": "irisScale_condition",
+    "pma04": "pupilScale_add",
+    "mdn05": "irisScale_multiply",
+}
+
+# Levels of detail, most expensive first. All of them build the same curves, aim joints,
+# blendshapes and controls, only the joints along the iris and pupil loops change:
+#   full     a joint pair on every loop CV (or joint_count of them), pupil scale network
+#   reduced  8 joint pairs per loop spaced by arc length, no pupil scale joints or network
+#   aim      no loop joints, the whole eye follows the aim joint
+# node_budget is (fixed, per loop joint) for one eye, counted from the nodes build_lod creates
+# with as many pupil loop joints as iris ones:
+#   per loop joint  an aim and a tip joint, an offset and a driver transform and an aimConstraint
+#                   on each loop (10), full adds the pupil tip joint, its aimConstraint and
+#                   pointConstraint (3) and the "network" pupil scale's two locators with their
+#                   shapes, two pointConstraints, a distanceBetween and a multiplyDivide (8)
+#   fixed           a driver group and a curveSampler per loop (4), full adds the network's
+#                   locator group or the shared distanceRatio node (1), and both skin binds
+# "shared" pupil scale builds 8 nodes less per joint than the budget allows.
+# Nodes one skinCluster bind adds: the skinCluster, its bindPose and the mesh's Orig shape, and
+# before Maya 2022 the deformer set, tweak node, tweak set and a groupId and groupParts for each set
+SKIN_BIND_NODES = 10
+
+LODS = {
+    "full": {"curve_joints": True, "joint_count": None, "pupil_scale": True, "node_budget": (5 + 2 * SKIN_BIND_NODES, 21)},
+    "reduced": {"curve_joints": True, "joint_count": 8, "pupil_scale": False, "node_budget": (4 + 2 * SKIN_BIND_NODES, 10)},
+    "aim": {"curve_joints": False, "joint_count": None, "pupil_scale": False, "node_budget": (2 * SKIN_BIND_NODES, 0)},
+}
+
+
+def lod_node_budget(lod, loop_joints):
+    """Most nodes one eye should need at a level of detail with loop_joints joints per loop."""
+    fixed, per_joint = LODS[lod]["node_budget"]
+
+    return fixed + per_joint * loop_joints
+
+
+def build_eye_rigs(characters, session=None, stop_on_error=False, **options):
+    """
+    Builds an eye rig for every character in one session, sharing its caches and one scene
+    query cache. Each character is a dict with a "prefix" ("owlA:" builds into the owlA
+    namespace, "owlA_" prefixes the names), and optionally "geometry" mapping the default
+    mesh names in GEOMETRY to its own, plus any EyeballRig arguments to override options.
+    iris_edges and pupil_edges can be given once in options on the default mesh names,
+    they are moved onto each character's left eye and pupil meshes.
+    A character that fails is recorded in session.failures and the batch goes on,
+    unless stop_on_error is set. Returns the session, its rigs are in session.rigs by prefix.
+    """
+    session = session or rigSession.RigSession()
+
+    prefixes = [character["prefix"] for character in characters]
+    duplicates = sorted({prefix for prefix in prefixes if prefixes.count(prefix) > 1})
+    if duplicates:
+        raise ValueError(f"Each character needs its own prefix, repeated: {', '.join(duplicates)}")
+
+    with cmds.build():
+        for character in characters:
+            arguments = dict(options, **character)
+            prefix = arguments["prefix"]
+            geometry = {name: f"{prefix}{name}" for name in GEOMETRY}
+            geometry.update(arguments.get("geometry") or {})
+
+            for key in ("iris_edges", "pupil_edges"):
+                if key not in character:
+                    arguments[key] = [f"{geometry.get(mesh, mesh)}.{index}" for mesh, _, index in
+                                      (edge.partition(".") for edge in arguments[key])]
+
+            try:
+                session.rigs[prefix] = EyeballRig(**dict(arguments, geometry=geometry, session=session))
+            except Exception as error:
+                if stop_on_error:
+                    raise
+                session.failures[prefix] = error
+                cmds.warning(f"{prefix} eye rig failed: {error}")
+
+    print(session.report())
+
+    return session
+
 
 class EyeballRig:
-    def __init__(self, iris_edges, pupil_edges, r_eye_flag=True):
+    def __init__(self, iris_edges, pupil_edges, r_eye_flag=True, pupil_scale_mode="network", joint_count=None, lod="full",
+                 prefix="", geometry=None, session=None):
+        """
+        prefix goes in front of every node the rig creates or looks up, a prefix ending in ":"
+        builds into that namespace. geometry maps the default mesh names in GEOMETRY to the
+        character's own, and a rigSession.RigSession shares its caches between rigs.
+        """
+        if lod not in LODS:
+            raise ValueError(f"Unknown level of detail: {lod}. Choose from {', '.join(LODS)}")
+
         self.iris_edges = iris_edges
         self.pupil_edges = pupil_edges
-        self.create_eyeball_rig(r_eye_flag)
+        self.pupil_scale_mode = pupil_scale_mode
+        self.pupil_scale_rigs = {}
+        # None puts a joint on every curve CV, a count spaces that many evenly by arc length
+        self.joint_count = joint_count
+        self.lod = lod
+        self.prefix = prefix
+        self.geometry = {name: f"{prefix}{name}" for name in GEOMETRY}
+        self.geometry.update(geometry or {})
+        self.session = session or rigSession.RigSession()
+        self.arc_lengths = self.session.arc_lengths
+        self.symmetry_maps = self.session.symmetry_maps
+        self.sides = {}
+        self.lod_rigs = {}
+        self.eye_joints = {}
+        self.skin_inputs = {}
+        # Target side to the mirror_eye_skin arguments that last skinned it
+        self.mirror_inputs = {}
+
+        # Repeated queries during the build are served from the scene query cache
+        with graphReport.track_nodes() as self.built, cmds.build():
+            self.create_eyeball_rig(r_eye_flag)
 
     def create_eyeball_rig(self, right_eye_flag):
-        self.create_rig_groups()
-
         if right_eye_flag:
             sides = ["l", "r"]
         else:
             sides = ["l"]
 
-        for side in sides:
-            eye_joints = []
-
-            selected_iris_edges = []
-            selected_pupil_edges = []
-            selected_iris_skin_edges = []
-            selected_pupil_skin_edges = []
+        # Stop on a broken iris or pupil selection before anything is built
+        self.check_edge_loops(sides)
 
-            rig_grp = cmds.group(empty=True, n=f"{side}_eyeRig_grp")
+        self.create_rig_groups()
 
-            if side == "r":
-                for iris_main, pupil_main in zip(self.iris_edges, self.pupil_edges):
-                    r_iris_main = iris_main.replace("l_", "r_")
-                    r_pupil_main = pupil_main.replace("l_", "r_")
-                    selected_iris_edges.append(r_iris_main)
-                    selected_pupil_edges.append(r_pupil_main)
+        for side in sides:
+            selected_iris_edges, selected_pupil_edges = self.get_side_edges(side)
 
-            elif side == "l":
-                for iris_main, pupil_main in zip(self.iris_edges, self.pupil_edges):
-                    selected_iris_edges.append(iris_main)
-                    selected_pupil_edges.append(pupil_main)
+            rig_grp = cmds.group(empty=True, n=f"{self.prefix}{side}_eyeRig_grp")
 
             iris_crv, pupil_crv = self.create_iris_and_pupil_curves(side, selected_iris_edges, selected_pupil_edges)
-            center_loc, pupil_loc = self.find_aim_of_the_pupil(side, f"{side}_eye_geo", pupil_crv)
+            center_loc, pupil_loc = self.find_aim_of_the_pupil(side, self.geometry[f"{side}_eye_geo"], pupil_crv)
 
             if side == "l":
                 self.create_eyeball_joints(center_loc, jnt_parent=self.skel_grp)
@@ -49,35 +167,12 @@ class EyeballRig:
 
             aim_jnt, pupil_jnt = self.create_eye_aim_joints(side, pupil_loc, center_loc, eye_jnt)
 
-            curves = [iris_crv, pupil_crv]
-            names = ["iris", "pupil"]
-
             up_obj = self.create_up_locator(side, aim_jnt, iris_crv, rig_grp)
 
-            iris_cv_aim_joints, iris_cv_tip_joints = self.create_joints_for_each_cv_on_curves(side, iris_crv, eye_jnt)
-            iris_cv_offsets, iris_cv_offset_drivers = self.create_drivers_for_each_cv_on_curves(side, iris_crv, "iris", rig_grp)
-
-            pupil_cv_aim_joints, pupil_cv_tip_joints = self.create_joints_for_each_cv_on_curves(side, pupil_crv, eye_jnt)
-            pupil_cv_offsets, pupil_cv_offset_drivers = self.create_drivers_for_each_cv_on_curves(side, pupil_crv, "pupil", rig_grp)
-
-            self.aim_cv_joints_to_cv_drivers(iris_cv_offset_drivers, iris_cv_aim_joints, iris_cv_tip_joints, up_obj, aim_jnt)
-            self.aim_cv_joints_to_cv_drivers(pupil_cv_offset_drivers, pupil_cv_aim_joints, pupil_cv_tip_joints, up_obj, aim_jnt)
-
-            eye_joints.extend(iris_cv_aim_joints + iris_cv_tip_joints + pupil_cv_aim_joints)
-            eye_joints.append(eye_jnt)
-            eye_joints.append(aim_jnt)
-
-            iris_tips = iris_cv_tip_joints
-            pupil_tips = pupil_cv_tip_joints
-            pupil_drivers = pupil_cv_offset_drivers
-            iris_drivers = iris_cv_offset_drivers
-            crv = pupil_crv
-
-            pupil_scale_jnts, pupil_tip_jnts = self.create_pupil_scale(side, iris_tips, pupil_tips, pupil_drivers, iris_drivers, pupil_cv_aim_joints, up_obj, crv)
-
-            eye_joints.extend(pupil_scale_jnts + pupil_tip_jnts)
-
-            skin_cluster = self.bind_eye_geo_to_create_skin_cluster(side, eye_joints, pupil_jnt, f"{side}_eye_geo", f"{side}_pupil_geo")
+            # Everything the level of detail builds hangs off these, so an LOD switch can rebuild it alone
+            self.sides[side] = {"iris_crv": iris_crv, "pupil_crv": pupil_crv, "eye_jnt": eye_jnt, "aim_jnt": aim_jnt,
+                                "pupil_jnt": pupil_jnt, "up_obj": up_obj, "rig_grp": rig_grp}
+            self.build_lod(side, self.lod)
 
             self.create_blendshapes(side, pupil_crv)
             self.create_controls(side, iris_crv, pupil_crv, aim_jnt, up_obj, pupil_jnt)
@@ -96,69 +191,248 @@ class EyeballRig:
         cmds.parent(self.skel_grp, self.eye_grp)
         cmds.setAttr(f"{self.skel_grp}.visibility", 0)
 
-    def create_rig_groups(self):
-        self.eye_grp = cmds.group(empty=True, n="eye_grp")
-        self.eye_rig_grp = cmds.group(empty=True, n="rig_grp")
-        self.geo_grp = cmds.group(empty=True, n="geo_grp")
-        self.skel_grp = cmds.group(empty=True, n="skel_grp")
+    @build_step
+    def build_lod(self, side, lod):
+        """
+        Builds the loop joints, drivers and pupil scale a level of detail asks for, then binds the
+        eye to them. Records what was created so set_lod can take it out again.
+        """
+        spec = LODS[lod]
+        rig = self.sides[side]
+        existing_nodes = set(cmds.ls())
 
-        cmds.parent("r_eye_geo", self.geo_grp)
-        cmds.parent("l_eye_geo", self.geo_grp)
-        cmds.parent("r_pupil_geo", self.geo_grp)
-        cmds.parent("l_pupil_geo", self.geo_grp)
+        eye_joints = []
+        skin_joints = {"iris": [], "pupil": []}
 
-    def create_iris_and_pupil_curves(self, side, iris_edges, pupil_edges):
-        iris_crv = self.create_curve_from_edge(side, "iris", iris_edges)
+        if spec["curve_joints"]:
+            joint_count = spec["joint_count"] or self.joint_count
+            iris_crv, pupil_crv, eye_jnt, up_obj = rig["iris_crv"], rig["pupil_crv"], rig["eye_jnt"], rig["up_obj"]
 
-        cmds.select(clear=True)
-        cmds.select(iris_crv)
-        cmds.CenterPivot(iris_crv)
-        cmds.select(clear=True)
+            iris_cv_aim_joints, iris_cv_tip_joints = self.create_joints_for_each_cv_on_curves(side, iris_crv, eye_jnt, joint_count)
+            iris_cv_offsets, iris_cv_offset_drivers = self.create_drivers_for_each_cv_on_curves(side, iris_crv, "iris", rig["rig_grp"], joint_count)
+
+            pupil_cv_aim_joints, pupil_cv_tip_joints = self.create_joints_for_each_cv_on_curves(side, pupil_crv, eye_jnt, joint_count)
+            pupil_cv_offsets, pupil_cv_offset_drivers = self.create_drivers_for_each_cv_on_curves(side, pupil_crv, "pupil", rig["rig_grp"], joint_count)
+
+            self.aim_cv_joints_to_cv_drivers(iris_cv_offset_drivers, iris_cv_aim_joints, iris_cv_tip_joints, up_obj, rig["aim_jnt"])
+            self.aim_cv_joints_to_cv_drivers(pupil_cv_offset_drivers, pupil_cv_aim_joints, pupil_cv_tip_joints, up_obj, rig["aim_jnt"])
+
+            eye_joints.extend(iris_cv_aim_joints + iris_cv_tip_joints + pupil_cv_aim_joints)
+            eye_joints.append(eye_jnt)
+            eye_joints.append(rig["aim_jnt"])
+
+            if spec["pupil_scale"]:
+                pupil_scale_jnts, pupil_tip_jnts = self.create_pupil_scale(side, iris_cv_tip_joints, pupil_cv_tip_joints, pupil_cv_offset_drivers,
+                                                                           iris_cv_offset_drivers, pupil_cv_aim_joints, up_obj, pupil_crv)
+                eye_joints.extend(pupil_scale_jnts + pupil_tip_jnts)
+                skin_joints = {"iris": iris_cv_tip_joints, "pupil": pupil_scale_jnts}
+            else:
+                # Without pupil scale joints the pupil follows the loop's own tip joints
+                eye_joints.extend(pupil_cv_tip_joints)
+                skin_joints = {"iris": iris_cv_tip_joints, "pupil": pupil_cv_tip_joints}
+        else:
+            eye_joints.extend([rig["eye_jnt"], rig["aim_jnt"]])
+
+        self.bind_eye_geo_to_create_skin_cluster(side, eye_joints, rig["pupil_jnt"],
+                                                 self.geometry[f"{side}_eye_geo"], self.geometry[f"{side}_pupil_geo"])
+
+        nodes = [node for node in cmds.ls() if node not in existing_nodes]
+        self.lod_rigs[side] = {"lod": lod, "nodes": nodes}
+        self.eye_joints[side] = skin_joints
+
+        budget = lod_node_budget(lod, len(skin_joints["iris"]))
+        if len(nodes) > budget:
+            cmds.warning(f"{side} eye at {lod} detail uses {len(nodes)} nodes, over its budget of {budget}.")
+
+    def remove_lod(self, side):
+        """Deletes the joints, drivers, pupil scale and skin clusters build_lod made for a side."""
+        nodes = self.lod_rigs.pop(side, {}).get("nodes", [])
+
+        # Unbinding first hands the meshes back their original shapes
+        for skin_cluster in cmds.ls(nodes, type="skinCluster"):
+            cmds.skinCluster(skin_cluster, edit=True, unbind=True)
+
+        for node in nodes:
+            # Deleting a parent or a deformer takes some of the others with it
+            if cmds.objExists(node):
+                cmds.delete(node)
+
+        self.pupil_scale_rigs.pop(side, None)
+        self.eye_joints.pop(side, None)
+
+    def set_lod(self, lod, sides=None):
+        """
+        Switches built eyes to another level of detail without touching their curves, aim joints,
+        blendshapes or controls. The loop joints and skin clusters are rebuilt, and eyes that were
+        skinned or mirrored before are skinned or mirrored again with the same faces and settings.
+        """
+        if lod not in LODS:
+            raise ValueError(f"Unknown level of detail: {lod}. Choose from {', '.join(LODS)}")
 
-        pupil_crv = self.create_curve_from_edge(side, "pupil", pupil_edges)
+        sides = sides or list(self.sides)
+
+        with graphReport.track_nodes() as rebuilt, cmds.build():
+            for side in sides:
+                self.remove_lod(side)
+                self.build_lod(side, lod)
+
+            eyes = [dict(self.skin_inputs[side], side=side, iris_joints=self.eye_joints[side]["iris"], pupil_joints=self.eye_joints[side]["pupil"])
+                    for side in sides if side in self.skin_inputs]
+            if eyes:
+                self.skin_eyes(eyes)
+
+            # Mirrored eyes take their weights from the source eye again, once it is skinned
+            for side in sides:
+                if side in self.mirror_inputs:
+                    self.mirror_eye_skin(target_side=side, **self.mirror_inputs[side])
+
+        if set(sides) == set(self.sides):
+            self.lod = lod
+
+        self.built["nodes"] = sorted(set(self.built["nodes"]) | set(rebuilt["nodes"]))
+        self.built["steps"].update(rebuilt["steps"])
+
+    def graph_report(self):
+        """Static analysis of the nodes the rig is made of, see graphReport.analyze."""
+        nodes = [node for node in self.built["nodes"] if cmds.objExists(node)]
+
+        return graphReport.analyze(graphReport.read_graph(nodes, self.built["steps"]))
+
+    def node_counts(self):
+        """Nodes built for each side's level of detail, as {side: (lod, node count, budget)}."""
+        return {side: (lod_rig["lod"], len(lod_rig["nodes"]), lod_node_budget(lod_rig["lod"], len(self.eye_joints[side]["iris"])))
+                for side, lod_rig in self.lod_rigs.items()}
+
+    @build_step
+    def create_rig_groups(self):
+        self.create_namespace()
+
+        self.eye_grp = cmds.group(empty=True, n=f"{self.prefix}eye_grp")
+        self.eye_rig_grp = cmds.group(empty=True, n=f"{self.prefix}rig_grp")
+        self.geo_grp = cmds.group(empty=True, n=f"{self.prefix}geo_grp")
+        self.skel_grp = cmds.group(empty=True, n=f"{self.prefix}skel_grp")
+
+        for name in GEOMETRY:
+            cmds.parent(self.geometry[name], self.geo_grp)
+
+    def create_namespace(self):
+        """Adds the namespace a prefix like "owlA:" asks for, and any parent namespaces it is nested in."""
+        parent = ":"
+        for name in self.prefix.split(":")[:-1]:
+            if not cmds.namespace(exists=f"{parent}{name}"):
+                cmds.namespace(add=name, parent=parent)
+            parent = f"{parent}{name}:"
+
+    def get_side_edges(self, side):
+        """The iris and pupil edges for a side, the right side's are the left edges on the right mesh."""
+        if side == "r":
+            return self.mirror_components(self.iris_edges), self.mirror_components(self.pupil_edges)
+
+        return list(self.iris_edges), list(self.pupil_edges)
+
+    def mirror_components(self, components, source_side="l", target_side="r"):
+        """Moves components from the source side's eye or pupil mesh to the target side's."""
+        meshes = {self.geometry[f"{source_side}_{part}_geo"]: self.geometry[f"{target_side}_{part}_geo"] for part in ("eye", "pupil")}
+
+        mirrored = []
+        for component in components:
+            mesh, _, index = component.partition(".")
+            mirrored.append(f"{meshes.get(mesh, mesh)}.{index}")
+
+        return mirrored
+
+    def base_name(self, node):
+        """A rig node's name without the character prefix."""
+        return node[len(self.prefix):] if node.startswith(self.prefix) else node
+
+    def check_edge_loops(self, sides):
+        """Raises BrokenLoopError naming every iris or pupil selection that isn't a single closed loop."""
+        names = []
+        edge_lists = []
+        for side in sides:
+            for name, edges in zip(["iris", "pupil"], self.get_side_edges(side)):
+                names.append(f"{self.prefix}{side}_{name}")
+                edge_lists.append(edges)
+
+        problems = []
+        for name, (_, edge_vertices) in zip(names, edgeLoops.read_edge_loops(edge_lists)):
+            issues = edgeLoops.loop_problems(edge_vertices)
+            if not issues and not edgeLoops.order_edge_loop(edge_vertices)[1]:
+                issues = ["the edges don't close into a loop"]
+            if issues:
+                problems.append(f"{name} edges: {', '.join(issues)}")
+
+        if problems:
+            raise edgeLoops.BrokenLoopError("; ".join(problems))
+
+    @build_step
+    def create_iris_and_pupil_curves(self, side, iris_edges, pupil_edges):
+        # Built straight from the ordered edge loops, the selection is never touched
+        iris_crv, pupil_crv = self.create_curves_from_edges(side, ["iris", "pupil"], [iris_edges, pupil_edges])
+
+        cmds.xform(iris_crv, centerPivots=True)
 
         return iris_crv, pupil_crv
 
+    def create_curves_from_edges(self, side, names, edge_lists):
+        curve_names = [f"{self.prefix}{side}_{name}_crv" for name in names]
+
+        return edgeLoops.create_curves_from_edges(edge_lists, curve_names, closed=True)
 
     def create_curve_from_edge(self, side, name, edges):
-        cmds.select(clear=True)
-        cmds.select(edges)
-        
-        curve_name = f"{side}_{name}_crv"
-        curve_from_edge = cmds.polyToCurve(form=1, degree=1, conformToSmoothMeshPreview=0, ch=0)[0]
-        curve_from_edge = cmds.rename(curve_from_edge, curve_name)
+        return self.create_curves_from_edges(side, [name], [edges])[0]
+
+    def get_constraint_matrix(self, node):
+        """World matrix of a node with the translation moved to its rotate pivot, the point a constraint follows."""
+        # Accept the [transform, history node] lists returned by commands like rebuildCurve
+        if isinstance(node, (list, tuple)):
+            node = node[0]
+
+        matrix = np.array(cmds.xform(node, query=True, matrix=True, worldSpace=True), dtype=float).reshape(4, 4)
+        matrix[3, :3] = cmds.xform(node, query=True, rotatePivot=True, worldSpace=True)
+
+        return matrix
 
-        return curve_from_edge
+    def set_world_matrix(self, node, matrix):
+        """Places a node with a single xform."""
+        cmds.xform(node, matrix=np.asarray(matrix, dtype=float).ravel().tolist(), worldSpace=True)
 
+    def match_transform(self, node, target):
+        """Moves node onto target's pivot and rotation, like a parent constraint without offset."""
+        self.set_world_matrix(node, transformMath.parent_matrices(self.get_constraint_matrix(target)))
+
+    @build_step
     def find_aim_of_the_pupil(self, side, eyeball_geo, pupil_crv):
         # Returns a group based on the eyeball geometry and pupil vertex to position the master controls
         # Find aim of pupil using the eyeball geometry and the vertex
 
-        aim_center_loc = cmds.spaceLocator(name=f"{side}_eyeAim_loc")[0]
-        cmds.delete(cmds.parentConstraint(eyeball_geo, aim_center_loc, mo=False))
-
-        pupil_center_loc = cmds.spaceLocator(name=f"{side}_eyePupil_loc")[0]
+        aim_center_loc = cmds.spaceLocator(name=f"{self.prefix}{side}_eyeAim_loc")[0]
+        pupil_center_loc = cmds.spaceLocator(name=f"{self.prefix}{side}_eyePupil_loc")[0]
 
         cmds.select(clear=True)
         cmds.select(pupil_crv)
         cmds.CenterPivot(pupil_crv)
         cmds.select(clear=True)
 
+        # Solved directly rather than through throwaway parent and aim constraints
+        eyeball_matrix = self.get_constraint_matrix(eyeball_geo)
+        pupil_matrix = transformMath.parent_matrices(self.get_constraint_matrix(pupil_crv))
 
-        cmds.delete(cmds.parentConstraint(pupil_crv, pupil_center_loc, mo=False))
-
-        cmds.delete(cmds.aimConstraint(pupil_center_loc, aim_center_loc, aimVector=[0, 0, 1], upVector=[0, 1, 0]))
+        self.set_world_matrix(pupil_center_loc, pupil_matrix)
+        self.set_world_matrix(aim_center_loc, transformMath.aim_matrices(eyeball_matrix[3, :3], pupil_matrix[3, :3]))
 
         return aim_center_loc, pupil_center_loc
 
 
+    @build_step
     def create_eyeball_joints(self, center_loc, jnt_parent=None):
         # Create left and right eye/eyelid joints
         cmds.select(clear=True)
         
-        self.l_eye_jnt = cmds.joint(name=f"l_eye_jnt")
-        cmds.delete(cmds.parentConstraint(center_loc, self.l_eye_jnt, mo=False))
-        self.r_eye_jnt = cmds.mirrorJoint(self.l_eye_jnt, mirrorYZ=True, mirrorBehavior=True, searchReplace=("l_", "r_"))[0]
+        self.l_eye_jnt = cmds.joint(name=f"{self.prefix}l_eye_jnt")
+        self.match_transform(self.l_eye_jnt, center_loc)
+        self.r_eye_jnt = cmds.mirrorJoint(self.l_eye_jnt, mirrorYZ=True, mirrorBehavior=True,
+                                          searchReplace=(f"{self.prefix}l_", f"{self.prefix}r_"))[0]
 
         # Apply transformations for the left eye joint
         cmds.makeIdentity(self.l_eye_jnt, apply=True, translate=True, rotate=True, scale=True)
@@ -170,27 +444,30 @@ class EyeballRig:
                 cmds.parent(jnt, jnt_parent)
 
 
+    @build_step
     def create_eye_aim_joints(self, side, pupil_loc, eye_control, eyeball_jnt):
         # Creates right and left side separately, right side is NOT a mirror of left. Point constraints not parent constraints.
         # Creates joint at center of eye and joint at pupil position
         # These joints are used to create the eye aim
 
         cmds.select(clear=True)
-        aim_jnt = cmds.joint(name=f"{side}_eyeAim_jnt")
+        aim_jnt = cmds.joint(name=f"{self.prefix}{side}_eyeAim_jnt")
         
         cmds.select(clear=True)
-        pupil_jnt = cmds.joint(name=f"{side}_eyePupil_jnt")
+        pupil_jnt = cmds.joint(name=f"{self.prefix}{side}_eyePupil_jnt")
         cmds.select(clear=True)
-        pupil_end_jnt = cmds.joint(name=f"{side}_eyePupilEnd_jnt")
+        pupil_end_jnt = cmds.joint(name=f"{self.prefix}{side}_eyePupilEnd_jnt")
 
         self.label_joint(side, aim_jnt)
         self.label_joint(side, pupil_jnt)
         self.label_joint(side, pupil_end_jnt)
 
-        cmds.delete(cmds.pointConstraint(eyeball_jnt, aim_jnt, mo=False))
-        cmds.delete(cmds.parentConstraint(eyeball_jnt, pupil_jnt, mo=False))
-        cmds.delete(cmds.parentConstraint(pupil_loc, pupil_end_jnt, mo=False))
-        cmds.delete(cmds.aimConstraint(pupil_end_jnt, pupil_jnt, aimVector=[0, 0, 1], upVector=[0, 1, 0]))
+        eyeball_position = self.get_constraint_matrix(eyeball_jnt)[3, :3]
+        pupil_matrix = transformMath.parent_matrices(self.get_constraint_matrix(pupil_loc))
+
+        cmds.xform(aim_jnt, translation=eyeball_position.tolist(), worldSpace=True)
+        self.set_world_matrix(pupil_end_jnt, pupil_matrix)
+        self.set_world_matrix(pupil_jnt, transformMath.aim_matrices(eyeball_position, pupil_matrix[3, :3]))
 
         eyeball_jnt_name = self.isolate_name(eyeball_jnt)
         cmds.parent(pupil_end_jnt, pupil_jnt)
@@ -199,12 +476,28 @@ class EyeballRig:
 
         return aim_jnt, pupil_jnt
 
-    def create_joints_for_each_cv_on_curves(self, side, crv, eye_jnt):
+    def get_curve_samples(self, crv, joint_count=None):
+        """
+        (parameters, world positions) of the joints along a curve: one per CV, or joint_count
+        spaced evenly by arc length from the curve's cached lookup table.
+        """
+        if joint_count:
+            return self.arc_lengths.get(crv).even_samples(joint_count)
+
+        cvs = cmds.ls(f"{crv}.cv[*]", flatten=True)
+        positions = np.array(cmds.xform(cvs, query=True, translation=True, worldSpace=True), dtype=float).reshape(-1, 3)
+
+        return np.arange(len(cvs), dtype=float), positions
+
+    @build_step
+    def create_joints_for_each_cv_on_curves(self, side, crv, eye_jnt, joint_count=None):
         cv_aim_joints = []
         cv_tip_joints = []
         
-        cvs = cmds.ls(f"{crv}.cv[*]", flatten=True)
-        for i in range(len(cvs)):
+        eye_matrix = transformMath.parent_matrices(self.get_constraint_matrix(eye_jnt))
+
+        _, positions = self.get_curve_samples(crv, joint_count)
+        for i, position in enumerate(positions.tolist()):
             index_str = str(i).zfill(2)
         
             # Create joint to sit in center of eyeball
@@ -216,9 +509,8 @@ class EyeballRig:
             jnt_tip = cmds.joint(name=crv.replace("_crv", f"Tip{index_str}_jnt"))
         
             # Position joints
-            cmds.delete(cmds.parentConstraint(eye_jnt, jnt, mo=False))
-            cv_pos = cmds.xform(cvs[i], query=True, translation=True, worldSpace=True)
-            cmds.xform(jnt_tip, translation=cv_pos, worldSpace=True)
+            self.set_world_matrix(jnt, eye_matrix)
+            cmds.xform(jnt_tip, translation=position, worldSpace=True)
         
             cv_tip_joints.append(jnt_tip)
             cv_aim_joints.append(jnt)
@@ -226,49 +518,60 @@ class EyeballRig:
 
         return cv_aim_joints, cv_tip_joints
 
-    def create_drivers_for_each_cv_on_curves(self, side, crv, name, parent_grp):
+    @build_step
+    def create_drivers_for_each_cv_on_curves(self, side, crv, name, parent_grp, joint_count=None):
+        """
+        Creates an offset group and driver per CV, slid along the curve by one curveSampler node
+        for the whole loop. Every node, parent, setAttr and connection goes through one GraphBuilder commit.
+        """
+        # Imported here, the node module needs the real Maya API
+        from riggingTools import curveSamplerNode
+
+        curveSamplerNode.load_plugin()
+
         cv_offsets = []
         cv_offsets_drivers = []
 
-        grp_name = f"{side}_{name}Driver_grp"
+        grp_name = f"{self.prefix}{side}_{name}Driver_grp"
 
-        driver_grp = cmds.group(empty=True, name=grp_name)
+        crv_shape = cmds.listRelatives(crv, children=True, shapes=True)[0]
+        parameters, _ = self.get_curve_samples(crv, joint_count)
 
-        cvs = cmds.ls(f"{crv}.cv[*]", flatten=True)
-        for i in range(len(cvs)):
-            cmds.select(clear=True)
+        graph = GraphBuilder()
+        driver_grp = graph.create_node("transform", grp_name, parent=parent_grp)
+
+        sampler = graph.create_node(curveSamplerNode.TYPE_NAME, crv.replace("_crv", "_sampler"))
+        graph.connect(crv_shape, "worldSpace[0]", sampler, "inputCurve")
+
+        for i, parameter in enumerate(parameters.tolist()):
             index_str = str(i).zfill(2)
 
             control_name = crv.replace("_crv", f"{index_str}Drv_grp")
 
-            cv_offset  = cmds.group(empty=True, name=control_name)
-            cmds.select(clear=True)
-            cv_offset_drv  = cmds.group(empty=True, name=control_name.replace("Drv_grp", "_drv"))
-            cmds.select(clear=True)
-            cmds.parent(cv_offset_drv, cv_offset)
-            cmds.parent(cv_offset, driver_grp)
+            cv_offset = graph.create_node("transform", control_name, parent=driver_grp)
+            cv_offset_drv = graph.create_node("transform", control_name.replace("Drv_grp", "_drv"), parent=cv_offset)
 
             cv_offsets.append(cv_offset)
             cv_offsets_drivers.append(cv_offset_drv)
 
-            point_on_crv = cmds.createNode("pointOnCurveInfo", name=crv.replace("_crv", f"{index_str}_pci"))
-            crv_shape = cmds.listRelatives(crv, children=True, shapes=True)[0]
-            cmds.connectAttr(f"{crv_shape}.worldSpace[0]", f"{point_on_crv}.inputCurve")
-            cmds.setAttr(f"{point_on_crv}.parameter", i)
-            cmds.connectAttr(f"{point_on_crv}.position", f"{cv_offset}.t")
-
-        cmds.parent(driver_grp, parent_grp)
-
-        return cv_offsets, cv_offsets_drivers
+            graph.set_attr(sampler, f"parameter[{i}]", parameter)
+            graph.connect(sampler, f"position[{i}]", cv_offset, "translate")
 
+        graph.commit()
 
+        return [str(cv_offset) for cv_offset in cv_offsets], [str(cv_offset_drv) for cv_offset_drv in cv_offsets_drivers]
 
+    @build_step
     def aim_cv_joints_to_cv_drivers(self, cv_drivers, cv_aim_joints, cv_tip_joints, up_loc, eye_aim_jnt):
-        # parent constrains the tip cv joint to the cv offset and deletes it
-
-        for cv_drv, cv_aim_jnt, cv_tip_jnt in zip(cv_drivers, cv_aim_joints, cv_tip_joints):
-            cmds.delete(cmds.pointConstraint(cv_drv, cv_tip_jnt, mo=False))
-            cmds.delete(cmds.aimConstraint(cv_drv, cv_aim_jnt, aimVector=[0,0,1], upVector=[0,1,0], worldUpType="object", wuo=f"{up_loc}", mo=False))
+        # Places the tip cv joint on the cv offset and aims the cv joint at it.
+        # Solve every tip position and aim at once instead of a throwaway constraint pair per CV
+        driver_positions = skinIO.get_positions(cv_drivers)
+        aim_matrices = transformMath.aim_matrices(skinIO.get_positions(cv_aim_joints), driver_positions, world_up_type="object",
+                                                  world_up_matrix=self.get_constraint_matrix(up_loc))
+
+        for cv_drv, cv_aim_jnt, cv_tip_jnt, driver_position, aim_matrix in zip(cv_drivers, cv_aim_joints, cv_tip_joints, driver_positions, aim_matrices):
+            cmds.xform(cv_tip_jnt, translation=driver_position.tolist(), worldSpace=True)
+            self.set_world_matrix(cv_aim_jnt, aim_matrix)
             
             # Freeze the transformations so there are zero rotations on the joint
             cmds.makeIdentity(cv_aim_jnt, apply=True, translate=True, rotate=True, scale=True)
@@ -288,14 +591,11 @@ class EyeballRig:
             cmds.parent(cv_aim_jnt, eye_aim_jnt)
 
 
+    @build_step
     def create_pupil_scale(self, side, iris_tips, pupil_tips, pupil_drivers, iris_drivers, pupil_aim_joints, up_loc, crv):
         pupil_scale_jnts = []
         pupil_tip_jnts = []
 
-        rig_grp = f"{side}_eyeRig_grp"
-
-        distance_loc_grp = cmds.group(empty=True, n=f"{side}_pupilScaleLoc_grp")
-
         # Loop through iris and pupil tips
         for index, (iris_jnt, pupil_jnt, pupil_drv, iris_drv, pupil_aim) in enumerate(zip(iris_tips, pupil_tips, pupil_drivers, iris_drivers, pupil_aim_joints)):
             pupil_jnt = cmds.rename(pupil_jnt, pupil_jnt.replace("Tip", "Scale"))
@@ -306,14 +606,66 @@ class EyeballRig:
             cmds.parent(pupil_tip, world=True)
             pupil_tip_jnts.append(pupil_tip)
 
-            # Aim constrain pupil joints to the duplicated iris joints
-            cmds.delete(cmds.aimConstraint(iris_jnt, pupil_jnt, aimVector=(0, 1, 0), upVector=(0, 0, 1), worldUpType="vector", worldUpVector=(0, 0, 1)))
+            # Aim pupil joints at the duplicated iris joints
+            pupil_position, iris_position = skinIO.get_positions([pupil_jnt, iris_jnt])
+            self.set_world_matrix(pupil_jnt, transformMath.aim_matrices(pupil_position, iris_position, aim_vector=(0, 1, 0), up_vector=(0, 0, 1),
+                                                                        world_up_vector=(0, 0, 1)))
             cmds.makeIdentity(pupil_jnt, apply=True, translate=True, rotate=True, scale=True)
             cmds.aimConstraint(iris_jnt, pupil_jnt, aimVector=(0, 1, 0), upVector=(0, 0, 1), worldUpType="vector", worldUpVector=(0, 0, 1))
             
             # Parent the duplicated iris joint to the corresponding pupil joint
             cmds.parent(pupil_tip, pupil_jnt)
-            
+
+        self.pupil_scale_rigs[side] = {"joints": pupil_scale_jnts, "iris_tips": list(iris_tips), "drivers": list(pupil_drivers), "mode": None, "nodes": []}
+        self.build_pupil_scale_network(side, self.pupil_scale_mode)
+
+        for pupil_jnt, pupil_drv in zip(pupil_scale_jnts, pupil_drivers):
+            driver_name = self.isolate_name(pupil_drv)
+
+            cmds.pointConstraint(driver_name, pupil_jnt, mo=True)
+
+        return pupil_scale_jnts, pupil_tip_jnts
+
+    def build_pupil_scale_network(self, side, mode):
+        """
+        Drives every pupil joint's scaleY by its iris to pupil distance over the rest distance.
+        "network" builds two locators, two point constraints, a distanceBetween and a multiplyDivide per joint.
+        "shared" builds a single distanceRatio node that reads every pair's world matrices
+        and outputs all the ratios (see distanceRatioNode).
+        """
+        if mode not in PUPIL_SCALE_MODES:
+            raise ValueError(f"Unknown pupil scale mode: {mode}. Choose from {', '.join(PUPIL_SCALE_MODES)}")
+
+        pupil_rig = self.pupil_scale_rigs[side]
+        existing_nodes = set(cmds.ls())
+
+        if mode == "network":
+            self.create_pupil_scale_locator_network(side, pupil_rig["joints"], pupil_rig["iris_tips"], pupil_rig["drivers"])
+        else:
+            self.create_pupil_scale_shared_network(side, pupil_rig["joints"], pupil_rig["iris_tips"], pupil_rig["drivers"])
+
+        pupil_rig["mode"] = mode
+        pupil_rig["nodes"] = [node for node in cmds.ls() if node not in existing_nodes]
+
+    def remove_pupil_scale_network(self, side):
+        """Deletes the nodes of the current pupil scale network and resets the joints' scaleY."""
+        pupil_rig = self.pupil_scale_rigs[side]
+
+        nodes = [node for node in pupil_rig["nodes"] if cmds.objExists(node)]
+        if nodes:
+            cmds.delete(nodes)
+        for pupil_jnt in pupil_rig["joints"]:
+            cmds.setAttr(f"{pupil_jnt}.scaleY", 1)
+
+        pupil_rig["mode"] = None
+        pupil_rig["nodes"] = []
+
+    def create_pupil_scale_locator_network(self, side, pupil_scale_jnts, iris_tips, pupil_drivers):
+        rig_grp = f"{self.prefix}{side}_eyeRig_grp"
+
+        distance_loc_grp = cmds.group(empty=True, n=f"{self.prefix}{side}_pupilScaleLoc_grp")
+
+        for iris_jnt, pupil_jnt, pupil_drv in zip(iris_tips, pupil_scale_jnts, pupil_drivers):
             # Create locators to represent the world space position of the iris and pupil joints
             iris_loc = cmds.spaceLocator(name=f"{iris_jnt}_loc")[0]
             pupil_loc = cmds.spaceLocator(name=f"{pupil_jnt}_loc")[0]
@@ -346,18 +698,74 @@ class EyeballRig:
             
             # Connect the output of the multiplyDivide node to the scaleY of the pupil joint
             cmds.connectAttr(f"{mult_div_node}.outputX", f"{pupil_jnt}.scaleY")
-            
-            driver_name = self.isolate_name(pupil_drv)
-
-            cmds.pointConstraint(driver_name, pupil_jnt, mo=True)
 
             cmds.parent(iris_loc, distance_loc_grp)
             cmds.parent(pupil_loc, distance_loc_grp)
 
         cmds.parent(distance_loc_grp, rig_grp)
 
-        return pupil_scale_jnts, pupil_tip_jnts
-        
+    def create_pupil_scale_shared_network(self, side, pupil_scale_jnts, iris_tips, pupil_drivers):
+        from riggingTools import distanceRatioNode
+
+        distanceRatioNode.load_plugin()
+
+        # One distanceRatio node reads every joint pair's world matrices and outputs all the ratios,
+        # the node count stays the same whatever the number of joints
+        pupil_drivers = [self.isolate_name(pupil_drv) for pupil_drv in pupil_drivers]
+        rest_distances = np.linalg.norm(skinIO.get_positions(iris_tips) - skinIO.get_positions(pupil_drivers), axis=1)
+
+        ratio_node = cmds.createNode(distanceRatioNode.TYPE_NAME, name=f"{self.prefix}{side}_pupilScale_ratio")
+        for index, (iris_jnt, pupil_jnt, pupil_drv, rest_distance) in enumerate(zip(iris_tips, pupil_scale_jnts, pupil_drivers, rest_distances)):
+            cmds.connectAttr(f"{iris_jnt}.worldMatrix[0]", f"{ratio_node}.firstMatrix[{index}]")
+            cmds.connectAttr(f"{pupil_drv}.worldMatrix[0]", f"{ratio_node}.secondMatrix[{index}]")
+            cmds.setAttr(f"{ratio_node}.restDistance[{index}]", rest_distance)
+            cmds.connectAttr(f"{ratio_node}.ratio[{index}]", f"{pupil_jnt}.scaleY")
+
+    def pupil_scale_report(self, side, samples=50):
+        """
+        Node count by type for the current pupil scale network, and the average time to
+        re-evaluate every pupil joint's scale after the pupil control changes.
+        """
+        pupil_rig = self.pupil_scale_rigs[side]
+        node_types = Counter(cmds.nodeType(node) for node in pupil_rig["nodes"])
+
+        pupil_ctrl = f"{self.prefix}{side}_pupil_ctrl"
+        rest_scale = cmds.getAttr(f"{pupil_ctrl}.scaleX")
+
+        start = time.perf_counter()
+        for sample in range(samples):
+            cmds.setAttr(f"{pupil_ctrl}.scaleX", rest_scale * (1.0 + 0.5 * (sample % 2)))
+            for pupil_jnt in pupil_rig["joints"]:
+                cmds.getAttr(f"{pupil_jnt}.scaleY")
+        seconds = (time.perf_counter() - start) / samples
+
+        cmds.setAttr(f"{pupil_ctrl}.scaleX", rest_scale)
+
+        return {"mode": pupil_rig["mode"], "nodes": len(pupil_rig["nodes"]), "node_types": dict(node_types), "seconds": seconds}
+
+    def compare_pupil_scale_modes(self, side, samples=50):
+        """
+        Builds each pupil scale network in turn on the same joints, prints node counts and
+        evaluation times side by side, then puts the rig's own mode back.
+        """
+        rig_mode = self.pupil_scale_rigs[side]["mode"]
+        reports = []
+
+        for mode in PUPIL_SCALE_MODES:
+            self.remove_pupil_scale_network(side)
+            self.build_pupil_scale_network(side, mode)
+            reports.append(self.pupil_scale_report(side, samples))
+
+        self.remove_pupil_scale_network(side)
+        self.build_pupil_scale_network(side, rig_mode)
+
+        print(f"{side} pupil scale networks:")
+        for report in reports:
+            node_types = ", ".join(f"{count} {node_type}" for node_type, count in sorted(report["node_types"].items()))
+            print(f"    {report['mode']:<8} {report['nodes']:4d} nodes  {report['seconds'] * 1000.0:8.3f} ms per evaluation  ({node_types})")
+
+        return reports
+
     def label_joint(self, side, joint_to_be_labelled):
         # Label the joints according to left and right side to help with skinning process
         # Used when any new joints are created
@@ -369,7 +777,7 @@ class EyeballRig:
         label_type = 18
     
         # Get the label name by stripping prefix and suffix
-        label_name = self.strip_prefix_suffix(joint_to_be_labelled)
+        label_name = self.strip_prefix_suffix(self.base_name(joint_to_be_labelled))
     
         # Apply the label attributes to the joint
         cmds.setAttr(f"{joint_to_be_labelled}.side", side_value)
@@ -385,14 +793,15 @@ class EyeballRig:
         return components[1] if len(components) > 2 else name
     
 
+    @build_step
     def create_up_locator(self, side, eye_aim_jnt, curve, eye_rig_grp):
         # Create the up loc used for the eye aim constraints
 
         curve_length = cmds.arclen(curve)
         scale_factor = curve_length / 5
 
-        up_loc = cmds.spaceLocator(name=f"{side}_eyeballUpObject_loc")[0]
-        cmds.delete(cmds.parentConstraint(eye_aim_jnt, up_loc, mo=False))
+        up_loc = cmds.spaceLocator(name=f"{self.prefix}{side}_eyeballUpObject_loc")[0]
+        self.match_transform(up_loc, eye_aim_jnt)
         
         move_distance = abs(scale_factor * 4)
         cmds.move(0,move_distance,0, up_loc, relative=True)
@@ -412,20 +821,22 @@ class EyeballRig:
         return name
 
 
+    @build_step
     def bind_eye_geo_to_create_skin_cluster(self, side, eye_joints, pupil_jnt, geo, pupil_geo):
         """Creates a skin cluster for the eye geometry using the given joints."""
 
-        skin_cluster_name = f"{side}_eye_sc"
+        skin_cluster_name = f"{self.prefix}{side}_eye_sc"
         skin_cluster = cmds.skinCluster(*eye_joints, geo, name=skin_cluster_name, toSelectedBones=True, bindMethod=0, skinMethod=0, normalizeWeights=1)[0]
 
-        pupil_name = f"{side}_pupil_sc"
+        pupil_name = f"{self.prefix}{side}_pupil_sc"
         pupil_cluster = cmds.skinCluster(pupil_jnt, pupil_geo, name=pupil_name, toSelectedBones=True, bindMethod=0, skinMethod=0, normalizeWeights=1)[0]
 
         return skin_cluster
 
+    @build_step
     def create_blendshapes(self, side, pupil_crv):
-        blendshape_targets = [f"{side}_heart_crv", f"{side}_oval_crv", f"{side}_star_crv", f"{side}_diamond_crv", f"{side}_clover_crv"]
-        blendshape_name = f"{side}_pupilShape_bs"
+        blendshape_targets = [f"{self.prefix}{side}_heart_crv", f"{self.prefix}{side}_oval_crv", f"{self.prefix}{side}_star_crv", f"{self.prefix}{side}_diamond_crv", f"{self.prefix}{side}_clover_crv"]
+        blendshape_name = f"{self.prefix}{side}_pupilShape_bs"
         pupil_shape_bs = cmds.blendShape(*blendshape_targets, pupil_crv, name=blendshape_name)[0]
 
 
@@ -433,44 +844,46 @@ class EyeballRig:
         sides = ["l", "r"]
 
         for side in sides:
-            blendshape_name = f"{side}_pupilShape_bs"
-            target_name = f"{side}_{target}_crv"
+            blendshape_name = f"{self.prefix}{side}_pupilShape_bs"
+            target_name = f"{self.prefix}{side}_{target}_crv"
             blendshape_targets = [
-                f"{side}_heart_crv", f"{side}_oval_crv", 
-                f"{side}_star_crv", f"{side}_diamond_crv", 
-                f"{side}_clover_crv"
+                f"{self.prefix}{side}_heart_crv", f"{self.prefix}{side}_oval_crv", 
+                f"{self.prefix}{side}_star_crv", f"{self.prefix}{side}_diamond_crv", 
+                f"{self.prefix}{side}_clover_crv"
             ]
 
+            # Target weights are aliased by the target's name without its namespace
             if target == "circle":
                 for tgt in blendshape_targets:
-                    cmds.setAttr(f"{blendshape_name}.{tgt}", 0)
+                    cmds.setAttr(f"{blendshape_name}.{tgt.rpartition(':')[2]}", 0)
             else:
                 for tgt in blendshape_targets:
                     value = 1 if tgt == target_name else 0  # Turn on the selected target, turn off others
-                    cmds.setAttr(f"{blendshape_name}.{tgt}", value)
+                    cmds.setAttr(f"{blendshape_name}.{tgt.rpartition(':')[2]}", value)
 
         print(f"Activated: {target} eyes")
 
 
+    @build_step
     def create_controls(self, side, iris_crv, pupil_crv, aim_jnt, up_obj, pupil_jnt):
 
-        rig_grp = f"{side}_eyeRig_grp"
+        rig_grp = f"{self.prefix}{side}_eyeRig_grp"
 
-        pupil_crv_grp = cmds.group(empty=True, n=f"{side}_pupilCrv_grp")
-        pupil_center_grp = cmds.group(empty=True, n=f"{side}_pupilCenter_grp")
-        cmds.delete(cmds.parentConstraint(pupil_crv, pupil_crv_grp, mo=False))
-        cmds.delete(cmds.parentConstraint(aim_jnt, pupil_center_grp, mo=False))
+        pupil_crv_grp = cmds.group(empty=True, n=f"{self.prefix}{side}_pupilCrv_grp")
+        pupil_center_grp = cmds.group(empty=True, n=f"{self.prefix}{side}_pupilCenter_grp")
+        self.match_transform(pupil_crv_grp, pupil_crv)
+        self.match_transform(pupil_center_grp, aim_jnt)
         cmds.parent(pupil_crv, pupil_crv_grp)
         cmds.parent(pupil_crv_grp, pupil_center_grp)
 
         # Duplicate the curve
-        pupil_ctrl = cmds.duplicate(pupil_crv, n=f"{side}_pupil_ctrl")
+        pupil_ctrl = cmds.duplicate(pupil_crv, n=f"{self.prefix}{side}_pupil_ctrl")
         cmds.makeIdentity(pupil_ctrl, apply=True, translate=True, rotate=True, scale=True, normal=False)  # Freeze transforms  
         # Rebuild the curve to be cubic (degree=3) while keeping the original shape
         pupil_ctrl = cmds.rebuildCurve(pupil_ctrl[0], degree=3, spans=10, keepRange=0, rebuildType=0)
 
-        pupil_ctrl_grp = cmds.group(empty=True, n=f"{side}_pupil_grp")
-        cmds.delete(cmds.parentConstraint(pupil_ctrl, pupil_ctrl_grp, mo=False))
+        pupil_ctrl_grp = cmds.group(empty=True, n=f"{self.prefix}{side}_pupil_grp")
+        self.match_transform(pupil_ctrl_grp, pupil_ctrl)
 
         cmds.parent(pupil_ctrl, pupil_ctrl_grp)
 
@@ -482,15 +895,15 @@ class EyeballRig:
         cmds.setAttr(f"{pupil_ctrl_shape}.overrideColor", 17)
 
 
-        iris_crv_grp = cmds.group(empty=True, n=f"{side}_irisCrv_grp")
-        iris_center_grp = cmds.group(empty=True, n=f"{side}_irisCenter_grp")
-        cmds.delete(cmds.parentConstraint(iris_crv, iris_crv_grp, mo=False))
-        cmds.delete(cmds.parentConstraint(aim_jnt, iris_center_grp, mo=False))
+        iris_crv_grp = cmds.group(empty=True, n=f"{self.prefix}{side}_irisCrv_grp")
+        iris_center_grp = cmds.group(empty=True, n=f"{self.prefix}{side}_irisCenter_grp")
+        self.match_transform(iris_crv_grp, iris_crv)
+        self.match_transform(iris_center_grp, aim_jnt)
         cmds.parent(iris_crv, iris_crv_grp)
         cmds.parent(iris_crv_grp, iris_center_grp)
 
 
-        iris_ctrl = cmds.duplicate(iris_crv, n=f"{side}_iris_ctrl")
+        iris_ctrl = cmds.duplicate(iris_crv, n=f"{self.prefix}{side}_iris_ctrl")
         cmds.makeIdentity(iris_ctrl, apply=True, translate=True, rotate=True, scale=True, normal=False)  # Freeze transforms  
         iris_ctrl = cmds.rebuildCurve(iris_ctrl[0], degree=3, spans=10, keepRange=0, rebuildType=0)
         iris_ctrl_shape = cmds.listRelatives(iris_ctrl, shapes=True)[0]
@@ -499,12 +912,12 @@ class EyeballRig:
         cmds.setAttr(f"{iris_ctrl_shape}.overrideColor",9)
 
         #cmds.delete(iris_ctrl, constructionHistory=True)  # Delete history  
-        iris_ctrl_grp = cmds.group(empty=True, n=f"{side}_iris_grp")
-        cmds.delete(cmds.parentConstraint(iris_ctrl, iris_ctrl_grp, mo=False))
+        iris_ctrl_grp = cmds.group(empty=True, n=f"{self.prefix}{side}_iris_grp")
+        self.match_transform(iris_ctrl_grp, iris_ctrl)
         cmds.makeIdentity(iris_ctrl, apply=True, translate=True, rotate=True, scale=True, normal=False)  # Freeze transforms  
 
         cmds.parent(iris_ctrl, iris_ctrl_grp)
-        cmds.delete(cmds.parentConstraint(iris_ctrl, pupil_ctrl_grp, mo=False))
+        self.match_transform(pupil_ctrl_grp, iris_ctrl)
         cmds.parent(pupil_ctrl_grp, iris_ctrl)
 
         # Move the group 0.5 in local Z
@@ -523,70 +936,17 @@ class EyeballRig:
         cmds.scaleConstraint(pupil_ctrl, pupil_crv_grp, mo=True)
 
 
-        # Step 1: PlusMinusAverage node to average the iris control scales
-        pma_node = cmds.createNode("plusMinusAverage", n=f"{side}_irisScale_avg")
-        cmds.setAttr(f"{pma_node}.operation", 3)  # Set to Average mode
-
-        # Connect the scale X and Y of the iris control to the PMA node
-        cmds.connectAttr(f"{iris_ctrl[0]}.scaleX", f"{pma_node}.input1D[0]")
-        cmds.connectAttr(f"{iris_ctrl[0]}.scaleY", f"{pma_node}.input1D[1]")
-
-        # Step 2: Condition node to check if PMA output > 1
-        condition_node = cmds.createNode("condition", n=f"{side}_irisScale_condition")
-        cmds.setAttr(f"{condition_node}.operation", 2)  # 2 = Greater than operation
-        cmds.setAttr(f"{condition_node}.secondTerm", 1)  # Compare to 1
-        cmds.setAttr(f"{condition_node}.colorIfFalseR", 0)  # If PMA <= 1, set to 0
-        # Connect PMA output to condition node
-        cmds.connectAttr(f"{pma_node}.output1D", f"{condition_node}.firstTerm")
-        cmds.connectAttr(f"{pma_node}.output1D", f"{condition_node}.colorIfTrueR")
-
-        # Step 3: Multiply the result of the condition node by -0.1
-        mdn_node = cmds.createNode("multiplyDivide", n=f"{side}_irisScale_multiply")
-        cmds.setAttr(f"{mdn_node}.input2X", -0.1)  # Multiply by -0.1
-
-        # Connect the condition output to the multiply node
-        cmds.connectAttr(f"{condition_node}.outColorR", f"{mdn_node}.input1X")
-
-        # Step 4: Connect the result of the multiply node to translate Z of the pupil joint
-        cmds.connectAttr(f"{mdn_node}.outputX", f"{pupil_jnt}.translateZ")  # Connect to translate Z of the pupil joint
-
-
-        pupil_scale_mdn = cmds.createNode("multiplyDivide", n=f"{side}_pupilScale_mdn")
-
-        for attr in ["X", "Y"]:
-            # Step 2: Create a condition node
-            condition_node = cmds.createNode("condition", n=f"{side}_pupilScale_condition_{attr.lower()}")
-            cmds.setAttr(f"{condition_node}.operation", 0)  # 0 = Equal to operation
-            cmds.setAttr(f"{condition_node}.secondTerm", 1)  # Compare to 1
-            cmds.setAttr(f"{condition_node}.colorIfTrueR", 1)  # If true, output 1
-
-            # Connect the multiply divide output to the condition node
-            cmds.connectAttr(f"{iris_ctrl[0]}.scale{attr}", f"{condition_node}.firstTerm")
-            cmds.connectAttr(f"{iris_ctrl[0]}.scale{attr}", f"{condition_node}.colorIfFalseR")
-
-            # Step 3: Connect the output of condition to a plus-minus-average node to subtract 1
-            subtract_mdn = cmds.createNode("plusMinusAverage", n=f"{side}_pupilScale_subtract_{attr.lower()}")
-            cmds.setAttr(f"{subtract_mdn}.operation", 2)  # Set to subtract
-            cmds.setAttr(f"{subtract_mdn}.input1D[1]", 1)  # Subtract 1
-
-            cmds.connectAttr(f"{condition_node}.outColorR", f"{subtract_mdn}.input1D[0]")  # Output of condition -> input of subtract
-
-            # Step 4: Multiply the result by 0.15
-            scale_mdn = cmds.createNode("multiplyDivide", n=f"{side}_pupilScale_adjust_{attr.lower()}")
-            cmds.setAttr(f"{scale_mdn}.operation", 1)  # Multiply mode
-            cmds.setAttr(f"{scale_mdn}.input2{attr}", 0.05)  # Multiply by 0.15
-
-            cmds.connectAttr(f"{subtract_mdn}.output1D", f"{scale_mdn}.input1{attr}")  # Connect result of subtraction to multiply
-
-            # Step 5: Add 1 back to the scaled result
-            add_mdn = cmds.createNode("plusMinusAverage", n=f"{side}_pupilScale_add_{attr.lower()}")
-            cmds.setAttr(f"{add_mdn}.operation", 1)  # Add mode
-            cmds.setAttr(f"{add_mdn}.input1D[1]", 1)  # Add 1
-
-            cmds.connectAttr(f"{scale_mdn}.output{attr}", f"{add_mdn}.input1D[0]")  # Connect multiplied value to add
-
-            # Step 6: Connect the final result to the joint scale
-            cmds.connectAttr(f"{add_mdn}.output1D", f"{pupil_jnt}.scale{attr}")  # Final scale to joint
+        # Pupil push back and pupil scale from the iris control scale. The compiler shares the
+        # X and Y chains, folds the constants and builds every node in one go. The nodes keep the
+        # names of the hand wired ones they replace, the pupilScale_condition and _subtract nodes
+        # are folded away and the _x and _y adjust and add nodes are one node each
+        exprCompiler.build_network("""
+            avg = (iris.scaleX + iris.scaleY) / 2
+            pupil.translateZ = -0.1 * (avg if avg > 1 else 0)
+            pupil.scaleX = 1 + 0.05 * ((1 if iris.scaleX == 1 else iris.scaleX) - 1)
+            pupil.scaleY = 1 + 0.05 * ((1 if iris.scaleY == 1 else iris.scaleY) - 1)
+        """, bindings={"iris": iris_ctrl[0], "pupil": pupil_jnt}, name=f"{self.prefix}{side}_eyeScale",
+            node_names={suffix: f"{self.prefix}{side}_{name}" for suffix, name in EYE_SCALE_NODE_NAMES.items()})
 
         # pupil_scale_mdn = cmds.createNode("multiplyDivide", n=f"{side}_pupilScale_mdn")
 
@@ -604,8 +964,9 @@ class EyeballRig:
         cmds.setAttr(f"{iris_center_grp}.visibility", 0)
         cmds.setAttr(f"{pupil_center_grp}.visibility", 0)
 
+    @build_step
     def clean_up_outliner(self, side, locs):
-        rig_grp = f"{side}_eyeRig_grp"
+        rig_grp = f"{self.prefix}{side}_eyeRig_grp"
 
         for loc in locs:
             cmds.setAttr(f"{loc}.visibility", 0)
@@ -613,96 +974,248 @@ class EyeballRig:
 
     def assign_influence_to_closest_joint(self, vertices, joints, skin_cluster, iris_flag, value):
         """Assigns 100% influence to the closest joint for each vertex in the loop."""
-        for vertex in vertices:
-            closest_joint = None
-            min_distance = float('inf')  # Start with an infinitely large distance
-            
-            # Get the position of the vertex
-            vertex_position = om.MVector(*cmds.xform(vertex, q=True, t=True, ws=True))
-            
-            # Check distance to each joint
-            for jnt in joints:
-                jnt_position = om.MVector(*cmds.xform(jnt, q=True, t=True, ws=True))
-                
-                distance = (vertex_position - jnt_position).length()  # Calculate the distance to the joint
-                
-                if distance < min_distance:
-                    min_distance = distance
-                    closest_joint = jnt
-                    if iris_flag:
-                        closest_joint = closest_joint.replace("Tip", "")
-            
-            # Assign 100% influence to the closest joint
-            cmds.skinPercent(skin_cluster, vertex, transformValue=(closest_joint, value))
+        mesh, indices = skinIO.component_indices(vertices)
+        points = skinIO.get_points(mesh, indices)
 
-    def skin_eye_verts(self, side, face_list, joints_list, iris_flag=False):
-        """Skins the donut mesh based on the provided faces, center, and joints."""
+        self.skin_to_closest_joint(skin_cluster, indices, points, joints, iris_flag, value)
 
-        skin_cluster = f"{side}_eye_sc"
+    def skin_to_closest_joint(self, skin_cluster, indices, points, joints, iris_flag, values, nearest_count=1, blend_mode="inverse"):
+        """
+        Sets each vertex's closest joint to the given value, in one bulk read and one bulk write.
+        Positions are matched against the joints given, iris weights go to the non-tip joint.
+        With nearest_count above 1 the value is shared between that many closest joints, blended
+        by inverse distance or a gaussian (blend_mode), so vertices between joints don't pop.
+        """
+        if not len(indices):
+            return
 
-        position = cmds.xform(f"{side}_eyePupil_loc", q=True, t=True, ws=True)
-        center = om.MVector(position[0], position[1], position[2])
+        joint_points = skinIO.get_positions(joints)
+        closest, values = eyeSolver.closest_joint_values(points, joint_points, values, nearest_count, blend_mode)
 
-        # Get vertices from the faces
-        all_vertices = cmds.polyListComponentConversion(face_list, toVertex=True)
-        all_vertices = cmds.ls(all_vertices, flatten=True)  # Flatten the component list
+        weights = SkinWeights.from_skin_cluster(skin_cluster, indices)
+        joint_columns = self.joint_columns(weights.influences, joints, iris_flag)
 
-        # Group vertices by their distance to the center (form edge loops)
-        min_weight = 0.2
-        
-        # Group vertices by their distance to the center (forming edge loops)
-        distance_groups = {}
-        for vertex in all_vertices:
-            vertex_position = om.MVector(*cmds.xform(vertex, q=True, t=True, ws=True))
-            # Get the distance from the actual center (not origin)
-            distance = (vertex_position - center).length()  # Measure distance to the center position
-        
-            # Group vertices by distance (which corresponds to the edge loop)
-            if distance not in distance_groups:
-                distance_groups[distance] = []
-            distance_groups[distance].append(vertex)
-        
-        # Sort distances for ordered processing (from inner to outer loops)
-        sorted_distances = sorted(distance_groups.keys())
-        
-        if iris_flag:
-            num_groups = len(sorted_distances)
-            # First quarter: full influence.
-            quarter_size = num_groups // 4
-            if quarter_size < 1:
-                quarter_size = 1
-        
-            # The fade zone will run from index `quarter_size` to the final index.
-            fade_range = (num_groups - 1) - quarter_size  # Ensure this is at least 1 for proper division
-        
-            for i, distance in enumerate(sorted_distances):
-                if i < quarter_size:
-                    # First quarter: assign full weight (1.0)
-                    value = 1.0
-                else:
-                    # Fade from 1.0 to min_weight using cosine interpolation.
-                    # t goes from 0 (start of fade) to 1 (last group)
-                    t = float(i - quarter_size) / fade_range
-                    # Standard cosine interpolation gives a value from 1.0 down to 0.0:
-                    cosine_val = 0.5 * (math.cos(math.pi * t) + 1.0)
-                    # Remap that range so that the final value is min_weight rather than 0.0.
-                    value = min_weight + (1.0 - min_weight) * cosine_val
-                self.assign_influence_to_closest_joint(distance_groups[distance], joints_list, skin_cluster, iris_flag, value=value)
+        weights = weights.set_transform_values(joint_columns[closest], values)
+        weights.to_skin_cluster(skin_cluster)
 
-        else:
-            for distance, vertices in distance_groups.items():
-                self.assign_influence_to_closest_joint(vertices, joints_list, skin_cluster, iris_flag, value=1)
+    def joint_columns(self, influences, joints, iris_flag):
+        """Influence column of every joint, iris tip joints map to their non-tip joint."""
+        influence_names = [jnt.replace("Tip", "") if iris_flag else jnt for jnt in joints]
 
-    def assign_influence_to_eye_aim(self, side, faces):
-        """Assigns all iris vertices to the eye aim joint."""
-        aim_jnt = f"{side}_eyeAim_jnt"
-        skin_cluster = f"{side}_eye_sc"
+        return np.array([influences.index(self.isolate_name(jnt)) for jnt in influence_names])
 
-        all_vertices = cmds.polyListComponentConversion(faces, toVertex=True)
-        all_vertices = cmds.ls(all_vertices, flatten=True)  # Flatten the component list
+    def skin_eye_verts(self, side, face_list, joints_list, iris_flag=False, ring_tolerance=None, rings_from_topology=False,
+                       falloff_profile="cosine", full_fraction=0.25, min_weight=0.2, nearest_count=1, blend_mode="inverse", vertices=None):
+        """
+        Skins the donut mesh based on the provided faces, center, and joints.
+        Vertices are grouped into rings by distance to the pupil center, within ring_tolerance
+        scene units (defaults to 1% of the eye radius), or by edge hops from the inner ring.
+        falloff_profile is a name from falloff.PROFILES, a function of t or a list of curve values.
+        nearest_count and blend_mode turn on smooth weighting across the closest joints.
+        vertices is an optional (mesh, indices) pair, as returned by assign_influence_to_eye_aim,
+        to skip converting the faces again.
+        """
+
+        skin_cluster = f"{self.prefix}{side}_eye_sc"
+
+        center = np.array(cmds.xform(f"{self.prefix}{side}_eyePupil_loc", q=True, t=True, ws=True))
+
+        # Get vertices from the faces, left in compact range form
+        if vertices is None:
+            vertices = skinIO.component_indices(cmds.polyListComponentConversion(face_list, toVertex=True))
+        mesh, indices = vertices
+        points = skinIO.get_points(mesh, indices)
+
+        if not iris_flag:
+            self.skin_to_closest_joint(skin_cluster, indices, points, joints_list, iris_flag, 1.0, nearest_count, blend_mode)
+            return
 
-        for vertex in all_vertices:
-            cmds.skinPercent(skin_cluster, vertex, transformValue=(aim_jnt, 1.0))
+        edges = self.get_ring_edges(face_list, indices) if rings_from_topology else None
 
+        # Full influence for the inner rings, then fade out to min_weight at the edge
+        values = eyeSolver.ring_values(points, center, edges, ring_tolerance, falloff_profile, full_fraction, min_weight)
 
+        self.skin_to_closest_joint(skin_cluster, indices, points, joints_list, iris_flag, values, nearest_count, blend_mode)
 
+    def get_ring_edges(self, face_list, indices):
+        """Edges of the faces as pairs of positions in indices, for counting rings by edge hops."""
+        edges = skinIO.get_face_edges(face_list)
+        edges = edges[np.isin(edges, indices).all(axis=1)]
+
+        return np.searchsorted(indices, edges)
+
+    def assign_influence_to_eye_aim(self, side, faces):
+        """
+        Assigns all iris vertices to the eye aim joint in a single weight write.
+        Returns the mesh and vertex indices so later skinning passes can reuse them.
+        """
+        aim_jnt = f"{self.prefix}{side}_eyeAim_jnt"
+        skin_cluster = f"{self.prefix}{side}_eye_sc"
+
+        # Vertices stay in compact range form, they are never flattened to single components
+        all_vertices = cmds.polyListComponentConversion(faces, toVertex=True)
+        mesh, indices = skinIO.component_indices(all_vertices)
+
+        influences = skinIO.get_influences(skin_cluster)
+        weights = SkinWeights.from_solver(indices, influences, np.full(len(indices), influences.index(aim_jnt)), 1.0)
+        weights.to_skin_cluster(skin_cluster)
+
+        return mesh, indices
+
+    def skin_eye(self, side, iris_faces, pupil_faces, iris_joints, pupil_joints, cache=None, nearest_count=1, blend_mode="inverse", **skin_options):
+        """
+        Runs the full skinning pass for one eye: aim joint, iris falloff and pupil joints.
+        With a SkinWeightCache the result is stored by topology and joint layout, and a cache
+        hit is written back in one bulk call instead of being solved again.
+        nearest_count and blend_mode apply to both the iris and pupil passes,
+        skin_options are passed on to the iris pass (see skin_eye_verts).
+        """
+        eye = dict(skin_options, side=side, iris_faces=iris_faces, pupil_faces=pupil_faces, iris_joints=iris_joints,
+                   pupil_joints=pupil_joints, nearest_count=nearest_count, blend_mode=blend_mode)
+
+        self.skin_eyes([eye], cache=cache)
+
+    def skin_eyes(self, eyes, cache=None, parallel=True):
+        """
+        Skins any number of eyes at once. Each eye is a dict of skin_eye arguments.
+        All scene reads happen up front, the solves run in a process pool (see eyeSolver.solve_eyes)
+        and each eye's weights are written back here on the main thread in one bulk call.
+        A falloff profile function is cached under its name in falloff.PROFILES, an eye with
+        an unregistered one is solved without the cache.
+        """
+        if cache is None:
+            cache = self.session.skin_cache
+
+        jobs = []
+        keys = []
+        for eye in eyes:
+            eye = dict(eye)
+            side = eye.pop("side")
+            iris_faces, pupil_faces = eye.pop("iris_faces"), eye.pop("pupil_faces")
+            iris_joints, pupil_joints = eye.pop("iris_joints"), eye.pop("pupil_joints")
+
+            # Kept so a level of detail switch can skin the eye again
+            self.skin_inputs[side] = dict(eye, iris_faces=iris_faces, pupil_faces=pupil_faces)
+            self.mirror_inputs.pop(side, None)
+
+            if not iris_joints:
+                # An aim only eye has nothing to solve
+                self.assign_influence_to_eye_aim(side, iris_faces + pupil_faces)
+                continue
+
+            job = self.create_eye_skin_job(side, iris_faces, pupil_faces, iris_joints, pupil_joints, **eye)
+
+            key = None
+            eye_cache = cache
+            settings = dict(eye)
+            if callable(settings.get("falloff_profile")):
+                # A function's repr holds its memory address and would never hit, it is keyed by its registered name
+                settings["falloff_profile"] = falloff.profile_name(settings["falloff_profile"])
+                if settings["falloff_profile"] is None and cache is not None:
+                    cmds.warning(f"{side} eye skin is not cached, register its falloff profile with falloff.register_profile to cache it.")
+                    eye_cache = None
+
+            if eye_cache is not None:
+                # Keyed without the character prefix so variants with matching eyes share entries
+                key_joints = [self.base_name(node) for node in iris_joints + pupil_joints + [f"{self.prefix}{side}_eyePupil_loc"]]
+                joint_points = np.vstack((job.iris_joint_points, job.pupil_joint_points, job.center))
+                key = eye_cache.make_key([self.base_name(face) for face in iris_faces + pupil_faces], job.points, key_joints, joint_points, settings)
+
+                if self.apply_cached_weights(job.skin_cluster, eye_cache.load(key)):
+                    print(f"{side} eye skin loaded from cache.")
+                    continue
+
+            jobs.append(job)
+            keys.append(key)
+
+        for job, key, weights in zip(jobs, keys, eyeSolver.solve_eyes(jobs, parallel)):
+            weights.to_skin_cluster(job.skin_cluster)
+
+            if key is not None:
+                cache.save(key, weights)
+
+    def create_eye_skin_job(self, side, iris_faces, pupil_faces, iris_joints, pupil_joints, ring_tolerance=None,
+                            rings_from_topology=False, falloff_profile="cosine", full_fraction=0.25, min_weight=0.2,
+                            nearest_count=1, blend_mode="inverse"):
+        """Reads everything one eye's solve needs from the scene into an eyeSolver.EyeSkinJob."""
+        skin_cluster = f"{self.prefix}{side}_eye_sc"
+
+        iris_mesh, iris_indices = skinIO.component_indices(cmds.polyListComponentConversion(iris_faces, toVertex=True))
+        pupil_mesh, pupil_indices = skinIO.component_indices(cmds.polyListComponentConversion(pupil_faces, toVertex=True))
+        # One skin cluster, one set of vertex indices, the points are all read from one mesh
+        if pupil_mesh != iris_mesh:
+            raise ValueError(f"The iris faces are on {iris_mesh} and the pupil faces on {pupil_mesh}, {skin_cluster} skins one mesh")
+        indices = np.union1d(iris_indices, pupil_indices)
+
+        influences = skinIO.get_influences(skin_cluster)
+        edges = self.get_ring_edges(iris_faces, iris_indices) if rings_from_topology else None
+
+        return eyeSolver.EyeSkinJob(
+            skin_cluster,
+            indices,
+            influences,
+            skinIO.get_points(iris_mesh, indices),
+            np.array(cmds.xform(f"{self.prefix}{side}_eyePupil_loc", q=True, t=True, ws=True)),
+            influences.index(f"{self.prefix}{side}_eyeAim_jnt"),
+            np.searchsorted(indices, iris_indices),
+            skinIO.get_positions(iris_joints),
+            self.joint_columns(influences, iris_joints, True),
+            np.searchsorted(indices, pupil_indices),
+            skinIO.get_positions(pupil_joints),
+            self.joint_columns(influences, pupil_joints, False),
+            iris_edges=edges,
+            ring_tolerance=ring_tolerance,
+            falloff_profile=falloff_profile,
+            full_fraction=full_fraction,
+            min_weight=min_weight,
+            nearest_count=nearest_count,
+            blend_mode=blend_mode,
+        )
+
+    def apply_cached_weights(self, skin_cluster, cached):
+        """Writes cached SkinWeights back to the skin cluster. Returns False if they no longer fit its influences."""
+        if cached is None:
+            return False
+
+        try:
+            cached.to_skin_cluster(skin_cluster)
+        except ValueError:
+            return False
+
+        return True
+
+    def mirror_eye_skin(self, faces, source_side="l", target_side="r", tolerance=0.001):
+        """
+        Copies the source eye's weights to the target eye through a cached vertex symmetry map,
+        with each influence swapped to its mirrored joint. Faces are given on the source eye.
+        """
+        # Kept so a level of detail switch can mirror the eye again
+        self.mirror_inputs[target_side] = dict(faces=faces, source_side=source_side, tolerance=tolerance)
+
+        source_skin_cluster = f"{self.prefix}{source_side}_eye_sc"
+        target_skin_cluster = f"{self.prefix}{target_side}_eye_sc"
+
+        source_vertices = cmds.polyListComponentConversion(faces, toVertex=True) or []
+        source_mesh, source_indices = skinIO.component_indices(source_vertices)
+
+        target_faces = self.mirror_components(faces, source_side, target_side)
+        target_vertices = cmds.polyListComponentConversion(target_faces, toVertex=True) or []
+        target_mesh, target_indices = skinIO.component_indices(target_vertices)
+
+        # An empty side leaves nothing to match and errors.max() below would raise on it
+        if not len(source_indices) or not len(target_indices):
+            raise ValueError(f"No vertices to mirror from {source_side} to {target_side} for faces: {faces if isinstance(faces, str) else ', '.join(faces)}")
+
+        source_points = skinIO.get_points(source_mesh, source_indices)
+        target_points = skinIO.get_points(target_mesh, target_indices)
+        symmetry_map, errors = self.symmetry_maps.get(source_mesh, target_mesh, source_points, target_points)
+
+        if errors.max() > tolerance:
+            cmds.warning(f"{target_mesh} is not symmetrical with {source_mesh}, largest mismatch {errors.max():.4f}.")
+
+        source_weights = SkinWeights.from_skin_cluster(source_skin_cluster, source_indices)
+        target_influences = skinIO.get_influences(target_skin_cluster)
+
+        target_weights = symmetry.mirror_weights(source_weights, target_indices, target_influences, symmetry_map,
+                                                 source_prefix=f"{self.prefix}{source_side}_", target_prefix=f"{self.prefix}{target_side}_")
+        target_weights.to_skin_cluster(target_skin_cluster)
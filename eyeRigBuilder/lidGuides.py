@@ -0,0 +1,153 @@
+"""
+Eyelid guide placement solved from the lid curves' CVs.
+
+The place_*_locs functions used to make locators and flat curves, constrain them with
+tangent, aim, point and geometry constraints just to read back where they ended up, and
+delete it all again. Here each lid curve is read once into a LidCurve (CVs, knots and
+degree, world space) and the same placements are worked out with curveSampling and
+transformMath, as 4x4 world matrices in Maya's row vector layout:
+
+- the inner and outer corners, aimed between the pupil and the opposite corner
+- two tweak guides per lid at 25% and 75% of its length, along the curve's tangent
+- a mid guide per lid at the middle CV, the two aimed at each other and the lower one
+  slid back onto its curve level with the upper one
+
+Only LidCurve.from_scene needs Maya. Control placement then touches the scene once per
+control.
+"""
+import numpy as np
+
+from riggingTools import arcLength
+from riggingTools import curveSampling
+from riggingTools import transformMath
+
+
+TWEAK_PERCENTAGES = (0.25, 0.75)
+
+
+class LidCurve:
+    def __init__(self, cvs, knots, degree):
+        self.cvs = np.asarray(cvs, dtype=float).reshape(-1, 3)
+        self.knots = np.asarray(knots, dtype=float)
+        self.degree = degree
+
+    def __repr__(self):
+        return f"LidCurve({len(self.cvs)} CVs, degree {self.degree})"
+
+    @classmethod
+    def from_scene(cls, curve):
+        """Reads a curve's world space CVs, knots and degree in one API pass."""
+        curve_fn = arcLength._get_curve_fn(curve)
+
+        return cls(arcLength.get_cv_points(curve_fn), list(curve_fn.knots()), curve_fn.degree)
+
+    @property
+    def domain(self):
+        return self.knots[self.degree - 1], self.knots[len(self.cvs) - 1]
+
+    @property
+    def direction(self):
+        """1 if the curve runs along +X, as it does from the inner corner of a left eye, else -1."""
+        return 1 if self.cvs[-1, 0] >= self.cvs[0, 0] else -1
+
+    @property
+    def mid_cv(self):
+        return (len(self.cvs) - 1) // 2
+
+    def points(self, parameters):
+        return curveSampling.sample_curve(self.cvs, self.knots, self.degree, parameters)
+
+    def tangents(self, parameters):
+        return curveSampling.sample_tangents(self.cvs, self.knots, self.degree, parameters)
+
+    def length_table(self, samples_per_span=arcLength.SAMPLES_PER_SPAN):
+        start, end = self.domain
+        count = (len(self.cvs) - self.degree) * (1 if self.degree == 1 else samples_per_span)
+        parameters = np.linspace(start, end, count + 1)
+
+        return arcLength.ArcLengthTable(parameters, self.points(parameters))
+
+    def parameters_at_percentages(self, percentages):
+        """Parameters at fractions of the curve's arc length."""
+        table = self.length_table()
+
+        return table.parameters_at(np.asarray(percentages, dtype=float) * table.length)
+
+    def closest_parameters(self, points):
+        """Parameter of the closest point on the curve to each point, to a sample's accuracy."""
+        table = self.length_table()
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        distances = np.linalg.norm(points[:, None, :] - table.points[None, :, :], axis=-1)
+
+        return table.parameters[np.argmin(distances, axis=1)]
+
+
+def tangent_matrices(curve, positions, aim_vector, up_vector=(0.0, 1.0, 0.0)):
+    """What a tangentConstraint with scene up leaves nodes at positions with, aiming along the closest tangent."""
+    positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+    tangents = curve.tangents(curve.closest_parameters(positions))
+
+    return transformMath.aim_matrices(positions, positions + tangents, aim_vector, up_vector, world_up_type="scene")
+
+
+def corner_matrices(lower_curve, pupil_position):
+    """
+    Inner and outer corner guides at the ends of the lower lid. Each aims its X axis, -X for
+    the outer corner, at the point between the pupil and the other corner.
+    """
+    pupil_position = np.asarray(pupil_position, dtype=float)
+    ends = lower_curve.cvs[[0, -1]]
+    inner, outer = ends if lower_curve.direction > 0 else ends[::-1]
+
+    positions = np.stack((inner, outer))
+    targets = np.stack(((pupil_position + outer) / 2, (pupil_position + inner) / 2))
+    aim_vectors = ((1.0, 0.0, 0.0), (-1.0, 0.0, 0.0))
+
+    inner_matrix, outer_matrix = (transformMath.aim_matrices(position, target, aim_vector, world_up_type="scene")
+                                  for position, target, aim_vector in zip(positions, targets, aim_vectors))
+
+    return inner_matrix, outer_matrix
+
+
+def tweak_matrices(curve, direction):
+    """The two tweak guides of a lid, inner first, on the curve's tangent."""
+    percentages = TWEAK_PERCENTAGES if direction > 0 else TWEAK_PERCENTAGES[::-1]
+    parameters = curve.parameters_at_percentages(percentages)
+    positions = curve.points(parameters)
+
+    return transformMath.aim_matrices(positions, positions + curve.tangents(parameters), (direction, 0.0, 0.0), world_up_type="scene")
+
+
+def mid_matrices(upper_curve, lower_curve, direction):
+    """
+    The upper and lower mid guides. Both start at their curve's middle CV on its tangent,
+    then aim their Y axes at each other keeping their own Y rotation, and the lower one is
+    brought level with the upper one in Z and back onto the lower lid.
+    """
+    mid_cv = lower_curve.mid_cv
+    upper_position, lower_position = upper_curve.cvs[mid_cv], lower_curve.cvs[mid_cv]
+    aim_vector = (direction, 0.0, 0.0)
+    upper_matrix = tangent_matrices(upper_curve, upper_position, aim_vector)[0]
+    lower_matrix = tangent_matrices(lower_curve, lower_position, aim_vector)[0]
+
+    # The aims have no world up, each node's own Z axis stands in for it
+    lower_matrix = transformMath.aim_matrices(lower_position, upper_position, (0.0, -direction, 0.0), (0.0, 0.0, 1.0), world_up_type="objectrotation",
+                                              world_up_vector=(0.0, 0.0, 1.0), world_up_matrix=lower_matrix, skip="y", current_rotations=lower_matrix[:3, :3])
+    upper_matrix = transformMath.aim_matrices(upper_position, lower_position, (0.0, direction, 0.0), (0.0, 0.0, 1.0), world_up_type="objectrotation",
+                                              world_up_vector=(0.0, 0.0, 1.0), world_up_matrix=upper_matrix, skip="y", current_rotations=upper_matrix[:3, :3])
+
+    level = transformMath.point_translations(lower_position, upper_position, skip="xy")
+    lower_matrix[3, :3] = lower_curve.points(lower_curve.closest_parameters(level))[0]
+
+    return upper_matrix, lower_matrix
+
+
+def lid_matrices(upper_curve, lower_curve):
+    """Guides along both lids, each as [Tweak00, Mid, Tweak01] matrices."""
+    direction = lower_curve.direction
+    upper_mid, lower_mid = mid_matrices(upper_curve, lower_curve, direction)
+
+    upper_tweaks = tweak_matrices(upper_curve, direction)
+    lower_tweaks = tweak_matrices(lower_curve, direction)
+
+    return [upper_tweaks[0], upper_mid, upper_tweaks[1]], [lower_tweaks[0], lower_mid, lower_tweaks[1]]
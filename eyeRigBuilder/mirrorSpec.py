@@ -0,0 +1,328 @@
+"""
+Mirrored builds from a recorded spec of the source side.
+
+Duplicating a finished left side, scaling it by -1 and renaming every descendant costs a
+rename, objectType and listRelatives call per node and leaves a negative scale group in
+the rig. Instead read_spec() records the left hierarchy once through the API: names,
+parents, world matrices, curve shapes, display values, dynamic attributes, channel states
+and incoming connections. mirror_spec() turns that into the right side's spec as plain
+data work, with one name map for every node and all the matrices mirrored in one NumPy
+call. build_spec() then creates the whole side on a GraphBuilder, one commit for the
+nodes and one for the attribute values and connections.
+
+Nodes are mirrored the way mirrorJoint's behavior mode mirrors joints (see
+transformMath.mirror_matrices): every node keeps positive scale, zeroed controls stay
+zeroed and the same rotate values give mirrored motion on both sides. The side's root
+takes a 180 degree turn in place of the -1 scale.
+"""
+import numpy as np
+from riggingTools import symmetry
+from riggingTools import transformMath
+
+
+# Channel states carried over to mirrored transforms
+CHANNELS = [f"{attribute}{axis}" for attribute in ("translate", "rotate", "scale") for axis in "XYZ"] + ["visibility"]
+
+# Static attributes copied by value, with the type they are read and written as
+VALUE_ATTRIBUTES = {"overrideEnabled": bool, "overrideColor": int, "lineWidth": float, "localScaleX": float,
+                    "localScaleY": float, "localScaleZ": float, "localPositionX": float, "localPositionY": float,
+                    "localPositionZ": float}
+
+# Values that are positions in the node's own space, they flip with its axes
+LOCAL_POSITION_ATTRIBUTES = {"localPositionX", "localPositionY", "localPositionZ"}
+
+
+def _plug_name(plug):
+    return plug.partialName(includeNodeName=True, includeNonMandatoryIndices=True, useFullAttributePath=True, useLongNames=True)
+
+
+def _rename_plug(plug, names):
+    node, dot, attribute = plug.partition(".")
+    node = node.split("|")[-1]
+
+    return f"{names.get(node, node)}{dot}{attribute}"
+
+
+def _get_dag_path(node):
+    import maya.api.OpenMaya as om2
+
+    selection = om2.MSelectionList()
+    selection.add(node)
+
+    return selection.getDagPath(0)
+
+
+def _read_value(plug, value_type):
+    if value_type is bool:
+        return plug.asBool()
+    if value_type is int:
+        return plug.asInt()
+
+    return plug.asDouble()
+
+
+def _read_attributes(node_fn):
+    """Specs for a node's dynamic single value numeric and enum attributes, others are left out."""
+    import maya.api.OpenMaya as om2
+
+    integer_types = {om2.MFnNumericData.kByte, om2.MFnNumericData.kChar, om2.MFnNumericData.kShort,
+                     om2.MFnNumericData.kInt, om2.MFnNumericData.kLong}
+
+    attributes = []
+    for index in range(node_fn.attributeCount()):
+        attribute = node_fn.attribute(index)
+        attribute_fn = om2.MFnAttribute(attribute)
+        if not attribute_fn.dynamic or not attribute_fn.parent.isNull():
+            continue
+
+        plug = node_fn.findPlug(attribute, False)
+        spec = {"name": attribute_fn.name, "short_name": attribute_fn.shortName, "keyable": attribute_fn.keyable}
+
+        if attribute.hasFn(om2.MFn.kEnumAttribute):
+            enum_fn = om2.MFnEnumAttribute(attribute)
+            fields = []
+            for value in range(enum_fn.getMin(), enum_fn.getMax() + 1):
+                try:
+                    fields.append((enum_fn.fieldName(value), value))
+                except RuntimeError:
+                    continue
+            spec.update(kind="enum", fields=fields, default=enum_fn.default, value=plug.asInt())
+        elif attribute.hasFn(om2.MFn.kNumericAttribute):
+            numeric_fn = om2.MFnNumericAttribute(attribute)
+            numeric_type = numeric_fn.numericType()
+            if numeric_type not in integer_types | {om2.MFnNumericData.kBoolean, om2.MFnNumericData.kFloat, om2.MFnNumericData.kDouble}:
+                continue
+            value_type = bool if numeric_type == om2.MFnNumericData.kBoolean else int if numeric_type in integer_types else float
+            spec.update(kind="numeric", type=numeric_type, default=numeric_fn.default,
+                        min=numeric_fn.getMin() if numeric_fn.hasMin() else None,
+                        max=numeric_fn.getMax() if numeric_fn.hasMax() else None,
+                        value=_read_value(plug, value_type))
+        else:
+            continue
+
+        attributes.append(spec)
+
+    return attributes
+
+
+def read_spec(root, exclude=None, outside_connections=True):
+    """
+    Records a hierarchy through the API without any cmds calls. Nodes whose name exclude
+    returns True for are left out with everything under them, and outside_connections=False
+    keeps only the connections between recorded nodes. The spec is a dict of
+    nodes: one dict per node, parents before children
+    matrices: (n, 4, 4) world matrices, a shape has its transform's
+    instances: (shape, extra parent) for every instanced shape
+    connections: (source plug, destination plug) for every connection into the hierarchy
+    root_parent: the root's parent, None under the world
+    """
+    import maya.api.OpenMaya as om2
+
+    root_path = _get_dag_path(root)
+    parent_path = om2.MDagPath(root_path)
+    parent_path.pop()
+    root_parent = om2.MFnDagNode(parent_path).name() if parent_path.length() else None
+
+    iterator = om2.MItDag()
+    iterator.reset(root_path, om2.MItDag.kDepthFirst)
+
+    nodes, matrices, instances, connections = [], [], [], []
+    seen = set()
+    while not iterator.isDone():
+        path = iterator.getPath()
+        node_fn = om2.MFnDagNode(path)
+        name = node_fn.name()
+
+        parent = None
+        if iterator.depth():
+            parent_path = om2.MDagPath(path)
+            parent_path.pop()
+            parent = om2.MFnDagNode(parent_path).name()
+
+        if exclude is not None and exclude(name):
+            iterator.prune()
+            iterator.next()
+            continue
+
+        # Instances are the same node under another parent, the first visit records it
+        handle = om2.MObjectHandle(path.node()).hashCode()
+        if handle in seen:
+            instances.append((name, parent))
+            iterator.prune()
+            iterator.next()
+            continue
+        seen.add(handle)
+
+        is_shape = path.node().hasFn(om2.MFn.kShape)
+        node = {"name": name, "type": node_fn.typeName, "parent": parent, "shape": is_shape, "curve": None,
+                "values": {}, "attributes": _read_attributes(node_fn), "channels": {}}
+
+        if path.node().hasFn(om2.MFn.kNurbsCurve):
+            curve_fn = om2.MFnNurbsCurve(path)
+            node["curve"] = {"cvs": [list(point)[:3] for point in curve_fn.cvPositions(om2.MSpace.kObject)],
+                             "knots": list(curve_fn.knots()), "degree": curve_fn.degree, "form": curve_fn.form}
+
+        for attribute, value_type in VALUE_ATTRIBUTES.items():
+            if node_fn.hasAttribute(attribute):
+                node["values"][attribute] = _read_value(node_fn.findPlug(attribute, False), value_type)
+
+        if not is_shape:
+            for channel in CHANNELS:
+                plug = node_fn.findPlug(channel, False)
+                node["channels"][channel] = (plug.isLocked, plug.isKeyable, plug.isChannelBox)
+
+        for plug in node_fn.getConnections():
+            if plug.isDestination:
+                connections.append((_plug_name(plug.source()), _plug_name(plug)))
+
+        nodes.append(node)
+        matrices.append(np.array(list(path.inclusiveMatrix()), dtype=float).reshape(4, 4))
+        iterator.next()
+
+    if not outside_connections:
+        recorded = {node["name"] for node in nodes}
+        connections = [(source, destination) for source, destination in connections if source.split(".", 1)[0].split("|")[-1] in recorded]
+
+    return {"nodes": nodes, "matrices": np.array(matrices).reshape(-1, 4, 4), "instances": instances,
+            "connections": connections, "root_parent": root_parent}
+
+
+def mirror_name(name, source_prefix="L_", target_prefix="R_"):
+    """The mirrored side's name, names without the source prefix get the target prefix added."""
+    mirrored = symmetry.mirror_name(name, source_prefix, target_prefix)
+
+    return mirrored if mirrored != name else f"{target_prefix}{name}"
+
+
+def mirror_spec(spec, source_prefix="L_", target_prefix="R_", axis=0):
+    """
+    The spec for the other side. Names are swapped through one map, kept in the result as
+    name_map (source name: mirrored name), connections from outside the hierarchy keep
+    their source unless it was mirrored too.
+    """
+    names = {node["name"]: mirror_name(node["name"], source_prefix, target_prefix) for node in spec["nodes"]}
+
+    nodes = []
+    for node in spec["nodes"]:
+        mirrored = dict(node, name=names[node["name"]], parent=names.get(node["parent"]), values=dict(node["values"]))
+
+        # Every local axis flips, so positions in the node's own space flip with them
+        if node["curve"] is not None:
+            mirrored["curve"] = dict(node["curve"], cvs=(-np.asarray(node["curve"]["cvs"], dtype=float)).tolist())
+        for attribute in LOCAL_POSITION_ATTRIBUTES.intersection(mirrored["values"]):
+            mirrored["values"][attribute] = -mirrored["values"][attribute]
+
+        nodes.append(mirrored)
+
+    return {
+        "nodes": nodes,
+        "matrices": transformMath.mirror_matrices(spec["matrices"], axis),
+        "instances": [(names.get(shape, shape), names.get(parent, parent)) for shape, parent in spec["instances"]],
+        "connections": [(_rename_plug(source, names), _rename_plug(destination, names)) for source, destination in spec["connections"]],
+        "root_parent": spec["root_parent"],
+        "name_map": names,
+    }
+
+
+def _create_attribute(attribute):
+    import maya.api.OpenMaya as om2
+
+    if attribute["kind"] == "enum":
+        attribute_fn = om2.MFnEnumAttribute()
+        obj = attribute_fn.create(attribute["name"], attribute["short_name"], attribute["default"])
+        for field, value in attribute["fields"]:
+            attribute_fn.addField(field, value)
+    else:
+        attribute_fn = om2.MFnNumericAttribute()
+        obj = attribute_fn.create(attribute["name"], attribute["short_name"], attribute["type"], attribute["default"])
+        if attribute["min"] is not None:
+            attribute_fn.setMin(attribute["min"])
+        if attribute["max"] is not None:
+            attribute_fn.setMax(attribute["max"])
+
+    attribute_fn.keyable = attribute["keyable"]
+
+    return obj
+
+
+def _create_curve_data(curve):
+    import maya.api.OpenMaya as om2
+
+    data = om2.MFnNurbsCurveData().create()
+    om2.MFnNurbsCurve().create(om2.MPointArray(curve["cvs"]), curve["knots"], curve["degree"], curve["form"], False, True, data)
+
+    return data
+
+
+def build_spec(spec, parent=None):
+    """
+    Creates a spec's nodes under parent, or under the spec's root_parent when none is given.
+    Returns {spec name: scene name}, the two differ when a name was already taken.
+    """
+    import maya.api.OpenMaya as om2
+    from riggingTools.graphBuilder import GraphBuilder
+    from riggingTools.sceneCache import cmds
+
+    parent = parent if parent is not None else spec["root_parent"]
+    nodes = spec["nodes"]
+    matrices = spec["matrices"]
+
+    index = {node["name"]: number for number, node in enumerate(nodes)}
+    root_matrix = np.array(list(_get_dag_path(parent).inclusiveMatrix()), dtype=float).reshape(4, 4) if parent else np.eye(4)
+    parent_matrices = np.array([matrices[index[node["parent"]]] if node["parent"] in index else root_matrix for node in nodes]).reshape(-1, 4, 4)
+
+    rotations, translations, scales = transformMath.decompose(transformMath.local_matrices(matrices, parent_matrices))
+    angles = transformMath.euler_from_rotation(rotations)
+
+    # The nodes, their transforms, shapes and dynamic attributes
+    graph = GraphBuilder()
+    created = {}
+    for number, node in enumerate(nodes):
+        graph_node = graph.create_node(node["type"], node["name"], parent=created[node["parent"]] if node["parent"] else parent)
+        created[node["name"]] = graph_node
+
+        if not node["shape"]:
+            rotate = "jointOrient" if node["type"] == "joint" else "rotate"
+            for axis, translate, angle, scale in zip("XYZ", translations[number], angles[number], scales[number]):
+                graph.set_attr(graph_node, f"translate{axis}", translate)
+                graph.set_attr(graph_node, f"{rotate}{axis}", angle)
+                graph.set_attr(graph_node, f"scale{axis}", scale)
+
+        if node["curve"] is not None:
+            graph.set_data(graph_node, "cached", _create_curve_data(node["curve"]))
+
+        for attribute, value in node["values"].items():
+            graph.set_attr(graph_node, attribute, value)
+
+        for attribute in node["attributes"]:
+            graph.add_attribute(graph_node, _create_attribute(attribute))
+
+    names = dict(zip([node["name"] for node in nodes], graph.commit()))
+
+    # Dynamic attributes only have plugs once they exist
+    values = GraphBuilder()
+    for node in nodes:
+        for attribute in node["attributes"]:
+            values.set_attr(names[node["name"]], attribute["name"], attribute["value"])
+
+    for source, destination in spec["connections"]:
+        source_node, source_attribute = _rename_plug(source, names).split(".", 1)
+        destination_node, destination_attribute = _rename_plug(destination, names).split(".", 1)
+        values.connect(source_node, source_attribute, destination_node, destination_attribute)
+
+    values.commit()
+
+    for node in nodes:
+        node_fn = om2.MFnDependencyNode(_get_dag_path(names[node["name"]]).node())
+        for channel, (locked, keyable, channel_box) in node["channels"].items():
+            plug = node_fn.findPlug(channel, False)
+            plug.isKeyable = keyable
+            plug.isChannelBox = channel_box
+            plug.isLocked = locked
+
+    for shape, shape_parent in spec["instances"]:
+        cmds.parent(names.get(shape, shape), names.get(shape_parent, shape_parent), add=True, shape=True)
+
+    cmds.invalidate(list(names.values()))
+
+    return names
@@ -0,0 +1,34 @@
+"""
+Caches shared by every rig built in one session.
+
+Building a batch of characters repeats the same analysis on matching geometry: the arc
+length tables of the iris and pupil curves, the vertex symmetry maps used to mirror skin
+weights and the solved eye weights themselves. A RigSession holds one of each cache and
+is handed to every rig in the batch. The curve and symmetry caches are keyed by the
+points they were built from, so a variant whose eyes match an earlier one reuses its
+tables even though its nodes have different names.
+"""
+from riggingTools import arcLength
+from riggingTools import symmetry
+
+
+class RigSession:
+    def __init__(self, skin_cache=None):
+        self.arc_lengths = arcLength.ArcLengthCache()
+        self.symmetry_maps = symmetry.SymmetryMapCache()
+        # A weightCache.SkinWeightCache, used by skin_eyes when no other cache is given
+        self.skin_cache = skin_cache
+        self.rigs = {}
+        self.failures = {}
+
+    def report(self):
+        """What was built and what the shared caches hold."""
+        lines = [f"Rig session: {len(self.rigs)} built, {len(self.failures)} failed"]
+        lines.append(f"    {len(self.arc_lengths.tables)} curve tables, {len(self.symmetry_maps.maps)} symmetry maps")
+        if self.skin_cache is not None:
+            lines.append(f"    skin cache {self.skin_cache.hits} hits, {self.skin_cache.misses} misses")
+
+        for prefix, error in self.failures.items():
+            lines.append(f"    {prefix or '(no prefix)'} failed: {error}")
+
+        return "\n".join(lines)
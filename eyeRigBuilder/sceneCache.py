@@ -0,0 +1,239 @@
+"""
+Write-through cache for read-only maya.cmds queries during a rig build.
+
+Import cmds from here instead of maya.cmds. Outside a build every call goes straight
+through. Inside cmds.build() read-only queries (listRelatives, xform -q, arclen,
+getAttr, ...) are memoized, and every other command is treated as a mutation that
+invalidates the entries it could have changed:
+
+- Structural queries (hierarchy, node types, connections, topology) are dropped when a
+  mutation names one of the nodes in the query's arguments or result.
+- Evaluated queries (positions, lengths, attribute values) can change through parents
+  and connections, so any mutation drops them.
+- Selection based queries are dropped whenever the selection changes.
+- Commands that can reach anything (delete, undo, mel) clear the whole cache.
+  Commands given no nodes work on the selection, so the selected nodes count as named.
+
+Hit rates are recorded per build step (see build_step) so cmds.report() shows which
+steps benefit, and the nodes named by each step's mutations are recorded in cmds.created
+so a graph report can say which step built them.
+"""
+import contextlib
+import copy
+import functools
+from collections import Counter, defaultdict
+import maya.cmds as maya_cmds
+
+
+# Commands that never change the scene, unless they are asked to build history
+QUERY_COMMANDS = {
+    "arclen", "attributeQuery", "exactWorldBoundingBox", "getAttr", "listAttr", "listConnections", "listHistory",
+    "listRelatives", "ls", "nodeType", "objExists", "objectType", "pointOnCurve", "pointPosition", "polyEvaluate",
+    "polyInfo", "polyListComponentConversion",
+}
+
+# Queries whose result only depends on the nodes they name
+STRUCTURAL_COMMANDS = {
+    "attributeQuery", "listAttr", "listConnections", "listRelatives", "ls", "nodeType", "objExists", "objectType",
+    "polyEvaluate", "polyInfo", "polyListComponentConversion",
+}
+
+# Flags that make a structural query depend on the rest of the hierarchy
+HIERARCHY_FLAGS = {"allParents", "ap", "parent", "p", "fullPath", "f", "long", "l", "allDescendents", "ad"}
+
+SELECTION_COMMANDS = {"select"}
+
+# Creation commands that never act on the selection, even without node arguments
+SELECTION_FREE_COMMANDS = {"createNode", "spaceLocator", "circle", "curve", "shadingNode"}
+
+CLEARING_COMMANDS = {"delete", "undo", "redo", "file", "eval", "evalDeferred"}
+
+
+def _node_names(value, nodes):
+    """Collects the node part of every string in a (possibly nested) value."""
+    if isinstance(value, str):
+        node = value.split(".", 1)[0].split("|")[-1]
+        if node:
+            nodes.add(node)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _node_names(item, nodes)
+
+    return nodes
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class QueryCache:
+    def __init__(self, commands=maya_cmds):
+        self.commands = commands
+        self.active = 0
+        self.steps = []
+        self.entries = {}
+        self.node_index = defaultdict(set)
+        self.evaluated_keys = set()
+        self.selection_keys = set()
+        self.stats = defaultdict(Counter)
+        self.created = {}
+
+    def __getattr__(self, name):
+        command = getattr(self.commands, name)
+
+        @functools.wraps(command)
+        def wrapper(*args, **flags):
+            return self.call(name, command, args, flags)
+
+        # Keep the wrapper so later lookups skip __getattr__
+        setattr(self, name, wrapper)
+
+        return wrapper
+
+    @property
+    def current_step(self):
+        return self.steps[-1] if self.steps else "build"
+
+    def is_query(self, name, flags):
+        if flags.get("query") or flags.get("q"):
+            return True
+
+        return name in QUERY_COMMANDS and not (flags.get("constructionHistory") or flags.get("ch"))
+
+    def call(self, name, command, args, flags):
+        if not self.active:
+            return command(*args, **flags)
+
+        if self.is_query(name, flags):
+            return self.query(name, command, args, flags)
+
+        # Commands without node arguments work on the selection, read it before it changes
+        selection = []
+        if not args and name not in SELECTION_COMMANDS | SELECTION_FREE_COMMANDS and not (flags.get("empty") or flags.get("em")):
+            selection = self.query("ls", self.commands.ls, (), {"selection": True})
+
+        result = command(*args, **flags)
+        self.mutated(name, args, flags, result, selection)
+
+        return result
+
+    def query(self, name, command, args, flags):
+        key = (name, _freeze(args), tuple(sorted((flag, _freeze(value)) for flag, value in flags.items())))
+        stats = self.stats[self.current_step]
+
+        if key in self.entries:
+            stats[f"{name}.hits"] += 1
+            return copy.copy(self.entries[key])
+
+        stats[f"{name}.misses"] += 1
+        result = command(*args, **flags)
+        self.entries[key] = result
+
+        if not args or flags.get("selection") or flags.get("sl"):
+            self.selection_keys.add(key)
+
+        if name in STRUCTURAL_COMMANDS and args and not HIERARCHY_FLAGS.intersection(flags) and "*" not in str(args):
+            for node in _node_names([args, result], set()):
+                self.node_index[node].add(key)
+        else:
+            self.evaluated_keys.add(key)
+
+        return copy.copy(result)
+
+    def _drop(self, keys):
+        for key in keys:
+            self.entries.pop(key, None)
+
+    def mutated(self, name, args, flags, result, selection=()):
+        """Drops every entry a mutating command could have changed."""
+        if name in SELECTION_COMMANDS:
+            self._drop(self.selection_keys)
+            self.selection_keys.clear()
+            return
+
+        if name in CLEARING_COMMANDS:
+            self.invalidate()
+            return
+
+        flag_values = [value for value in flags.values() if isinstance(value, (str, list, tuple))]
+        self.invalidate(_node_names([args, flag_values, result, selection], set()))
+        self.record_created(result)
+
+    def record_created(self, nodes):
+        """Attributes nodes to the current build step, the first step to name a node keeps it."""
+        if not self.active:
+            return
+
+        for node in _node_names(nodes, set()):
+            self.created.setdefault(node, self.current_step)
+
+    def invalidate(self, nodes=None):
+        """Drops the entries for the given node names, and every evaluated entry. With no nodes, clears everything."""
+        if nodes is None:
+            self.entries.clear()
+            self.node_index.clear()
+            self.evaluated_keys.clear()
+            self.selection_keys.clear()
+            return
+
+        self._drop(self.evaluated_keys)
+        self.evaluated_keys.clear()
+        self._drop(self.selection_keys)
+        self.selection_keys.clear()
+
+        for node in nodes:
+            self._drop(self.node_index.pop(node, ()))
+
+    @contextlib.contextmanager
+    def build(self, report=True):
+        """Caches queries for the duration of a build. Nested builds share the outer build's cache."""
+        if not self.active:
+            self.created.clear()
+        self.active += 1
+        try:
+            yield self
+        finally:
+            self.active -= 1
+            if not self.active:
+                if report:
+                    print(self.report())
+                self.invalidate()
+                self.stats.clear()
+
+    @contextlib.contextmanager
+    def step(self, name):
+        """Records hits and misses under a build step name."""
+        self.steps.append(name)
+        try:
+            yield
+        finally:
+            self.steps.pop()
+
+    def report(self):
+        """Hit rate per build step, busiest steps first."""
+        lines = ["Scene query cache:"]
+        rows = []
+        for step, stats in self.stats.items():
+            hits = sum(count for counter, count in stats.items() if counter.endswith(".hits"))
+            misses = sum(count for counter, count in stats.items() if counter.endswith(".misses"))
+            rows.append((hits + misses, hits, step))
+
+        for total, hits, step in sorted(rows, reverse=True):
+            lines.append(f"    {step:<45} {hits:6d} / {total:<6d} hits ({100.0 * hits / total:5.1f}%)")
+
+        return "\n".join(lines)
+
+
+cmds = QueryCache()
+
+
+def build_step(method):
+    """Decorator that records a method's queries under its own name in the cache report."""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with cmds.step(method.__name__):
+            return method(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,162 @@
+"""
+Bulk scene reads and writes for eye skinning.
+
+Each function touches the scene a fixed number of times no matter how many vertices
+are involved, so the per vertex xform and skinPercent calls can be replaced by one
+read, a NumPy solve and one write.
+"""
+import re
+import numpy as np
+import maya.api.OpenMaya as om2
+import maya.api.OpenMayaAnim as oma2
+from riggingTools.sceneCache import cmds
+
+
+_VERTEX_PATTERN = re.compile(r"^(?P<mesh>.+)\.vtx\[(?P<start>\d+)(?::(?P<end>\d+))?\]$")
+_EDGE_PATTERN = re.compile(r"^(?P<mesh>.+)\.e\[(?P<start>\d+)(?::(?P<end>\d+))?\]$")
+
+
+def component_indices(components):
+    """
+    Returns the mesh name and the sorted, unique vertex indices for a list of vertex components.
+    Accepts flattened components (mesh.vtx[3]) and compact ranges (mesh.vtx[3:10]).
+    """
+    return _component_indices(components, _VERTEX_PATTERN, "vertex")
+
+
+def edge_indices(components):
+    """Returns the mesh name and the sorted, unique edge indices for a list of edge components."""
+    return _component_indices(components, _EDGE_PATTERN, "edge")
+
+
+def _component_indices(components, pattern, kind):
+    mesh = None
+    indices = []
+
+    for component in components:
+        match = pattern.match(component)
+        if match is None:
+            raise ValueError(f"Not a {kind} component: {component}")
+
+        if mesh is None:
+            mesh = match.group("mesh")
+        elif match.group("mesh") != mesh:
+            raise ValueError(f"Components span more than one mesh: {mesh}, {match.group('mesh')}")
+
+        start = int(match.group("start"))
+        end = int(match.group("end") or start)
+        indices.append(np.arange(start, end + 1))
+
+    if not indices:
+        return mesh, np.empty(0, dtype=int)
+
+    return mesh, np.unique(np.concatenate(indices))
+
+
+def vertex_components(mesh, indices, component="vtx"):
+    """Returns the shortest list of mesh.vtx[a:b] (or mesh.e[a:b]) ranges covering the given sorted indices."""
+    indices = np.asarray(indices, dtype=int)
+    if not len(indices):
+        return []
+
+    # Split wherever the index sequence jumps
+    breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+    starts = np.concatenate(([indices[0]], indices[breaks]))
+    ends = np.concatenate((indices[breaks - 1], [indices[-1]]))
+
+    return [f"{mesh}.{component}[{start}:{end}]" for start, end in zip(starts, ends)]
+
+
+def get_points(mesh, indices):
+    """World space positions of the given vertices, in index order, from a single xform query."""
+    components = vertex_components(mesh, indices)
+    if not components:
+        return np.empty((0, 3))
+
+    return np.array(cmds.xform(components, query=True, translation=True, worldSpace=True), dtype=float).reshape(-1, 3)
+
+
+def get_positions(transforms):
+    """World space positions of a list of transforms as an (n, 3) array."""
+    return np.array([cmds.xform(obj, query=True, translation=True, worldSpace=True) for obj in transforms], dtype=float).reshape(-1, 3)
+
+
+def get_edge_vertices(mesh, indices):
+    """Vertex index pairs of the given sorted edge indices as an (n, 2) array, in index order, from a single polyInfo query."""
+    components = vertex_components(mesh, indices, "e")
+    if not components:
+        return np.empty((0, 2), dtype=int)
+
+    # Each line reads "EDGE    12:     4     5  Hard"
+    pairs = {}
+    for line in cmds.polyInfo(components, edgeToVertex=True) or []:
+        label, values = line.split(":")
+        pairs[int(label.split()[1])] = [int(value) for value in values.split()[:2]]
+
+    return np.array([pairs[index] for index in indices], dtype=int).reshape(-1, 2)
+
+
+def get_face_edges(faces):
+    """Vertex index pairs for every edge of the given faces as an (n, 2) array, from a single polyInfo query."""
+    edges = cmds.polyListComponentConversion(faces, toEdge=True)
+    edge_info = cmds.polyInfo(edges, edgeToVertex=True) or []
+
+    # Each line reads "EDGE    12:     4     5  Hard"
+    pairs = [[int(value) for value in line.split(":")[1].split()[:2]] for line in edge_info]
+
+    return np.array(pairs, dtype=int).reshape(-1, 2)
+
+
+def _get_skin_cluster_fn(skin_cluster):
+    selection = om2.MSelectionList()
+    selection.add(skin_cluster)
+    skin_fn = oma2.MFnSkinCluster(selection.getDependNode(0))
+    shape = skin_fn.getPathAtIndex(0)
+
+    return skin_fn, shape
+
+
+def _create_vertex_component(indices):
+    component_fn = om2.MFnSingleIndexedComponent()
+    component = component_fn.create(om2.MFn.kMeshVertComponent)
+    component_fn.addElements([int(index) for index in indices])
+
+    return component
+
+
+def get_influences(skin_cluster):
+    """Influence names in the same order as the columns returned by read_weights."""
+    skin_fn, shape = _get_skin_cluster_fn(skin_cluster)
+
+    return [path.partialPathName() for path in skin_fn.influenceObjects()]
+
+
+def read_weights(skin_cluster, indices):
+    """
+    Reads the full weight table for the given sorted vertex indices in one call.
+    Returns an (n_vertices, n_influences) array and the influence names for its columns.
+    """
+    skin_fn, shape = _get_skin_cluster_fn(skin_cluster)
+    influences = [path.partialPathName() for path in skin_fn.influenceObjects()]
+
+    weights, influence_count = skin_fn.getWeights(shape, _create_vertex_component(indices))
+
+    return np.array(weights, dtype=float).reshape(-1, influence_count), influences
+
+
+def write_weights(skin_cluster, indices, weights):
+    """
+    Writes an (n_vertices, n_influences) weight table for the given sorted vertex indices in one call.
+    Columns must follow the order returned by get_influences.
+    """
+    skin_fn, shape = _get_skin_cluster_fn(skin_cluster)
+    weights = np.asarray(weights, dtype=float)
+
+    influence_indices = om2.MIntArray(list(range(weights.shape[1])))
+    values = om2.MDoubleArray(weights.ravel().tolist())
+
+    skin_fn.setWeights(shape, _create_vertex_component(indices), influence_indices, values, False)
+
+    # API writes bypass cmds, so drop anything cached from the deformed mesh
+    cmds.invalidate([skin_cluster, shape.partialPathName()])
+
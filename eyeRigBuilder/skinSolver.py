@@ -0,0 +1,165 @@
+"""
+Array based solvers for eye skinning.
+
+Nothing in here talks to Maya. Positions and weight tables come in as NumPy arrays
+(read in bulk with skinIO) and the results go back out the same way, so a whole
+eye can be solved in a handful of vectorized passes.
+"""
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    # scipy does not ship with mayapy, fall back to chunked brute force
+    cKDTree = None
+
+
+# Above this many vertex/joint pairs a KD-tree is quicker than brute force
+KD_TREE_THRESHOLD = 2000000
+
+# Rows processed per brute force chunk, keeps the distance table small
+CHUNK_SIZE = 4096
+
+# Default ring binning tolerance, as a fraction of the eye's largest vertex distance
+RING_TOLERANCE = 0.01
+
+
+def closest_joint_indices(points, joint_points):
+    """Returns the index of the closest joint for every point."""
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    joint_points = np.asarray(joint_points, dtype=float).reshape(-1, 3)
+
+    if cKDTree is not None and len(points) * len(joint_points) > KD_TREE_THRESHOLD:
+        return cKDTree(joint_points).query(points)[1]
+
+    closest = np.empty(len(points), dtype=int)
+    for start in range(0, len(points), CHUNK_SIZE):
+        chunk = points[start:start + CHUNK_SIZE]
+        # Rounded to lengths like MVector.length(), so a vertex halfway between two joints goes to the first, as per vertex loops did
+        distances = np.sqrt(((chunk[:, None, :] - joint_points[None, :, :]) ** 2).sum(axis=2))
+        closest[start:start + CHUNK_SIZE] = distances.argmin(axis=1)
+
+    return closest
+
+
+def k_nearest_joints(points, joint_points, k=2, mode="inverse", power=2.0, sigma=None):
+    """
+    Finds the k closest joints for every point and blends between them.
+    Returns two (n_points, k) arrays: joint indices and normalized weights.
+
+    mode "inverse" weights by 1 / distance ** power, "gaussian" by exp(-d^2 / (2 sigma^2)).
+    sigma defaults to the median spacing between neighbouring joints.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    joint_points = np.asarray(joint_points, dtype=float).reshape(-1, 3)
+    k = min(k, len(joint_points))
+
+    if cKDTree is not None and len(points) * len(joint_points) > KD_TREE_THRESHOLD:
+        distances, joints = cKDTree(joint_points).query(points, k=k)
+        distances = distances.reshape(len(points), k)
+        joints = joints.reshape(len(points), k)
+    else:
+        joints = np.empty((len(points), k), dtype=int)
+        distances = np.empty((len(points), k))
+        for start in range(0, len(points), CHUNK_SIZE):
+            chunk = points[start:start + CHUNK_SIZE]
+            chunk_distances = np.sqrt(((chunk[:, None, :] - joint_points[None, :, :]) ** 2).sum(axis=2))
+            nearest = np.argsort(chunk_distances, axis=1, kind="stable")[:, :k]
+            joints[start:start + CHUNK_SIZE] = nearest
+            distances[start:start + CHUNK_SIZE] = np.take_along_axis(chunk_distances, nearest, axis=1)
+
+    if mode == "inverse":
+        # A point sitting on a joint takes all of its weight
+        on_joint = distances[:, :1] < 1e-8
+        weights = np.where(on_joint, (np.arange(k) == 0).astype(float), 1.0 / np.maximum(distances, 1e-8) ** power)
+    elif mode == "gaussian":
+        if sigma is None:
+            spacing = np.sqrt(((joint_points[:, None, :] - joint_points[None, :, :]) ** 2).sum(axis=2))
+            np.fill_diagonal(spacing, np.inf)
+            sigma = np.median(spacing.min(axis=1)) if len(joint_points) > 1 else 1.0
+        # Measured relative to the closest joint so far away points don't underflow to zero
+        weights = np.exp(-(distances ** 2 - distances[:, :1] ** 2) / (2.0 * sigma ** 2))
+    else:
+        raise ValueError(f"Unknown blend mode: {mode}. Use 'inverse' or 'gaussian'")
+
+    return joints, weights / weights.sum(axis=1, keepdims=True)
+
+
+def set_transform_values(weights, columns, values):
+    """
+    Applies skinPercent -transformValue to a whole weight table at once.
+
+    For each row the influence in `columns` is set to `values` and the remaining
+    influences are rescaled so the row still sums to one, the same way skinPercent
+    normalizes when it is given a single joint and value.
+
+    columns and values can also be (n_rows, k) arrays to set several influences per row,
+    as produced by k_nearest_joints.
+    """
+    weights = np.array(weights, dtype=float)
+    columns = np.asarray(columns, dtype=int).reshape(len(weights), -1)
+    values = np.asarray(values, dtype=float)
+    if values.ndim:
+        values = values.reshape(len(weights), -1)
+    values = np.broadcast_to(values, columns.shape)
+
+    others = weights.sum(axis=1) - np.take_along_axis(weights, columns, axis=1).sum(axis=1)
+    remainder = 1.0 - values.sum(axis=1)
+    scale = np.divide(remainder, others, out=np.zeros_like(others), where=others > 0)
+
+    weights *= scale[:, None]
+    np.put_along_axis(weights, columns, values, axis=1)
+
+    return weights
+
+
+def bin_rings(distances, tolerance=None):
+    """
+    Groups vertices into rings (edge loops) by their distance to the eye center.
+    Distances are sorted and a new ring starts wherever the gap to the previous
+    distance is larger than the tolerance. Returns the ring index of every vertex,
+    counting outwards from zero.
+
+    The tolerance is in scene units and defaults to 1% of the largest distance,
+    0 groups vertices by exact distance.
+    """
+    distances = np.asarray(distances, dtype=float)
+    if not len(distances):
+        return np.empty(0, dtype=int)
+
+    if tolerance is None:
+        tolerance = RING_TOLERANCE * distances.max()
+
+    order = np.argsort(distances, kind="stable")
+    new_ring = np.diff(distances[order]) > tolerance
+
+    rings = np.empty(len(distances), dtype=int)
+    rings[order] = np.concatenate(([0], np.cumsum(new_ring)))
+
+    return rings
+
+
+def topology_rings(vertex_count, edges, seeds):
+    """
+    Ring index of every vertex as the number of edge hops from the seed vertices.
+    Edges are an (n, 2) array of local vertex indices. Vertices that can't be reached
+    from the seeds are put in the outermost ring.
+    """
+    edges = np.asarray(edges, dtype=int).reshape(-1, 2)
+    rings = np.full(vertex_count, -1, dtype=int)
+
+    frontier = np.unique(np.asarray(seeds, dtype=int))
+    rings[frontier] = 0
+    level = 0
+
+    while frontier.size:
+        level += 1
+        touching = np.isin(edges, frontier).any(axis=1)
+        neighbours = np.unique(edges[touching])
+        frontier = neighbours[rings[neighbours] < 0]
+        rings[frontier] = level
+
+    rings[rings < 0] = rings.max() + 1
+
+    return rings
+
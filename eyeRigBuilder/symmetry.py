@@ -0,0 +1,192 @@
+"""
+Vertex symmetry maps for mirroring eye skin weights.
+
+A symmetry map gives, for every vertex on the target side, the index of the source
+vertex that sits at its mirrored position. Maps are built once per mesh pair with a
+nearest neighbour search and kept until the vertex positions change.
+
+mayapy has no SciPy, so without it the search runs on a PointGrid: the source vertices
+are bucketed into a uniform grid and each target vertex only measures the vertices in
+the 27 cells around it, a bounded amount of work and memory per vertex. The few whose
+match is further than a cell away, which a symmetric mesh doesn't have, fall back to a
+brute force search chunked over both point sets.
+"""
+import hashlib
+import numpy as np
+from riggingTools import skinSolver
+
+
+# Mesh vertices lie on a surface, so a grid with sqrt(points / POINTS_PER_CELL) cells per
+# axis puts about that many points in each occupied cell
+POINTS_PER_CELL = 2
+
+# Target points matched per pass, and source points per brute force block
+CHUNK_SIZE = 4096
+
+# The 27 cell offsets around and including a cell
+NEIGHBOUR_OFFSETS = np.stack(np.meshgrid(*([np.arange(-1, 2)] * 3), indexing="ij"), axis=-1).reshape(-1, 3)
+
+
+def mirror_points(points, axis=0):
+    """Reflects points across the plane through the origin normal to the given axis (0=X, 1=Y, 2=Z)."""
+    mirrored = np.array(points, dtype=float).reshape(-1, 3)
+    mirrored[:, axis] *= -1.0
+
+    return mirrored
+
+
+def brute_force_closest(points, source_points):
+    """Index of the closest source point for every point, chunked over both sets so memory stays bounded."""
+    closest = np.zeros(len(points), dtype=int)
+    for start in range(0, len(points), CHUNK_SIZE):
+        chunk = points[start:start + CHUNK_SIZE]
+        best = np.full(len(chunk), np.inf)
+        for source_start in range(0, len(source_points), CHUNK_SIZE):
+            distances = ((chunk[:, None, :] - source_points[None, source_start:source_start + CHUNK_SIZE, :]) ** 2).sum(axis=2)
+            nearest = distances.argmin(axis=1)
+            nearest_distances = distances[np.arange(len(chunk)), nearest]
+            # Strictly closer only, ties keep the lower index like a single argmin
+            closer = nearest_distances < best
+            best[closer] = nearest_distances[closer]
+            closest[start:start + CHUNK_SIZE][closer] = nearest[closer] + source_start
+
+    return closest
+
+
+class PointGrid:
+    """Source points bucketed into a uniform grid for nearest neighbour queries."""
+
+    def __init__(self, points, cell_size=None):
+        self.points = np.asarray(points, dtype=float).reshape(-1, 3)
+        self.low = self.points.min(axis=0)
+        extent = self.points.max(axis=0) - self.low
+
+        if cell_size is None:
+            cells_per_axis = max(1.0, np.ceil(np.sqrt(len(self.points) / POINTS_PER_CELL)))
+            cell_size = extent.max() / cells_per_axis
+        # All points in one spot still need a cell with some size
+        self.cell_size = cell_size if cell_size > 0.0 else 1.0
+
+        cells = self.cells(self.points)
+        self.shape = cells.max(axis=0) + 1
+        keys = np.ravel_multi_index(cells.T, self.shape)
+        self.order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.order]
+
+    def __repr__(self):
+        return f"PointGrid({len(self.points)} points, {tuple(self.shape)} cells)"
+
+    def cells(self, points):
+        return np.floor((points - self.low) / self.cell_size).astype(np.int64)
+
+    def _closest_in_neighbourhood(self, points):
+        """Closest point among the 27 cells around each point, -1 where they are all empty."""
+        neighbours = self.cells(points)[:, None, :] + NEIGHBOUR_OFFSETS[None, :, :]
+        inside = np.all((neighbours >= 0) & (neighbours < self.shape), axis=2)
+        keys = np.ravel_multi_index(np.clip(neighbours, 0, self.shape - 1).reshape(-1, 3).T, self.shape)
+
+        starts = np.searchsorted(self.sorted_keys, keys, side="left")
+        counts = np.where(inside.ravel(), np.searchsorted(self.sorted_keys, keys, side="right") - starts, 0)
+
+        # One row per (point, candidate) pair across all the cells
+        rows = np.repeat(np.repeat(np.arange(len(points)), len(NEIGHBOUR_OFFSETS)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        candidates = self.order[np.repeat(starts, counts) + offsets]
+        distances = ((points[rows] - self.points[candidates]) ** 2).sum(axis=1)
+
+        # Per point, the smallest distance and on ties the lowest index
+        ranked = np.lexsort((candidates, distances, rows))
+        found, first = np.unique(rows[ranked], return_index=True)
+
+        closest = np.full(len(points), -1, dtype=int)
+        best = np.full(len(points), np.inf)
+        closest[found] = candidates[ranked[first]]
+        best[found] = distances[ranked[first]]
+
+        return closest, best
+
+    def closest(self, points):
+        """Index of the closest grid point for every point."""
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+
+        closest = np.empty(len(points), dtype=int)
+        for start in range(0, len(points), CHUNK_SIZE):
+            chunk_closest, best = self._closest_in_neighbourhood(points[start:start + CHUNK_SIZE])
+
+            # Anything within a cell of the point is in its neighbourhood, further matches aren't certain
+            unsure = best > self.cell_size ** 2
+            if np.any(unsure):
+                chunk_closest[unsure] = brute_force_closest(points[start:start + CHUNK_SIZE][unsure], self.points)
+
+            closest[start:start + CHUNK_SIZE] = chunk_closest
+
+        return closest
+
+
+def closest_indices(points, source_points):
+    """Index of the closest source point for every point, through SciPy when it is there."""
+    if skinSolver.cKDTree is not None:
+        return skinSolver.cKDTree(source_points).query(points)[1]
+
+    return PointGrid(source_points).closest(points)
+
+
+def build_symmetry_map(source_points, target_points, axis=0):
+    """
+    Returns the index of the closest mirrored source vertex for every target vertex,
+    and how far each target vertex is from its match.
+    """
+    mirrored = mirror_points(target_points, axis)
+    source_points = np.asarray(source_points, dtype=float).reshape(-1, 3)
+
+    matches = closest_indices(mirrored, source_points)
+    errors = np.linalg.norm(source_points[matches] - mirrored, axis=1)
+
+    return matches, errors
+
+
+def mirror_name(name, source_prefix="l_", target_prefix="r_"):
+    """Swaps the side prefix on a node name, names without the prefix are returned unchanged."""
+    if name.startswith(source_prefix):
+        return target_prefix + name[len(source_prefix):]
+
+    return name
+
+
+def mirror_weights(source_weights, target_indices, target_influences, symmetry_map, source_prefix="l_", target_prefix="r_"):
+    """
+    Builds the target side SkinWeights from the source side.
+    Rows are picked through the symmetry map and each influence swapped for its mirrored name.
+    """
+    mirrored = source_weights.take_rows(symmetry_map, target_indices)
+    mirrored = mirrored.rename_influences(lambda name: mirror_name(name, source_prefix, target_prefix))
+
+    return mirrored.reorder(target_influences)
+
+
+class SymmetryMapCache:
+    """
+    Keeps one symmetry map per pair of point sets. A map only depends on the points, so
+    meshes with the same vertex positions share it whatever they are called, and a mesh
+    whose points move gets a new one.
+    """
+
+    def __init__(self, axis=0):
+        self.axis = axis
+        self.maps = {}
+
+    def _points_hash(self, points):
+        return hashlib.sha1(np.ascontiguousarray(points, dtype=float).tobytes()).hexdigest()
+
+    def get(self, source_mesh, target_mesh, source_points, target_points):
+        """Returns (symmetry map, match errors) for a mesh pair, building it on first use."""
+        points_hash = self._points_hash(source_points) + self._points_hash(target_points)
+
+        cached = self.maps.get(points_hash)
+        if cached is not None:
+            return cached
+
+        matches, errors = build_symmetry_map(source_points, target_points, self.axis)
+        self.maps[points_hash] = (matches, errors)
+
+        return matches, errors
@@ -0,0 +1,199 @@
+"""
+Transform math for placing nodes without throwaway constraints.
+
+Solves what a parent, point or aim constraint would have done and returns the result
+as a 4x4 world matrix, ready for a single cmds.xform(node, matrix=..., worldSpace=True).
+Matrices follow Maya's row vector convention: the first three rows are the X, Y and Z
+axes and the last row is the translation. Functions take single values or stacks of
+them, so a whole set of joints is solved at once.
+"""
+import numpy as np
+
+
+WORLD_UP = (0.0, 1.0, 0.0)
+
+
+def normalize(vectors):
+    vectors = np.asarray(vectors, dtype=float)
+    lengths = np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+    return vectors / np.where(lengths > 0.0, lengths, 1.0)
+
+
+def compose(rotations, translations, scales=1.0):
+    """4x4 matrices from (..., 3, 3) rotations, (..., 3) translations and per axis scales."""
+    rotations = np.asarray(rotations, dtype=float)
+    translations = np.asarray(translations, dtype=float)
+    shape = np.broadcast_shapes(rotations.shape[:-2], translations.shape[:-1])
+
+    matrices = np.zeros(shape + (4, 4))
+    scales = np.asarray(scales, dtype=float)
+    # Each axis row is scaled by its own scale value
+    matrices[..., :3, :3] = rotations * (scales[..., :, None] if scales.ndim else scales)
+    matrices[..., 3, :3] = translations
+    matrices[..., 3, 3] = 1.0
+
+    return matrices
+
+
+def decompose(matrices):
+    """Splits 4x4 matrices into (rotations, translations, scales), shear is ignored."""
+    matrices = np.asarray(matrices, dtype=float)
+    scales = np.linalg.norm(matrices[..., :3, :3], axis=-1)
+
+    return normalize(matrices[..., :3, :3]), matrices[..., 3, :3].copy(), scales
+
+
+def rotation_from_euler(angles):
+    """Rotation matrices from XYZ rotate order angles in degrees."""
+    x, y, z = np.moveaxis(np.radians(np.asarray(angles, dtype=float)), -1, 0)
+    cx, sx, cy, sy, cz, sz = np.cos(x), np.sin(x), np.cos(y), np.sin(y), np.cos(z), np.sin(z)
+
+    return np.stack((
+        np.stack((cy * cz, cy * sz, -sy), axis=-1),
+        np.stack((sx * sy * cz - cx * sz, sx * sy * sz + cx * cz, sx * cy), axis=-1),
+        np.stack((cx * sy * cz + sx * sz, cx * sy * sz - sx * cz, cx * cy), axis=-1),
+    ), axis=-2)
+
+
+def euler_from_rotation(rotations):
+    """XYZ rotate order angles in degrees from rotation matrices."""
+    rotations = np.asarray(rotations, dtype=float)
+    x = np.arctan2(rotations[..., 1, 2], rotations[..., 2, 2])
+    y = np.arcsin(np.clip(-rotations[..., 0, 2], -1.0, 1.0))
+    z = np.arctan2(rotations[..., 0, 1], rotations[..., 0, 0])
+
+    return np.degrees(np.stack((x, y, z), axis=-1))
+
+
+def mirror_matrices(matrices, axis=0):
+    """
+    Reflects world matrices across the plane through the origin normal to axis (0=X, 1=Y, 2=Z)
+    the way mirrorJoint's behavior mode does: positions reflect and all three local axes flip,
+    so the result keeps positive scale and the same local rotate values give mirrored motion.
+    """
+    matrices = np.array(matrices, dtype=float)
+    matrices[..., :, axis] *= -1.0
+    matrices[..., :3, :] *= -1.0
+
+    return matrices
+
+
+def local_matrices(world_matrices, parent_matrices):
+    """Matrices relative to their parents, from world matrices."""
+    return np.asarray(world_matrices, dtype=float) @ np.linalg.inv(parent_matrices)
+
+
+def distance_ratios(first_points, second_points, rest_distances):
+    """Distance between each pair of points over its rest distance, 1 where the rest distance is 0."""
+    distances = np.linalg.norm(np.asarray(first_points, dtype=float).reshape(-1, 3) - np.asarray(second_points, dtype=float).reshape(-1, 3), axis=-1)
+    rest_distances = np.asarray(rest_distances, dtype=float)
+
+    return np.divide(distances, rest_distances, out=np.ones_like(distances), where=rest_distances > 0.0)
+
+
+def world_up_vectors(positions, world_up_type="vector", world_up_vector=WORLD_UP, world_up_matrix=None):
+    """
+    The world up direction for each position, matching aimConstraint's worldUpType:
+    "scene" and "vector" use a fixed vector, "object" points at the world up object's
+    position and "objectrotation" is world_up_vector turned by the object's rotation.
+    """
+    positions = np.asarray(positions, dtype=float)
+
+    if world_up_type == "scene":
+        return np.broadcast_to(np.array(WORLD_UP), positions.shape)
+    if world_up_type == "vector":
+        return np.broadcast_to(np.asarray(world_up_vector, dtype=float), positions.shape)
+    if world_up_type == "object":
+        return np.asarray(world_up_matrix, dtype=float)[3, :3] - positions
+    if world_up_type == "objectrotation":
+        up = np.asarray(world_up_vector, dtype=float) @ np.asarray(world_up_matrix, dtype=float)[:3, :3]
+        return np.broadcast_to(up, positions.shape)
+
+    raise ValueError(f"Unsupported world up type: {world_up_type}")
+
+
+def _frames(primary, secondary):
+    """Orthonormal frames with rows (primary, secondary made perpendicular, their cross product)."""
+    primary = normalize(primary)
+    secondary = secondary - np.sum(secondary * primary, axis=-1, keepdims=True) * primary
+
+    # Where the up vector runs along the aim any perpendicular will do, like the constraint
+    degenerate = np.linalg.norm(secondary, axis=-1) < 1e-8
+    if np.any(degenerate):
+        fallback = np.where(np.abs(primary[..., :1]) < 0.9, np.array([1.0, 0.0, 0.0]), np.array([0.0, 1.0, 0.0]))
+        fallback = fallback - np.sum(fallback * primary, axis=-1, keepdims=True) * primary
+        secondary = np.where(degenerate[..., None], fallback, secondary)
+
+    secondary = normalize(secondary)
+
+    return np.stack((primary, secondary, np.cross(primary, secondary)), axis=-2)
+
+
+def aim_rotations(positions, targets, aim_vector=(0.0, 0.0, 1.0), up_vector=(0.0, 1.0, 0.0), world_up=WORLD_UP):
+    """
+    Rotations that point the local aim_vector from each position at its target, with the local
+    up_vector as close to world_up as it can get. world_up can be one vector or one per position
+    (see world_up_vectors).
+    """
+    positions = np.asarray(positions, dtype=float)
+    aims = np.asarray(targets, dtype=float) - positions
+    world_up = np.broadcast_to(np.asarray(world_up, dtype=float), aims.shape)
+
+    # A target sitting on the node gives no direction, leave the aim axis where it is
+    aims = np.where(np.linalg.norm(aims, axis=-1, keepdims=True) < 1e-8, np.asarray(aim_vector, dtype=float), aims)
+
+    local = _frames(np.asarray(aim_vector, dtype=float), np.asarray(up_vector, dtype=float))
+    world = _frames(aims, world_up)
+
+    return np.swapaxes(local, -1, -2) @ world
+
+
+def skip_rotation_axes(rotations, current_rotations, skip=""):
+    """Keeps the current rotate channels for every axis in skip ("x", "yz", ...)."""
+    if not skip:
+        return rotations
+
+    angles = euler_from_rotation(rotations)
+    current = euler_from_rotation(current_rotations)
+    for axis in skip:
+        index = "xyz".index(axis)
+        angles[..., index] = current[..., index]
+
+    return rotation_from_euler(angles)
+
+
+def point_translations(current, targets, skip=""):
+    """Target positions, keeping the current value for every world axis in skip."""
+    translations = np.array(np.broadcast_to(targets, np.broadcast_shapes(np.shape(current), np.shape(targets))), dtype=float)
+    for axis in skip:
+        index = "xyz".index(axis)
+        translations[..., index] = np.asarray(current, dtype=float)[..., index]
+
+    return translations
+
+
+def parent_matrices(target_matrices, scales=1.0):
+    """What a parent constraint without offset gives: the target's rotation and position, the node's own scale."""
+    rotations, translations, _ = decompose(target_matrices)
+
+    return compose(rotations, translations, scales)
+
+
+def aim_matrices(positions, targets, aim_vector=(0.0, 0.0, 1.0), up_vector=(0.0, 1.0, 0.0), world_up_type="vector",
+                 world_up_vector=WORLD_UP, world_up_matrix=None, skip="", current_rotations=None):
+    """
+    World matrices for nodes at positions aimed at their targets, as an aimConstraint without offset leaves them.
+    Skipped axes keep their angle from current_rotations, which skip needs.
+    """
+    if skip and current_rotations is None:
+        raise ValueError(f"Skipping the {skip} rotation needs the current rotations to keep")
+
+    positions = np.asarray(positions, dtype=float)
+    world_up = world_up_vectors(positions, world_up_type, world_up_vector, world_up_matrix)
+
+    rotations = aim_rotations(positions, targets, aim_vector, up_vector, world_up)
+    if skip:
+        rotations = skip_rotation_axes(rotations, current_rotations, skip)
+
+    return compose(rotations, positions)
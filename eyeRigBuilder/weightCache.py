@@ -0,0 +1,99 @@
+"""
+On disk cache for computed eye skin weights.
+
+Entries are compressed .npz files named by a hash of everything the weights depend on:
+the face list, the vertex positions, the joint names and positions and the skinning
+settings. A hit can be written straight back to the skinCluster in one bulk call.
+Old entries are evicted by age and the cache is trimmed back to a size limit,
+dropping the least recently used files first.
+"""
+import hashlib
+import os
+import time
+import numpy as np
+from riggingTools.weightMatrix import SkinWeights
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".eyeRigBuilder", "skinWeightCache")
+
+# Round positions before hashing so float noise from the scene doesn't miss the cache
+POSITION_DECIMALS = 5
+
+
+class SkinWeightCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_size_mb=256, max_age_days=30):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.max_age = max_age_days * 24 * 60 * 60
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, faces, points, joints, joint_points, settings=None):
+        """Hash of the face list, vertex positions, joint layout and skinning settings."""
+        digest = hashlib.sha1()
+        digest.update("\n".join(sorted(faces)).encode("utf-8"))
+        digest.update(np.round(np.asarray(points, dtype=float), POSITION_DECIMALS).tobytes())
+        digest.update("\n".join(joints).encode("utf-8"))
+        digest.update(np.round(np.asarray(joint_points, dtype=float), POSITION_DECIMALS).tobytes())
+        digest.update(repr(sorted((settings or {}).items())).encode("utf-8"))
+
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def load(self, key):
+        """Returns the cached SkinWeights for a key, or None on a miss."""
+        path = self._entry_path(key)
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+
+        with np.load(path) as entry:
+            weights = SkinWeights.from_arrays(entry)
+
+        # Touch the file so size based eviction drops the least recently used entries
+        os.utime(path, None)
+        self.hits += 1
+
+        return weights
+
+    def save(self, key, weights):
+        """Stores SkinWeights and evicts stale entries."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        np.savez_compressed(self._entry_path(key), **weights.to_arrays())
+
+        self.evict()
+
+    def evict(self):
+        """Removes entries older than max_age, then the least recently used until under max_bytes."""
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        now = time.time()
+        entries = []
+        for file_name in os.listdir(self.cache_dir):
+            if not file_name.endswith(".npz"):
+                continue
+            path = os.path.join(self.cache_dir, file_name)
+            stat = os.stat(path)
+            if now - stat.st_mtime > self.max_age:
+                os.remove(path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for mtime, size, path in entries)
+        for mtime, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            os.remove(path)
+            total_size -= size
+
+    def clear(self):
+        """Deletes every entry in the cache."""
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        for file_name in os.listdir(self.cache_dir):
+            if file_name.endswith(".npz"):
+                os.remove(os.path.join(self.cache_dir, file_name))
@@ -0,0 +1,232 @@
+"""
+Sparse skin weight matrix for the eye tools.
+
+SkinWeights holds one row per vertex and one column per influence in compressed
+sparse row (CSR) form: for row i, the influence columns and weights are
+columns[indptr[i]:indptr[i + 1]] and values[indptr[i]:indptr[i + 1]].
+Eye vertices only ever carry a handful of influences, so this stays small even on
+dense meshes, and every operation works on the whole table at once.
+
+The solvers build these, the cache stores them and skinIO moves them in and out of
+a skinCluster with one read or one write.
+"""
+import numpy as np
+from riggingTools import skinSolver
+
+
+class SkinWeights:
+    def __init__(self, vertex_indices, influences, indptr, columns, values):
+        self.vertex_indices = np.asarray(vertex_indices, dtype=int)
+        self.influences = list(influences)
+        self.indptr = np.asarray(indptr, dtype=int)
+        self.columns = np.asarray(columns, dtype=int)
+        self.values = np.asarray(values, dtype=float)
+
+    def __repr__(self):
+        return f"SkinWeights({len(self.vertex_indices)} vertices, {len(self.influences)} influences, {len(self.values)} weights)"
+
+    @property
+    def shape(self):
+        return len(self.vertex_indices), len(self.influences)
+
+    @property
+    def row_ids(self):
+        """Row of every stored weight."""
+        return np.repeat(np.arange(len(self.vertex_indices)), np.diff(self.indptr))
+
+    # ------------------------------------------------------------------
+    # Construction
+
+    @classmethod
+    def from_coordinates(cls, vertex_indices, influences, rows, columns, values):
+        """Builds a matrix from (row, column, value) triplets. Repeated entries are summed and zeros dropped."""
+        row_count = len(vertex_indices)
+        rows = np.asarray(rows, dtype=int).ravel()
+        columns = np.asarray(columns, dtype=int).ravel()
+        values = np.asarray(values, dtype=float).ravel()
+
+        keys, inverse = np.unique(rows * len(influences) + columns, return_inverse=True)
+        summed = np.bincount(inverse.ravel(), weights=values, minlength=len(keys))
+
+        keep = summed != 0
+        keys = keys[keep]
+        unique_rows = keys // max(len(influences), 1)
+
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(unique_rows, minlength=row_count))))
+
+        return cls(vertex_indices, influences, indptr, keys % max(len(influences), 1), summed[keep])
+
+    @classmethod
+    def from_dense(cls, vertex_indices, weights, influences, threshold=0.0):
+        """Builds a matrix from an (n_vertices, n_influences) array, dropping weights at or below threshold."""
+        weights = np.asarray(weights, dtype=float).reshape(len(vertex_indices), len(influences))
+        rows, columns = np.nonzero(np.abs(weights) > threshold)
+
+        return cls.from_coordinates(vertex_indices, influences, rows, columns, weights[rows, columns])
+
+    @classmethod
+    def from_solver(cls, vertex_indices, influences, joints, weights):
+        """Builds a matrix from the (n_vertices, k) joint columns and weights the solvers return."""
+        joints = np.asarray(joints, dtype=int).reshape(len(vertex_indices), -1)
+        weights = np.asarray(weights, dtype=float)
+        if weights.ndim == 1:
+            weights = weights[:, None]
+        weights = np.broadcast_to(weights, joints.shape)
+        rows = np.repeat(np.arange(len(vertex_indices)), joints.shape[1])
+
+        return cls.from_coordinates(vertex_indices, influences, rows, joints, weights)
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Rebuilds a matrix saved with to_arrays, for example from an .npz file."""
+        return cls(arrays["vertex_indices"], [str(name) for name in arrays["influences"]], arrays["indptr"], arrays["columns"], arrays["values"])
+
+    def to_arrays(self):
+        """The matrix as a dict of plain arrays, ready for np.savez."""
+        return {
+            "vertex_indices": self.vertex_indices.astype(np.int32),
+            "influences": np.array(self.influences),
+            "indptr": self.indptr.astype(np.int32),
+            "columns": self.columns.astype(np.int32),
+            "values": self.values,
+        }
+
+    def to_dense(self):
+        """The matrix as an (n_vertices, n_influences) array."""
+        dense = np.zeros(self.shape)
+        dense[self.row_ids, self.columns] = self.values
+
+        return dense
+
+    def copy(self):
+        return SkinWeights(self.vertex_indices.copy(), self.influences, self.indptr.copy(), self.columns.copy(), self.values.copy())
+
+    # ------------------------------------------------------------------
+    # Scene import and export
+
+    @classmethod
+    def from_skin_cluster(cls, skin_cluster, vertex_indices):
+        """Reads the weights of the given sorted vertex indices from a skinCluster in one call."""
+        from riggingTools import skinIO
+
+        weights, influences = skinIO.read_weights(skin_cluster, vertex_indices)
+
+        return cls.from_dense(vertex_indices, weights, influences)
+
+    def to_skin_cluster(self, skin_cluster):
+        """Writes every row to a skinCluster in one call, lining the columns up with its influences."""
+        from riggingTools import skinIO
+
+        aligned = self.reorder(skinIO.get_influences(skin_cluster))
+        skinIO.write_weights(skin_cluster, aligned.vertex_indices, aligned.to_dense())
+
+    # ------------------------------------------------------------------
+    # Weight operations, each returns a new matrix
+
+    def _filter(self, keep):
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(self.row_ids[keep], minlength=len(self.vertex_indices)))))
+
+        return SkinWeights(self.vertex_indices, self.influences, indptr, self.columns[keep], self.values[keep])
+
+    def row_sums(self):
+        return np.bincount(self.row_ids, weights=self.values, minlength=len(self.vertex_indices))
+
+    def normalize(self):
+        """Scales every row to sum to one. Empty rows are left empty."""
+        sums = self.row_sums()
+        scale = np.divide(1.0, sums, out=np.zeros_like(sums), where=sums > 0)
+
+        return self * scale
+
+    def prune(self, threshold=0.001):
+        """Drops every weight at or below threshold. Rows are not renormalized."""
+        return self._filter(self.values > threshold)
+
+    def limit_influences(self, max_influences):
+        """Keeps only the max_influences largest weights on each row. Rows are not renormalized."""
+        row_ids = self.row_ids
+        # Largest weights first within each row
+        order = np.lexsort((-self.values, row_ids))
+        rank = np.arange(len(order)) - self.indptr[row_ids[order]]
+
+        keep = np.zeros(len(self.values), dtype=bool)
+        keep[order[rank < max_influences]] = True
+
+        return self._filter(keep)
+
+    def reorder(self, influences):
+        """Returns the matrix with its columns moved to match the given influence list."""
+        influences = list(influences)
+        if influences == self.influences:
+            return self
+
+        missing = set(self.influences[column] for column in np.unique(self.columns)) - set(influences)
+        if missing:
+            raise ValueError(f"Weighted influences not in the new influence list: {', '.join(sorted(missing))}")
+
+        column_map = np.array([influences.index(name) if name in influences else -1 for name in self.influences], dtype=int)
+
+        return SkinWeights.from_coordinates(self.vertex_indices, influences, self.row_ids, column_map[self.columns], self.values)
+
+    def rename_influences(self, rename):
+        """Returns the matrix with every influence name passed through the rename function."""
+        return SkinWeights(self.vertex_indices, [rename(name) for name in self.influences], self.indptr, self.columns, self.values)
+
+    def take_rows(self, rows, vertex_indices=None):
+        """Returns a matrix built from the given rows, in order. vertex_indices relabels the new rows."""
+        rows = np.asarray(rows, dtype=int)
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        entries = np.arange(indptr[-1]) - np.repeat(indptr[:-1], lengths) + np.repeat(starts, lengths)
+
+        if vertex_indices is None:
+            vertex_indices = self.vertex_indices[rows]
+
+        return SkinWeights(vertex_indices, self.influences, indptr, self.columns[entries], self.values[entries])
+
+    def set_transform_values(self, columns, values):
+        """skinPercent -transformValue for every row at once, see skinSolver.set_transform_values."""
+        weights = skinSolver.set_transform_values(self.to_dense(), columns, values)
+
+        return SkinWeights.from_dense(self.vertex_indices, weights, self.influences)
+
+    def blend(self, other, amount):
+        """Blends towards another weighting of the same vertices. amount can be a number or one value per vertex."""
+        amount = np.asarray(amount, dtype=float)
+
+        return self * (1.0 - amount) + other * amount
+
+    # ------------------------------------------------------------------
+    # Arithmetic
+
+    def _check_rows(self, other):
+        if not np.array_equal(self.vertex_indices, other.vertex_indices):
+            raise ValueError("Weight matrices cover different vertices")
+
+    def __add__(self, other):
+        self._check_rows(other)
+        influences = self.influences + [name for name in other.influences if name not in self.influences]
+        other = other.reorder(influences)
+
+        return SkinWeights.from_coordinates(
+            self.vertex_indices,
+            influences,
+            np.concatenate((self.row_ids, other.row_ids)),
+            np.concatenate((self.columns, other.columns)),
+            np.concatenate((self.values, other.values)),
+        )
+
+    def __sub__(self, other):
+        return self + other * -1.0
+
+    def __mul__(self, scale):
+        """Scales by a number or by one value per vertex."""
+        scale = np.asarray(scale, dtype=float)
+        if scale.ndim:
+            scale = scale[self.row_ids]
+
+        return SkinWeights(self.vertex_indices, self.influences, self.indptr, self.columns, self.values * scale)
+
+    __rmul__ = __mul__